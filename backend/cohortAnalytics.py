@@ -0,0 +1,298 @@
+"""
+Cohort progress analytics over users' completed courses.
+
+getUserProgress (usersController) summarizes one user, reading each of their
+completed courses from Firestore. Advising dashboards need the same numbers
+for a whole cohort: credits by category, requirement completion, and the
+courses holding students back. This reads a bulk export of users on stdin
+and writes a JSON result on stdout, the same way planOptimizer.py is driven:
+
+    {
+      "users": [{"id": "u1", "completedCourses": ["CS1114", {"courseCode": "MATH1225"}]}, ...],
+      "requirements": [{"name": "Theory", "courses": ["CS3114", "CS4104"], "count": 1}, ...],
+      "requiredCredits": 120,
+      "includeUsers": true,             # per-user rows in the result
+      "top": 10                         # bottleneck courses to report
+    }
+
+Completions are stored as a sparse user x course matrix in CSR form: NumPy
+row pointers and column indices. The columns are the courses.json courses,
+followed by any other codes in the export. Cross-listed codes share their
+catalog course's column. Credits per user and per category are a bincount
+over the nonzeros. Requirement and prerequisite-group completion are a
+bincount over the nonzeros expanded to their groups. Readiness and
+bottlenecks are then small dense products over users x groups. No
+aggregate loops over users in Python; only parsing and the per-user output
+rows do.
+
+Per user, as in getUserProgress: totalCredits, progressPercentage,
+completedCourseCount and creditsByCategory, plus requirementsMet. Codes
+outside the catalog count no credits.
+
+Per cohort:
+    credits         mean and percentiles of total and per-category credits
+    progress        histogram of progressPercentage in 10% bins
+    requirements    users meeting each requirement
+    courses         per catalog course: completed (users who took it), ready
+                    (prerequisites met, not taken yet) and blocking (users
+                    with an unfinished required course waiting on a
+                    prerequisite group this course is in)
+    bottlenecks     the `top` courses by blocking
+    unknownCourses  completed codes not in the catalog, with user counts
+
+Prerequisite groups follow planOptimizer: any member meets a group, and a
+group with no catalog member counts as met. Without "requirements", each of
+the dashboard's core CS courses is its own requirement.
+"""
+import json
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from planOptimizer import COURSES_PATH, load_catalog
+
+REQUIRED_CREDITS = 120
+CORE_CS_COURSES = [
+    "CS1114", "CS2114", "CS1944", "CS2104", "CS2505", "CS2506",
+    "CS3114", "CS3214", "CS3604", "CS3304", "CS4944",
+]
+DEFAULT_REQUIREMENTS = [{"name": code, "courses": [code]} for code in CORE_CS_COURSES]
+PERCENTILES = (25, 50, 75, 90)
+
+
+def normalize_code(code: Any) -> str:
+    """'cs 2114' / 'CS-2114' -> 'CS2114'."""
+    return re.sub(r"[\s:-]", "", str(code)).upper()
+
+
+def completed_codes(user: Dict[str, Any]) -> List[str]:
+    """A user's completed course codes, from strings or {"courseCode"} records."""
+    codes = []
+    for c in user.get("completedCourses") or []:
+        code = c if isinstance(c, str) else (c.get("courseCode") or c.get("code") or c.get("id"))
+        if code:
+            codes.append(normalize_code(code))
+    return codes
+
+
+class CourseArrays:
+    """The catalog as arrays indexed by column, with its prerequisite groups."""
+
+    def __init__(self, catalog: Dict[str, Dict[str, Any]]) -> None:
+        self.codes = list(catalog)
+        self.column: Dict[str, int] = {code: i for i, code in enumerate(self.codes)}
+        for code, entry in catalog.items():
+            for alias in entry["crossListed"]:
+                self.column.setdefault(normalize_code(alias), self.column[code])
+        self.credits = np.array([catalog[c]["credits"] for c in self.codes], dtype=np.float64)
+        self.categories, category = np.unique(
+            np.array([catalog[c]["category"] for c in self.codes], dtype=str), return_inverse=True)
+        self.category = category.astype(np.int64)
+
+        # Prerequisite groups with at least one catalog member; the others
+        # always count as met.
+        self.group_course: List[int] = []
+        self.group_members: List[List[int]] = []
+        for code, entry in catalog.items():
+            for group in entry["prerequisites"]:
+                members = sorted({self.column[normalize_code(m)] for m in group
+                                  if normalize_code(m) in self.column})
+                if members:
+                    self.group_course.append(self.column[code])
+                    self.group_members.append(members)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class CompletionMatrix:
+    """Users x courses completions in CSR form (indptr, indices), deduplicated."""
+
+    def __init__(self, courses: CourseArrays, users: List[Dict[str, Any]]) -> None:
+        self.ids = [str(u.get("id", i)) for i, u in enumerate(users)]
+        column = dict(courses.column)
+        self.extra_codes: List[str] = []
+        lengths, cols = [], []
+        for user in users:
+            codes = completed_codes(user)
+            lengths.append(len(codes))
+            for code in codes:
+                col = column.get(code)
+                if col is None:
+                    col = column[code] = len(courses) + len(self.extra_codes)
+                    self.extra_codes.append(code)
+                cols.append(col)
+        self.column = column
+        n_users, n_cols = len(users), len(courses) + len(self.extra_codes)
+        rows = np.repeat(np.arange(n_users, dtype=np.int64), np.asarray(lengths, dtype=np.int64))
+        keys = np.unique(rows * max(n_cols, 1) + np.asarray(cols, dtype=np.int64))
+        self.rows = keys // max(n_cols, 1)
+        self.indices = keys % max(n_cols, 1)
+        self.indptr = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.rows, minlength=n_users), out=self.indptr[1:])
+        self.shape = (n_users, n_cols)
+
+    def group_counts(self, groups: List[List[int]]) -> np.ndarray:
+        """(users x groups) number of each group's member columns a user completed."""
+        n_users, n_cols = self.shape
+        n_groups = len(groups)
+        if not n_groups:
+            return np.zeros((n_users, 0), dtype=np.int64)
+        # column -> groups, also in CSR form
+        pairs = sorted((c, g) for g, members in enumerate(groups) for c in members)
+        col_of = np.array([c for c, _ in pairs], dtype=np.int64)
+        group_of = np.array([g for _, g in pairs], dtype=np.int64)
+        ptr = np.zeros(n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(col_of, minlength=n_cols), out=ptr[1:])
+
+        # expand each nonzero (user, column) to one entry per group of the column
+        degree = ptr[self.indices + 1] - ptr[self.indices]
+        total = int(degree.sum())
+        starts = np.repeat(ptr[self.indices], degree)
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(degree) - degree, degree)
+        users = np.repeat(self.rows, degree)
+        hit = group_of[starts + offsets]
+        return np.bincount(users * n_groups + hit,
+                           minlength=n_users * n_groups).reshape(n_users, n_groups)
+
+    def catalog_block(self, n_catalog: int) -> np.ndarray:
+        """Dense (users x catalog courses) completion flags."""
+        done = np.zeros((self.shape[0], n_catalog), dtype=bool)
+        known = self.indices < n_catalog
+        done[self.rows[known], self.indices[known]] = True
+        return done
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    """Mean and percentiles of `values` along its first axis (scalars per column)."""
+    if not len(values):
+        return {"mean": 0.0, **{f"p{p}": 0.0 for p in PERCENTILES}, "max": 0.0}
+    stats = {"mean": values.mean(axis=0)}
+    stats.update(zip((f"p{p}" for p in PERCENTILES), np.percentile(values, PERCENTILES, axis=0)))
+    stats["max"] = values.max(axis=0)
+    return stats
+
+
+def _round(value) -> Any:
+    return np.round(value, 2).tolist()
+
+
+def analyze(users: List[Dict[str, Any]], catalog: Dict[str, Dict[str, Any]],
+            requirements: Optional[List[Dict[str, Any]]] = None,
+            required_credits: float = REQUIRED_CREDITS,
+            include_users: bool = True, top: int = 10) -> Dict[str, Any]:
+    """Per-user and cohort aggregates of `users`' completed courses (see module docstring)."""
+    courses = CourseArrays(catalog)
+    matrix = CompletionMatrix(courses, users)
+    n_users, n_catalog, n_cats = matrix.shape[0], len(courses), len(courses.categories)
+    requirements = DEFAULT_REQUIREMENTS if requirements is None else requirements
+
+    # credits: bincount of the catalog nonzeros by (user, category)
+    known = matrix.indices < n_catalog
+    rows, cols = matrix.rows[known], matrix.indices[known]
+    by_category = np.bincount(rows * n_cats + courses.category[cols], weights=courses.credits[cols],
+                              minlength=n_users * n_cats).reshape(n_users, n_cats)
+    taken_in = np.bincount(rows * n_cats + courses.category[cols],
+                           minlength=n_users * n_cats).reshape(n_users, n_cats)
+    total = by_category.sum(axis=1)
+    progress = np.minimum(total / required_credits * 100, 100) if required_credits else np.zeros(n_users)
+    course_count = np.diff(matrix.indptr)
+
+    # requirements: completed member count against the count needed
+    req_groups, req_need = [], []
+    for req in requirements:
+        members = sorted({matrix.column[normalize_code(c)] for c in req.get("courses", [])
+                          if normalize_code(c) in matrix.column})
+        req_groups.append(members)
+        req_need.append(req.get("count", len(req.get("courses", []))))
+    req_met = matrix.group_counts(req_groups) >= np.asarray(req_need, dtype=np.int64)
+
+    # readiness: unmet prerequisite groups per (user, course) via a groups x courses product
+    n_groups = len(courses.group_members)
+    unmet = matrix.group_counts(courses.group_members) == 0
+    course_of_group = np.zeros((n_groups, n_catalog), dtype=np.float32)
+    course_of_group[np.arange(n_groups), courses.group_course] = 1
+    members_of_group = np.zeros((n_groups, n_catalog), dtype=np.float32)
+    for g, members in enumerate(courses.group_members):
+        members_of_group[g, members] = 1
+    done = matrix.catalog_block(n_catalog)
+    ready = (unmet.astype(np.float32) @ course_of_group == 0) & ~done
+
+    # bottlenecks: unmet groups of required courses a user still has to take,
+    # charged to every member of the group
+    required = np.zeros(n_catalog, dtype=bool)
+    required[np.array([c for members in req_groups for c in members if c < n_catalog],
+                      dtype=np.int64)] = True
+    pending = ~done & required
+    waiting = pending[:, courses.group_course] & unmet
+    blocking = (waiting.astype(np.float32) @ members_of_group > 0).sum(axis=0)
+
+    completed = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    course_rows = [{"code": code, "completed": int(completed[i]), "ready": int(r), "blocking": int(b)}
+                   for i, (code, r, b) in enumerate(zip(courses.codes, ready.sum(axis=0), blocking))]
+    order = np.lexsort((-completed[:n_catalog], -blocking))
+    categories = courses.categories.tolist()
+    category_stats = _distribution(by_category)
+
+    result: Dict[str, Any] = {
+        "users": n_users,
+        "requiredCredits": required_credits,
+        "cohort": {
+            "credits": {
+                "total": {k: _round(v) for k, v in _distribution(total).items()},
+                "byCategory": {cat: {k: _round(v[j]) for k, v in category_stats.items()}
+                               for j, cat in enumerate(categories)} if n_users else {},
+            },
+            "progress": {
+                "bins": list(range(0, 101, 10)),
+                "counts": np.histogram(progress, bins=np.arange(0, 101, 10))[0].tolist(),
+            },
+            "requirements": [{"name": req.get("name", f"requirement{i + 1}"),
+                              "met": int(n), "rate": _round(n / n_users if n_users else 0.0)}
+                             for i, (req, n) in enumerate(zip(requirements, req_met.sum(axis=0)))],
+            "courses": course_rows,
+            "bottlenecks": [course_rows[i] for i in order[:top] if blocking[i] > 0],
+            "unknownCourses": {code: int(completed[n_catalog + i])
+                               for i, code in enumerate(matrix.extra_codes)},
+        },
+    }
+    if include_users:
+        met = req_met.sum(axis=1)
+        result["perUser"] = [{
+            "id": uid,
+            "totalCredits": _round(total[u]),
+            "progressPercentage": _round(progress[u]),
+            "completedCourseCount": int(course_count[u]),
+            "creditsByCategory": {categories[j]: _round(by_category[u, j])
+                                  for j in np.flatnonzero(taken_in[u])},
+            "requirementsMet": int(met[u]),
+            "requirementsTotal": len(requirements),
+        } for u, uid in enumerate(matrix.ids)]
+    return result
+
+
+def main() -> None:
+    import argparse
+
+    # As in planOptimizer, the catalog path is a CLI flag, never part of the request.
+    parser = argparse.ArgumentParser(description="Cohort progress analytics (JSON export on stdin).")
+    parser.add_argument("--courses", default=COURSES_PATH, help="catalog JSON (default: courses.json)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    request = json.loads(sys.stdin.read() or "{}")
+    result = analyze(request.get("users", []),
+                     load_catalog(args.courses),
+                     request.get("requirements"),
+                     request.get("requiredCredits", REQUIRED_CREDITS),
+                     request.get("includeUsers", True),
+                     request.get("top", 10))
+    result["elapsedMs"] = round((time.perf_counter() - started) * 1000, 2)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 # generate_courses_from_search.py
 import json
+import os
 import re
 from typing import List, Dict, Any, Optional, Tuple, Union
 
 
 from pythonTimetables.scrapeVTCourses import getAllCSVTCourses
-from pythonTimetables.timeTablesVTT import searchIDData
+from pythonTimetables.timeTablesVTT import _get_next_semester, searchIDData
+from pythonTimetables.pathwayIndex import get_pathway_index
+from pythonTimetables.knownCourses import KNOWN_COURSES_PATH, SUBJECTS_PATH, update_subjects, write_known_courses
+from pythonTimetables.crossListings import CROSS_LISTINGS_PATH, build_cross_listings, save_cross_listings
+from pythonTimetables.offeringsWarehouse import DEFAULT_DB_PATH, OfferingsWarehouse
+from pythonTimetables import profiling
+from pythonTimetables.profiling import profile_section
 
 
 # Common ASCII and Unicode dash-like characters:
@@ -67,14 +74,16 @@ def to_credits_list(credits: Optional[Union[int, float, Tuple[int, int], str]])
 def course_from_search(
     search_dict: Dict[str, Any],
     fallback_title: str,
-    catalog_credits: Optional[Union[int, float, Tuple[int, int], str]]
+    catalog_credits: Optional[Union[int, float, Tuple[int, int], str]],
+    semesters: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Convert the searchIDData aggregated dict + catalog fallbacks into the target schema.
     Credits source-of-truth: search_dict['creditHours'] if present/valid; fallback to catalog_credits.
     Category: use search_dict['subject'] if available, otherwise extract from code.
-    Includes 'pathways' passthrough from searchIDData output.
+    Includes 'pathways' and 'crossListed' passthrough from searchIDData output.
     Prerequisites: stored exactly as returned from searchIDData (nested list format).
+    Semesters: offering pattern from the offerings warehouse if known, else Fall/Spring.
     """
     code = search_dict.get("code") or search_dict.get("courseId") or ""
     name_raw = search_dict.get("name") or fallback_title or ""
@@ -125,16 +134,27 @@ def course_from_search(
         "prerequisites": prereq_list,        # Nested list: [['CS2114'], ['MATH2534', 'MATH3034']]
         "corequisites": [],
         "category": category,
-        "semesters": ["Fall", "Spring"],
+        "semesters": semesters or ["Fall", "Spring"],
         "description": description,
         "pathways": pathways,
+        "crossListed": search_dict.get("crossListed") or [],
     }
 
 
 def main() -> None:
     print(f"Starting course generation for next semester (auto-detected)...")
-    catalog_courses = getAllCSVTCourses()
+    with profile_section("seed.catalog"):
+        catalog_courses = getAllCSVTCourses()
     print(f"Discovered {len(catalog_courses)} CS catalog courses to process.")
+    # The scrape is the undergraduate CS catalog, i.e. CS codes below 5000
+    # (see pythonTimetables/knownCourses.py)
+    if catalog_courses:
+        write_known_courses((c["code"] for c in catalog_courses), {"CS": (0, 4999)})
+        print(f"Wrote known CS courses to {KNOWN_COURSES_PATH}")
+    try:
+        print(f"Wrote {update_subjects()} timetable subjects to {SUBJECTS_PATH}")
+    except Exception as e:
+        print(f"Subject list unavailable ({e}); keeping the previous one.")
     MATH_courses = [{"code": "MATH1225", "title": "Calculus of a Single Variable", "credits": 3}, 
                     {"code": "MATH1226", "title": "Calculus of a Single Variable II", "credits": 3},
                     {"code": "MATH2214", "title": "Introduction to Differential Equations", "credits": 3},
@@ -147,6 +167,34 @@ def main() -> None:
         print(f'Added: {c["code"]}')
 
 
+    # Real offering patterns, if a warehouse has been harvested
+    # (see pythonTimetables/offeringsWarehouse.py)
+    warehouse = OfferingsWarehouse(DEFAULT_DB_PATH) if os.path.exists(DEFAULT_DB_PATH) else None
+    if warehouse:
+        print(f"Using offering patterns from {DEFAULT_DB_PATH}")
+
+
+    # One query per pathway code tags every course below, instead of a page
+    # scan per course (see pythonTimetables/pathwayIndex.py)
+    with profile_section("seed.pathways"):
+        try:
+            pathway_index = get_pathway_index(*_get_next_semester())
+            print(f"Pathway index: {len(pathway_index.names)} courses")
+        except Exception as e:
+            print(f"Pathway index unavailable ({e}); scanning course pages instead.")
+
+
+    # Cross-listed ids are looked up under one canonical listing below, and
+    # recorded on each course (see pythonTimetables/crossListings.py)
+    with profile_section("seed.crosslistings"):
+        try:
+            listings = build_cross_listings(*_get_next_semester())
+            save_cross_listings(listings)
+            print(f"Wrote {len(listings.groups)} cross-listed groups to {CROSS_LISTINGS_PATH}")
+        except Exception as e:
+            print(f"Cross-listings unavailable ({e}); keeping the previous map.")
+
+
     total = len(catalog_courses)
     results: List[Dict[str, Any]] = []
     processed = 0
@@ -154,66 +202,80 @@ def main() -> None:
     written = 0
 
 
-    for idx, item in enumerate(catalog_courses, start=1):
-        try:
-            course_code = item.get("code")
-            course_title = item.get("title", "")
-            catalog_credits = item.get("credits", None)
+    with profile_section("seed.lookups"):
+        for idx, item in enumerate(catalog_courses, start=1):
+            try:
+                course_code = item.get("code")
+                course_title = item.get("title", "")
+                catalog_credits = item.get("credits", None)
 
 
-            if not course_code:
-                skipped += 1
-                print(f"[{idx}/{total}] Skipping entry without code.")
-                continue
+                if not course_code:
+                    skipped += 1
+                    print(f"[{idx}/{total}] Skipping entry without code.")
+                    continue
 
 
-            print(f"[{idx}/{total}] Processing {course_code} ...")
+                print(f"[{idx}/{total}] Processing {course_code} ...")
 
 
-            # Query timetable/Banner via searchIDData (auto-detects semester)
-            data = searchIDData(course_code, fetch_banner=True)
+                # Query timetable/Banner via searchIDData (auto-detects semester)
+                data = searchIDData(course_code, fetch_banner=True)
 
 
-            # If no sections found and no metadata, still write a record with fallbacks
-            if not data or not isinstance(data, dict):
-                skipped += 1
-                print(f"  -> No data returned for {course_code}. Skipping.")
-                continue
+                # If no sections found and no metadata, still write a record with fallbacks
+                if not data or not isinstance(data, dict):
+                    skipped += 1
+                    print(f"  -> No data returned for {course_code}. Skipping.")
+                    continue
 
 
-            # Build final normalized record
-            record = course_from_search(
-                data,
-                fallback_title=course_title,
-                catalog_credits=catalog_credits
-            )
-            results.append(record)
-            written += 1
-            processed += 1
+                # Build final normalized record
+                record = course_from_search(
+                    data,
+                    fallback_title=course_title,
+                    catalog_credits=catalog_credits,
+                    semesters=warehouse.offering_pattern(course_code) if warehouse else None
+                )
+                results.append(record)
+                written += 1
+                processed += 1
 
 
-            # Quick summary line
-            name_preview = (record['name'] or '')[:60]
-            cr = record['credits']
-            cr_str = f"{cr}" if cr is not None else "None"
-            cat = record['category']
-            pws = record.get('pathways') or []
-            prereqs = record.get('prerequisites') or []
-            print(f"  -> OK: {course_code} | category: {cat} | title: '{name_preview}' | credits: {cr_str} | pathways: {pws} | prereqs: {prereqs}")
+                # Quick summary line
+                name_preview = (record['name'] or '')[:60]
+                cr = record['credits']
+                cr_str = f"{cr}" if cr is not None else "None"
+                cat = record['category']
+                pws = record.get('pathways') or []
+                prereqs = record.get('prerequisites') or []
+                print(f"  -> OK: {course_code} | category: {cat} | title: '{name_preview}' | credits: {cr_str} | pathways: {pws} | prereqs: {prereqs}")
 
 
-        except Exception as e:
-            skipped += 1
-            print(f"  -> Error on {item.get('code','UNKNOWN')}: {e}. Skipping.")
+            except Exception as e:
+                skipped += 1
+                print(f"  -> Error on {item.get('code','UNKNOWN')}: {e}. Skipping.")
 
 
+    if warehouse:
+        warehouse.close()
     print(f"Processed {processed} courses, skipped {skipped}.")
     out_file = "courses.json"
-    with open(out_file, "w", encoding="utf-8") as f:
+    with profile_section("seed.write"), open(out_file, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
     print(f"Wrote {written} course records to {out_file}.")
     print("Done.")
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate courses.json for the next semester.")
+    parser.add_argument("--profile", nargs="?", const="all", metavar="MODES",
+                        help="profile seed stages: all, cpu, mem or time (see pythonTimetables/profiling.py)")
+    parser.add_argument("--profile-dir", help="report directory (default ./profiles)")
+    args = parser.parse_args()
+    if args.profile:
+        profiling.enable(args.profile, args.profile_dir)
+        print(f"Profiling seed stages, request id {profiling.request_id()}")
     main()
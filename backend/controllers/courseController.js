@@ -1,9 +1,18 @@
 const { db } = require("../db");
 const { spawn } = require("child_process");
+const { randomUUID } = require("crypto");
 
 // Allow configuring interpreter and pythonpath via env
 const PY_INTERPRETER = process.env.PY_INTERPRETER || "python"; // 'python3' on mac/linux, 'python' on Windows
 const PYTHONPATH = process.env.PYTHONPATH || ""; // e.g., ".;./pythonTimetables" on Windows, ".:./pythonTimetables" on Linux/Mac
+// Opt-in latency budget for single-course lookups; parts that miss it come
+// back empty and flagged in "completeness". Set per request with
+// ?deadlineMs= or for all with TIMETABLE_DEADLINE_MS; unset (or 0) waits for
+// everything.
+const LOOKUP_DEADLINE_MS = process.env.TIMETABLE_DEADLINE_MS
+  ? Number(process.env.TIMETABLE_DEADLINE_MS)
+  : undefined;
+const PYTHON_TIMEOUT_MS = 60000;
 
 /**
  * Parse prerequisites from JSON string to nested array
@@ -347,56 +356,59 @@ const checkPrerequisites = async (req, res) => {
 function callTimetablePython(funcName, argsObj) {
   return new Promise((resolve, reject) => {
     const code = `
-import json, sys, os, math
-from enum import Enum
+import json, sys, os
 
 # Try package import first; fallback to sys.path injection
 try:
-    from pythonTimetables.timeTablesVTT import searchIDData, searchCRNData
+    from pythonTimetables.courseJson import encode, searchIDDataBatchJSON, searchIDDataJSON, searchIDJSON, searchCRNDataJSON
+    from pythonTimetables.profiling import profile_section
+    from pythonTimetables.pathwayIndex import coursesByPathway
 except ModuleNotFoundError:
     base = os.getcwd()
     pkg = os.path.join(base, "pythonTimetables")
     if pkg not in sys.path:
         sys.path.insert(0, pkg)
-    from timeTablesVTT import searchIDData, searchCRNData
-
-
-def to_jsonable(obj):
-    # Normalize float NaN/Inf from pandas to None to keep strict JSON
-    if isinstance(obj, float):
-        if math.isnan(obj) or math.isinf(obj):
-            return None
-        return obj
-    # Enums -> stable string or value
-    if isinstance(obj, Enum):
-        return getattr(obj, "value", str(obj))
-    # Custom objects -> dict of attrs
-    if hasattr(obj, "__dict__"):
-        return { k: to_jsonable(v) for k, v in obj.__dict__.items() }
-    # Iterables
-    if isinstance(obj, (list, tuple, set)):
-        return [to_jsonable(x) for x in obj]
-    # Dicts
-    if isinstance(obj, dict):
-        return { k: to_jsonable(v) for k, v in obj.items() }
-    # Primitives/other -> string or unchanged
-    return obj
+    from courseJson import encode, searchIDDataBatchJSON, searchIDDataJSON, searchIDJSON, searchCRNDataJSON
+    from profiling import profile_section
+    from pathwayIndex import coursesByPathway
 
 
+# Responses are canonical JSON bytes (see pythonTimetables/courseJson.py),
+# served from the encoded cache when warm.
+# TIMETABLE_PROFILE=all profiles each call (see pythonTimetables/profiling.py).
+# Course-id lookups feed the access statistics behind cache prewarming
+# (see pythonTimetables/prewarm.py).
 args = json.loads(sys.stdin.read())
 try:
-    if "${funcName}" == "searchIDData":
-        res = searchIDData(args["courseId"], args.get("fetch_banner", True))
-    elif "${funcName}" == "searchCRNData":
-        res = searchCRNData(args["year"], args["semester"], args["crn"])
-    else:
-        res = {"error": "Unknown function"}
-    print(json.dumps(to_jsonable(res), ensure_ascii=False))
+    with profile_section("bridge.${funcName}"):
+        if "${funcName}" == "searchIDData":
+            out = searchIDDataJSON(args["courseId"], args.get("fetch_banner", True),
+                                   args.get("campuses"), args.get("modalities"),
+                                   args.get("sectionTypes"), args.get("deadline"),
+                                   args.get("fields"))
+        elif "${funcName}" == "searchID":
+            out = searchIDJSON(args["year"], args["semester"], args["courseId"],
+                               args.get("fetch_banner", True), args.get("campuses"),
+                               args.get("modalities"), args.get("sectionTypes"),
+                               args.get("deadline"), args.get("fields"))
+        elif "${funcName}" == "searchIDDataBatch":
+            out = searchIDDataBatchJSON(args["courseIds"], args.get("fetch_banner", True),
+                                        args.get("fields"))
+        elif "${funcName}" == "searchCRNData":
+            out = searchCRNDataJSON(args["year"], args["semester"], args["crn"],
+                                    args.get("deadline"), args.get("fields"))
+        elif "${funcName}" == "coursesByPathway":
+            out = encode(coursesByPathway(args["pathway"], args.get("year"), args.get("semester")))
+        else:
+            out = json.dumps({"error": "Unknown function"}).encode("utf-8")
+    sys.stdout.buffer.write(out + b"\\n")
+    sys.stdout.buffer.flush()
 except Exception as e:
-    print(json.dumps({"error": str(e)}))
+    print(json.dumps({"error": str(e), "errorType": type(e).__name__}), flush=True)
 `;
 
-    const env = { ...process.env };
+    // Groups this call's profiling reports, when profiling is on.
+    const env = { ...process.env, TIMETABLE_REQUEST_ID: randomUUID() };
     if (PYTHONPATH) {
       const sep = process.platform === "win32" ? ";" : ":";
       env.PYTHONPATH = env.PYTHONPATH
@@ -408,16 +420,16 @@ except Exception as e:
 
     let out = "";
     let err = "";
+    let settled = false;
     const timer = setTimeout(() => {
       try {
         py.kill("SIGKILL");
       } catch (_) {}
-    }, 60000); // 60 second timeout for VT timetable queries
+    }, PYTHON_TIMEOUT_MS); // hard limit for VT timetable queries
 
-    py.stdout.on("data", (d) => (out += d.toString()));
-    py.stderr.on("data", (d) => (err += d.toString()));
-    py.on("close", (code) => {
-      clearTimeout(timer);
+    const settle = (code) => {
+      if (settled) return;
+      settled = true;
       if (code !== 0 && !out)
         return reject(new Error(err || `Python exited ${code}`));
       try {
@@ -429,6 +441,19 @@ except Exception as e:
           )
         );
       }
+    };
+
+    // The response is a single line. Answer as soon as it is complete: the
+    // process may keep running to refresh stale cache entries in the
+    // background (see pythonTimetables/courseJson.py).
+    py.stdout.on("data", (d) => {
+      out += d.toString();
+      if (out.includes("\n")) settle(0);
+    });
+    py.stderr.on("data", (d) => (err += d.toString()));
+    py.on("close", (code) => {
+      clearTimeout(timer);
+      settle(code);
     });
 
     py.stdin.write(JSON.stringify(argsObj));
@@ -436,7 +461,51 @@ except Exception as e:
   });
 }
 
-// GET /api/courses/search/by-id?courseId=CS-2114
+// Lookup deadline in seconds from ?deadlineMs= (else LOOKUP_DEADLINE_MS),
+// kept under the subprocess timeout; undefined means no deadline.
+function lookupDeadline(query) {
+  const ms =
+    query.deadlineMs !== undefined
+      ? Number(query.deadlineMs)
+      : LOOKUP_DEADLINE_MS;
+  if (!Number.isFinite(ms) || ms <= 0) return undefined;
+  return Math.min(ms, PYTHON_TIMEOUT_MS - 5000) / 1000;
+}
+
+// Years become part of cache keys and file paths (see parse_year in
+// timeTablesVTT.py); only four digits are accepted.
+function isValidYear(year) {
+  return /^\d{4}$/.test(String(year).trim());
+}
+
+// Optional ?fields=name,creditHours projection; only the upstream requests
+// the listed fields need are made (see parse_fields in timeTablesVTT.py).
+function lookupFields(query) {
+  if (!query.fields) return undefined;
+  return String(query.fields)
+    .split(",")
+    .map((f) => f.trim())
+    .filter(Boolean);
+}
+
+// Optional fan-out scope from ?campus=blacksburg,virtual&modality=...&type=...
+// (names or codes, comma separated; see search_timetable_fanout)
+function fanoutScope(query) {
+  const list = (v) =>
+    v
+      ? String(v)
+          .split(",")
+          .map((s) => s.trim())
+          .filter(Boolean)
+      : undefined;
+  return {
+    campuses: list(query.campus),
+    modalities: list(query.modality),
+    sectionTypes: list(query.type),
+  };
+}
+
+// GET /api/courses/search/by-id?courseId=CS-2114[&campus=blacksburg,virtual]
 const searchCourseID = async (req, res) => {
   try {
     let { courseId } = req.query;
@@ -447,7 +516,12 @@ const searchCourseID = async (req, res) => {
     }
     // Normalize courseId like "CS2114" or "CS-2114"
     courseId = String(courseId).trim();
-    const data = await callTimetablePython("searchIDData", { courseId });
+    const data = await callTimetablePython("searchIDData", {
+      courseId,
+      ...fanoutScope(req.query),
+      deadline: lookupDeadline(req.query),
+      fields: lookupFields(req.query),
+    });
     if (data?.error)
       return res.status(502).json({ success: false, error: data.error });
     return res.json({ success: true, data });
@@ -461,6 +535,75 @@ const searchCourseID = async (req, res) => {
   }
 };
 
+// GET /api/courses/search/by-ids?courseIds=CS2114,CS3114,MATH1226[&fields=name,creditHours]
+const searchCourseIDs = async (req, res) => {
+  try {
+    const { courseIds } = req.query;
+    if (!courseIds) {
+      return res
+        .status(400)
+        .json({ success: false, error: "courseIds is required" });
+    }
+    const ids = String(courseIds)
+      .split(",")
+      .map((c) => c.trim())
+      .filter(Boolean);
+    const data = await callTimetablePython("searchIDDataBatch", {
+      courseIds: ids,
+      fields: lookupFields(req.query),
+    });
+    if (data?.error)
+      return res.status(502).json({ success: false, error: data.error });
+    return res.json({ success: true, count: ids.length, data });
+  } catch (error) {
+    console.error("Error searchCourseIDs:", error);
+    return res.status(500).json({
+      success: false,
+      error: "Failed to search by courseIds",
+      message: error.message,
+    });
+  }
+};
+
+// GET /api/courses/search/sections?year=2026&semester=Fall&courseId=CS2114
+//     [&campus=blacksburg,virtual&modality=in_person,hybrid&type=lecture,lab]
+const searchCourseSections = async (req, res) => {
+  try {
+    const { year, semester, courseId } = req.query;
+    if (!year || !semester || !courseId) {
+      return res.status(400).json({
+        success: false,
+        error: "year, semester, and courseId are required",
+      });
+    }
+    if (!isValidYear(year)) {
+      return res
+        .status(400)
+        .json({ success: false, error: "year must be four digits" });
+    }
+    const data = await callTimetablePython("searchID", {
+      year,
+      semester,
+      courseId: String(courseId).trim(),
+      ...fanoutScope(req.query),
+      deadline: lookupDeadline(req.query),
+      fields: lookupFields(req.query),
+    });
+    if (data?.error)
+      return res.status(502).json({ success: false, error: data.error });
+    // ?fields= may leave sections out; count is omitted then
+    const count = Array.isArray(data.sections) ? data.sections.length : undefined;
+    return res.json({ success: true, count, data });
+  } catch (error) {
+    console.error("Error searchCourseSections:", error);
+    return res.status(500).json({
+      success: false,
+      error: "Failed to search course sections",
+      message: error.message,
+    });
+  }
+};
+
 // GET /api/courses/search/by-crn?year=2026&semester=Fall&crn=91234
 const searchCourseCRN = async (req, res) => {
   try {
@@ -471,11 +614,18 @@ const searchCourseCRN = async (req, res) => {
         error: "year, semester, and crn are required",
       });
     }
+    if (!isValidYear(year)) {
+      return res
+        .status(400)
+        .json({ success: false, error: "year must be four digits" });
+    }
     crn = String(crn).trim();
     const data = await callTimetablePython("searchCRNData", {
       year,
       semester,
       crn,
+      deadline: lookupDeadline(req.query),
+      fields: lookupFields(req.query),
     });
     if (data?.error)
       return res.status(502).json({ success: false, error: data.error });
@@ -490,6 +640,45 @@ const searchCourseCRN = async (req, res) => {
   }
 };
 
+/**
+ * List courses satisfying a Pathways/CLE code, e.g. ?pathway=G06A
+ * (optional year and semester; default is the next semester)
+ */
+const searchCoursesByPathway = async (req, res) => {
+  try {
+    const { pathway, year, semester } = req.query;
+    if (!pathway) {
+      return res
+        .status(400)
+        .json({ success: false, error: "pathway is required" });
+    }
+    if (year !== undefined && !isValidYear(year)) {
+      return res
+        .status(400)
+        .json({ success: false, error: "year must be four digits" });
+    }
+    const data = await callTimetablePython("coursesByPathway", {
+      pathway: String(pathway).trim(),
+      year,
+      semester,
+    });
+    // The index is built by configSeed / prewarm, never per request
+    // (17 term-wide timetable queries; see pythonTimetables/pathwayIndex.py)
+    if (data?.errorType === "IndexNotBuilt")
+      return res.status(503).json({ success: false, error: data.error });
+    if (data?.error)
+      return res.status(502).json({ success: false, error: data.error });
+    return res.json({ success: true, count: data.courses.length, data });
+  } catch (error) {
+    console.error("Error searchCoursesByPathway:", error);
+    return res.status(500).json({
+      success: false,
+      error: "Failed to search by pathway",
+      message: error.message,
+    });
+  }
+};
+
 module.exports = {
   getAllCourses,
   getCourseById,
@@ -499,5 +688,8 @@ module.exports = {
   getCoursesByCategory,
   checkPrerequisites,
   searchCourseID,
+  searchCourseIDs,
   searchCourseCRN,
+  searchCoursesByPathway,
+  searchCourseSections,
 };
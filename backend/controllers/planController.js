@@ -661,6 +661,51 @@ const exportPDF = async (req, res) => {
   }
 };
 
+/**
+ * Build a minimum-semester plan, or repair an existing one, with planOptimizer.py
+ * Body: { completed, required, maxCredits, startTerm, includeSummer, useOfferings, plan }
+ */
+const optimizePlan = async (req, res) => {
+  try {
+    const python = spawn(PY_INTERPRETER, ["planOptimizer.py"]);
+
+    let out = "";
+    let err = "";
+    python.stdout.on("data", (d) => (out += d.toString()));
+    python.stderr.on("data", (d) => (err += d.toString()));
+
+    python.on("close", (code) => {
+      if (code !== 0) {
+        console.error("Plan optimizer exited with code:", code, err);
+        return res.status(500).json({
+          success: false,
+          error: "Failed to optimize plan",
+          message: err,
+        });
+      }
+      try {
+        res.json({ success: true, data: JSON.parse(out) });
+      } catch (e) {
+        res.status(500).json({
+          success: false,
+          error: "Failed to parse optimizer output",
+          message: e.message,
+        });
+      }
+    });
+
+    python.stdin.write(JSON.stringify(req.body || {}));
+    python.stdin.end();
+  } catch (error) {
+    console.error("Error optimizing plan:", error);
+    res.status(500).json({
+      success: false,
+      error: "Failed to optimize plan",
+      message: error.message,
+    });
+  }
+};
+
 module.exports = {
   getUserPlans,
   getPlanById,
@@ -672,4 +717,5 @@ module.exports = {
   moveCourseBetweenSemesters,
   validatePlan,
   exportPDF,
+  optimizePlan,
 };
@@ -1,5 +1,8 @@
+const { spawn } = require("child_process");
 const { db } = require("../db");
 
+const PY_INTERPRETER = process.env.PY_INTERPRETER || "python";
+
 /**
  * Get user profile by ID
  */
@@ -368,6 +371,65 @@ const getUserProgress = async (req, res) => {
   }
 };
 
+/**
+ * Cohort-wide progress analytics with cohortAnalytics.py: credits by category,
+ * requirement completion and bottleneck courses across all users.
+ * Query: ?top=10&includeUsers=false
+ */
+const getCohortProgress = async (req, res) => {
+  try {
+    // One collection read instead of a course lookup per completed course
+    const snapshot = await db.collection("users").get();
+    const users = snapshot.docs.map((doc) => ({
+      id: doc.id,
+      completedCourses: (doc.data().completedCourses || []).map((c) => c.courseCode),
+    }));
+
+    const python = spawn(PY_INTERPRETER, ["cohortAnalytics.py"]);
+
+    let out = "";
+    let err = "";
+    python.stdout.on("data", (d) => (out += d.toString()));
+    python.stderr.on("data", (d) => (err += d.toString()));
+
+    python.on("close", (code) => {
+      if (code !== 0) {
+        console.error("Cohort analytics exited with code:", code, err);
+        return res.status(500).json({
+          success: false,
+          error: "Failed to compute cohort progress",
+          message: err,
+        });
+      }
+      try {
+        res.json({ success: true, data: JSON.parse(out) });
+      } catch (e) {
+        res.status(500).json({
+          success: false,
+          error: "Failed to parse cohort analytics output",
+          message: e.message,
+        });
+      }
+    });
+
+    python.stdin.write(
+      JSON.stringify({
+        users,
+        top: Number(req.query.top) || 10,
+        includeUsers: req.query.includeUsers === "true",
+      })
+    );
+    python.stdin.end();
+  } catch (error) {
+    console.error("Error getting cohort progress:", error);
+    res.status(500).json({
+      success: false,
+      error: "Failed to fetch cohort progress",
+      message: error.message,
+    });
+  }
+};
+
 module.exports = {
   getUserProfile,
   createUserProfile,
@@ -376,4 +438,5 @@ module.exports = {
   addCompletedCourse,
   removeCompletedCourse,
   getUserProgress,
+  getCohortProgress,
 };
@@ -0,0 +1,539 @@
+"""
+End-to-end load test for the timetable search endpoints.
+
+Starts a stand-in VT server, then the backend (`node server.js`) with its
+Python bridge pointed at the stand-in via TIMETABLE_UPSTREAM_OVERRIDE (see
+pythonTimetables/transport.py). It then drives a request mix at one or more
+concurrency levels. Each level is closed-loop: N workers, each sending its
+next request as soon as the previous one returns.
+
+Per level, the report gives:
+    - latency p50/p95/p99/max, throughput and error rate, per endpoint and
+      overall;
+    - upstream amplification: stand-in requests per client request, by
+      upstream endpoint;
+    - Python processes: bridge processes spawned, and the peak number alive
+      at once (from /proc, so Linux only).
+
+Reports are JSON with sorted keys. Run details (time, git revision,
+arguments) sit under "meta", so two builds' reports diff cleanly:
+
+    python loadTest.py run --concurrency 1 8 32 --duration 20 --out before.json
+    python loadTest.py run --concurrency 1 8 32 --duration 20 --out after.json
+    python loadTest.py compare before.json after.json
+
+The backend needs its usual setup (node_modules, serviceAccountKey.json).
+To test a backend that is already running, pass --base-url and start it with
+TIMETABLE_UPSTREAM_OVERRIDE pointing at `python loadTest.py standin`. Process
+counts are only available when the harness starts the backend itself.
+
+Caches and rate-limit state go to a fresh temporary directory per run.
+Upstream rate limits are off unless --rate-limits is given, so by default
+the numbers measure the bridge rather than the configured upstream budget.
+"""
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+ENDPOINTS = {
+    "by-id": "/api/courses/search/by-id",
+    "by-ids": "/api/courses/search/by-ids",
+    "by-crn": "/api/courses/search/by-crn",
+}
+
+
+# ---------- stand-in VT server ----------
+
+class Catalogue:
+    """Synthetic courses and sections served by the stand-in."""
+
+    def __init__(self, courses: int = 200, sections: int = 3, seed: int = 7) -> None:
+        rng = random.Random(seed)
+        self.sections: List[dict] = []
+        self.course_ids: List[str] = []
+        crn = 10000
+        for i in range(courses):
+            subject = ("CS", "MATH", "ECE", "STAT")[i % 4]
+            code = str(1000 + (i * 37) % 4000)
+            course_id = f"{subject}{code}"
+            if course_id in self.course_ids:
+                continue
+            self.course_ids.append(course_id)
+            pathways = rng.sample(["AR01", "AR04", "G02", "G03", "G06A", "G07"], rng.randint(0, 2))
+            for s in range(sections):
+                self.sections.append({
+                    "crn": str(crn), "subject": subject, "code": code,
+                    "name": f"Synthetic Course {i}", "pathways": pathways,
+                    "days": ("M W F", "T R")[s % 2],
+                    "times": (("9:05AM", "9:55AM"), ("11:00AM", "12:15PM"), ("2:30PM", "3:45PM"))[s % 3],
+                })
+                crn += 1
+        self.by_crn = {s["crn"]: s for s in self.sections}
+
+    def search(self, form: Dict[str, str]) -> List[dict]:
+        crn = form.get("crn", "").strip()
+        if crn:
+            return [self.by_crn[crn]] if crn in self.by_crn else []
+        subject = form.get("subj_code", "%")
+        code = form.get("CRSE_NUMBER", "")
+        core = form.get("CORE_CODE", "AR%")
+        return [s for s in self.sections
+                if subject in ("%", s["subject"]) and code in ("", s["code"])
+                and (core == "AR%" or core in s["pathways"])]
+
+    def results_page(self, sections: List[dict]) -> str:
+        def tr(cells):
+            return "<TR>" + "".join(f'<TD class="dedefault">{c}</TD>' for c in cells) + "</TR>\n"
+
+        parts = ["<HTML><BODY>"] + ["<TABLE><TR><TD>nav</TD></TR></TABLE>"] * 4
+        parts.append('<TABLE class="dataentrytable">')
+        parts.append(tr(["CRN", "Course", "Title", "Schedule Type", "Modality", "Cr Hrs",
+                         "Capacity", "Instructor", "Days", "Begin", "End", "Location", "Exam"]))
+        for s in sections:
+            parts.append(tr([f"<b>{s['crn']}</b>", f"{s['subject']}-{s['code']}", s["name"],
+                             "L", "Face-to-Face Instruction", "3", "40", "Staff",
+                             s["days"], *s["times"], "MCB 100", "x"]))
+        parts.append("</TABLE>")
+        codes = sorted({p for s in sections for p in s["pathways"]})
+        if codes:
+            parts.append(f"<P>Pathways: {' '.join(codes)}</P>")
+        parts.append("</BODY></HTML>")
+        return "".join(parts)
+
+    def comments_page(self, crn: str) -> str:
+        section = self.by_crn.get(crn)
+        prereq = "CS 2114 and MATH 2534" if section else ""
+        return ('<TABLE><TR><TD>Prerequisites:</TD><TD class="pldefault">' + prereq + "</TD></TR>"
+                '<TR><TD>Catalog Description:</TD><TD class="pldefault">Synthetic.</TD></TR>'
+                '<TR><TD>Comments:</TD><TD class="pldefault"></TD></TR></TABLE>')
+
+
+class StandIn:
+    """A threaded HTTP server answering the VT timetable and Banner endpoints."""
+
+    def __init__(self, catalogue: Catalogue, port: int = 0,
+                 latency_ms: float = 50.0, error_rate: float = 0.0) -> None:
+        self.catalogue = catalogue
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                standin._handle(self, "GET")
+
+            def do_POST(self):
+                standin._handle(self, "POST")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "StandIn":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+
+    def take_counts(self) -> Counter:
+        with self._lock:
+            counts, self.counts = self.counts, Counter()
+        return counts
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        path, _, query = handler.path.partition("?")
+        body = handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        form = {k: v[0] for k, v in parse_qs(body.decode("utf-8"), keep_blank_values=True).items()}
+        params = {k: v[0] for k, v in parse_qs(query).items()}
+        endpoint = f"{method} {path.rsplit('/', 1)[-1]}"
+        with self._lock:
+            self.counts[endpoint] += 1
+
+        if self.latency_ms:
+            time.sleep(random.uniform(0.5, 1.5) * self.latency_ms / 1000)
+        if random.random() < self.error_rate:
+            status, text = 503, "Service Unavailable"
+        elif path.endswith("P_ProcRequest") and method == "POST":
+            sections = self.catalogue.search(form)
+            status, text = 200, (self.catalogue.results_page(sections) if sections else
+                                 "There was a problem with your request NO SECTIONS FOUND FOR THIS INQUIRY")
+        elif path.endswith("P_ProcRequest"):
+            subjects = sorted({s["subject"] for s in self.catalogue.sections})
+            status, text = 200, "".join(f'("{s} - Subject {s}"' for s in subjects)
+        elif path.endswith("P_ProcComments"):
+            status, text = 200, self.catalogue.comments_page(params.get("CRN", ""))
+        else:
+            status, text = 404, "Not Found"
+
+        data = text.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+# ---------- backend and process sampling ----------
+
+def start_backend(command: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    proc = subprocess.Popen(shlex.split(command), cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"backend exited with {proc.returncode}:\n"
+                             f"{proc.stderr.read().decode('utf-8', 'replace')[-2000:]}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("backend did not answer /health within 30 s")
+
+
+def _proc_table() -> Dict[int, Tuple[int, str]]:
+    """pid -> (ppid, comm) for every process, from /proc."""
+    table = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", encoding="utf-8", errors="replace") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        comm = stat[stat.index("(") + 1:stat.rindex(")")]
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        table[int(name)] = (ppid, comm)
+    return table
+
+
+class ProcessSampler:
+    """Polls /proc for Python processes descended from `root_pid`."""
+
+    def __init__(self, root_pid: Optional[int], interval: float = 0.02) -> None:
+        self.root_pid = root_pid
+        self.interval = interval
+        self.enabled = root_pid is not None and os.path.isdir("/proc")
+        self._stop = threading.Event()
+        self.reset()
+
+    def reset(self) -> None:
+        self.seen = set()
+        self.peak = 0
+        self.samples = 0
+        self.total_alive = 0
+
+    def start(self) -> "ProcessSampler":
+        if self.enabled:
+            threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            table = _proc_table()
+            children = defaultdict(list)
+            for pid, (ppid, _) in table.items():
+                children[ppid].append(pid)
+            stack, alive = list(children[self.root_pid]), []
+            while stack:
+                pid = stack.pop()
+                if table[pid][1].startswith("python"):
+                    alive.append(pid)
+                stack.extend(children[pid])
+            self.seen.update(alive)
+            self.peak = max(self.peak, len(alive))
+            self.samples += 1
+            self.total_alive += len(alive)
+
+    def report(self) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        return {"spawned": len(self.seen), "peakAlive": self.peak,
+                "meanAlive": round(self.total_alive / self.samples, 2) if self.samples else 0.0}
+
+
+# ---------- load generation ----------
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """'by-id=3,by-crn=1' -> [('by-id', 3.0), ('by-crn', 1.0)]."""
+    mix = []
+    for item in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"unknown endpoint {name!r} in --mix; expected one of {sorted(ENDPOINTS)}")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def make_request(name: str, catalogue: Catalogue, rng: random.Random,
+                 distinct: int, batch: int) -> str:
+    """Path and query for one request; keys are drawn from the first `distinct` courses."""
+    ids = catalogue.course_ids[:distinct or None]
+    if name == "by-id":
+        return f"{ENDPOINTS[name]}?{urlencode({'courseId': rng.choice(ids)})}"
+    if name == "by-ids":
+        return f"{ENDPOINTS[name]}?{urlencode({'courseIds': ','.join(rng.sample(ids, min(batch, len(ids))))})}"
+    course_id = rng.choice(ids)
+    crns = [s["crn"] for s in catalogue.sections if f"{s['subject']}{s['code']}" == course_id]
+    return f"{ENDPOINTS[name]}?{urlencode({'year': '2026', 'semester': 'Fall', 'crn': rng.choice(crns)})}"
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-q * len(sorted_values) // 100)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    count = len(values)
+    ms = lambda v: round(v * 1000, 1) if v is not None else None  # noqa: E731
+    return {
+        "requests": count,
+        "errors": errors,
+        "errorRate": round(errors / count, 4) if count else 0.0,
+        "throughputRps": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50Ms": ms(percentile(values, 50)),
+        "p95Ms": ms(percentile(values, 95)),
+        "p99Ms": ms(percentile(values, 99)),
+        "maxMs": ms(values[-1] if values else None),
+    }
+
+
+def run_level(base_url: str, concurrency: int, mix: List[Tuple[str, float]],
+              catalogue: Catalogue, duration: float, requests: int, seed: int,
+              distinct: int, batch: int, timeout: float) -> Tuple[dict, float]:
+    """Drive one concurrency level; returns (per-endpoint results, elapsed seconds)."""
+    names = [n for n, _ in mix]
+    weights = [w for _, w in mix]
+    results: Dict[str, List[Tuple[float, bool]]] = defaultdict(list)
+    lock = threading.Lock()
+    sent = [0]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def next_slot() -> bool:
+        with lock:
+            if requests and sent[0] >= requests:
+                return False
+            sent[0] += 1
+        return deadline is None or time.perf_counter() < deadline
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        while next_slot():
+            name = rng.choices(names, weights)[0]
+            url = base_url + make_request(name, catalogue, rng, distinct, batch)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as resp:
+                    ok = resp.status == 200 and json.loads(resp.read()).get("success") is True
+            except (urllib.error.URLError, OSError, ValueError):
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                results[name].append((elapsed, ok))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - start
+
+
+def run(args) -> dict:
+    catalogue = Catalogue(args.courses, args.sections)
+    standin = StandIn(catalogue, args.standin_port, args.upstream_latency_ms,
+                      args.upstream_error_rate).start()
+    workdir = tempfile.mkdtemp(prefix="vt-loadtest-")
+    backend = None
+    base_url = args.base_url.rstrip("/") if args.base_url else None
+    if base_url is None:
+        env = dict(os.environ, PORT=str(args.port), PY_INTERPRETER=args.python,
+                   TIMETABLE_UPSTREAM_OVERRIDE=standin.url,
+                   TIMETABLE_CACHE_DIR=os.path.join(workdir, "cache"),
+                   RATE_LIMIT_DIR=os.path.join(workdir, "ratelimit"))
+        if not args.rate_limits:
+            env["UPSTREAM_RATE_LIMITS"] = "off"
+        backend = start_backend(args.backend_cmd, args.port, env)
+        base_url = f"http://127.0.0.1:{args.port}"
+    sampler = ProcessSampler(backend.pid if backend else None).start()
+
+    mix = parse_mix(args.mix)
+    levels = []
+    try:
+        for concurrency in args.concurrency:
+            if args.warmup:
+                run_level(base_url, concurrency, mix, catalogue, 0, args.warmup, args.seed + 1,
+                          args.distinct, args.batch, args.timeout)
+            standin.take_counts()
+            sampler.reset()
+            results, elapsed = run_level(base_url, concurrency, mix, catalogue, args.duration,
+                                         args.requests, args.seed, args.distinct, args.batch,
+                                         args.timeout)
+            upstream = standin.take_counts()
+            client_total = sum(len(v) for v in results.values())
+            everything = [r for v in results.values() for r in v]
+            level = {
+                "concurrency": concurrency,
+                "elapsedS": round(elapsed, 3),
+                "overall": summarize([t for t, _ in everything],
+                                     sum(not ok for _, ok in everything), elapsed),
+                "endpoints": {name: summarize([t for t, _ in rows], sum(not ok for _, ok in rows), elapsed)
+                              for name, rows in sorted(results.items())},
+                "upstream": {
+                    "requests": sum(upstream.values()),
+                    "byEndpoint": dict(sorted(upstream.items())),
+                    "amplification": round(sum(upstream.values()) / client_total, 3) if client_total else None,
+                },
+                "python": sampler.report(),
+            }
+            levels.append(level)
+            o = level["overall"]
+            print(f"c={concurrency:<4d} {o['requests']:6d} req  {o['throughputRps']:8.2f} rps  "
+                  f"p50 {o['p50Ms']} ms  p95 {o['p95Ms']} ms  p99 {o['p99Ms']} ms  "
+                  f"errors {o['errorRate']:.2%}  upstream x{level['upstream']['amplification']}",
+                  file=sys.stderr)
+    finally:
+        sampler.stop()
+        if backend is not None:
+            backend.terminate()
+            backend.wait(timeout=10)
+        standin.stop()
+
+    return {"meta": {"startedAt": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "gitRevision": _git_revision(),
+                     "args": {k: v for k, v in sorted(vars(args).items()) if k != "func"}},
+            "config": {"mix": dict(mix), "duration": args.duration, "requests": args.requests,
+                       "courses": len(catalogue.course_ids), "distinct": args.distinct,
+                       "upstreamLatencyMs": args.upstream_latency_ms,
+                       "upstreamErrorRate": args.upstream_error_rate,
+                       "rateLimits": args.rate_limits},
+            "levels": levels}
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before: dict, after: dict) -> List[str]:
+    """One line per numeric metric that is in both reports, with the relative change."""
+    def flatten(level: dict, prefix: str = "") -> Dict[str, float]:
+        out = {}
+        for key, value in level.items():
+            if isinstance(value, dict):
+                out.update(flatten(value, f"{prefix}{key}."))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                out[prefix + key] = value
+        return out
+
+    old = {lv["concurrency"]: flatten(lv) for lv in before["levels"]}
+    new = {lv["concurrency"]: flatten(lv) for lv in after["levels"]}
+    lines = []
+    for concurrency in sorted(set(old) & set(new)):
+        lines.append(f"concurrency {concurrency}")
+        for key in sorted(set(old[concurrency]) & set(new[concurrency])):
+            if key == "concurrency":
+                continue
+            a, b = old[concurrency][key], new[concurrency][key]
+            change = f"{(b - a) / a:+.1%}" if a else ("" if a == b else "new")
+            lines.append(f"  {key:40s} {a:>12} -> {b:<12} {change}")
+    return lines
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the course search endpoints.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="start a stand-in VT server and the backend, then load them")
+    p_run.add_argument("--mix", default="by-id=3,by-crn=1",
+                       help="endpoint weights, e.g. by-id=3,by-crn=1,by-ids=1")
+    p_run.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    p_run.add_argument("--duration", type=float, default=20.0, help="seconds per level (0: use --requests)")
+    p_run.add_argument("--requests", type=int, default=0, help="requests per level (0: use --duration)")
+    p_run.add_argument("--warmup", type=int, default=0, help="unrecorded requests before each level")
+    p_run.add_argument("--distinct", type=int, default=0,
+                       help="draw keys from this many courses (0: all); small values measure warm caches")
+    p_run.add_argument("--batch", type=int, default=5, help="course ids per by-ids request")
+    p_run.add_argument("--courses", type=int, default=200)
+    p_run.add_argument("--sections", type=int, default=3)
+    p_run.add_argument("--seed", type=int, default=1)
+    p_run.add_argument("--timeout", type=float, default=90.0)
+    p_run.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    p_run.add_argument("--upstream-error-rate", type=float, default=0.0)
+    p_run.add_argument("--rate-limits", action="store_true", help="keep the upstream rate limits on")
+    p_run.add_argument("--port", type=int, default=5099, help="backend port")
+    p_run.add_argument("--standin-port", type=int, default=0)
+    p_run.add_argument("--backend-cmd", default="node server.js")
+    p_run.add_argument("--python", default=os.environ.get("PY_INTERPRETER", sys.executable),
+                       help="interpreter for the bridge")
+    p_run.add_argument("--base-url", help="use an already-running backend instead of starting one")
+    p_run.add_argument("--out", default="loadtest-report.json")
+
+    p_standin = sub.add_parser("standin", help="only run the stand-in VT server")
+    p_standin.add_argument("--port", type=int, default=8081)
+    p_standin.add_argument("--courses", type=int, default=200)
+    p_standin.add_argument("--sections", type=int, default=3)
+    p_standin.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    p_standin.add_argument("--upstream-error-rate", type=float, default=0.0)
+
+    p_compare = sub.add_parser("compare", help="compare two reports")
+    p_compare.add_argument("before")
+    p_compare.add_argument("after")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        if not args.duration and not args.requests:
+            parser.error("set --duration or --requests")
+        report = run(args)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"wrote {args.out}", file=sys.stderr)
+    elif args.command == "standin":
+        server = StandIn(Catalogue(args.courses, args.sections), args.port,
+                         args.upstream_latency_ms, args.upstream_error_rate)
+        print(f"stand-in VT server on {server.url}; start the backend with "
+              f"TIMETABLE_UPSTREAM_OVERRIDE={server.url}", file=sys.stderr)
+        server.server.serve_forever()
+    else:
+        with open(args.before, encoding="utf-8") as f:
+            before = json.load(f)
+        with open(args.after, encoding="utf-8") as f:
+            after = json.load(f)
+        print("\n".join(compare(before, after)))
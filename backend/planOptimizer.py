@@ -0,0 +1,672 @@
+"""
+Prerequisite-aware multi-semester plan optimizer.
+
+Reads a JSON request on stdin and writes a JSON result on stdout, the same way
+pdf_generator.py is driven from planController:
+
+    {
+      "completed": ["CS1114", "MATH1225"],
+      "required": ["CS3114", "CS3214", "CS4104", ...],
+      "maxCredits": 16,                 # or a list, one cap per semester
+      "startTerm": "Fall",
+      "includeSummer": false,
+      "useOfferings": true,             # respect courses.json "semesters"
+      "plan": {...}                     # optional: existing plan to repair
+    }
+
+Prerequisites use the courses.json nested-list format: each inner list is an
+OR-group and every group must be satisfied. Codes that are not in the catalog
+(AP credit, courses from other departments) cannot be scheduled; a group made
+only of such codes is reported under "unresolved" and treated as satisfied.
+Cross-listed courses (the courses.json "crossListed" field) are one course:
+completing or scheduling any listing satisfies all of them.
+
+Scheduling starts with list scheduling by critical path (the longest chain
+of dependent courses first). If that plan is longer than the lower bound
+max(longest prerequisite chain, total credits / cap), a branch-and-bound
+search over each semester's ready set looks for a shorter one, within
+SEARCH_NODES search steps. "optimal" is true when the plan reaches the
+bound or the search finished, proving no shorter plan exists; when the
+budget runs out the best plan found so far is returned.
+"""
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+COURSES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "courses.json")
+DEFAULT_MAX_CREDITS = 16
+DEFAULT_CREDITS = 3
+MAX_SEMESTERS = 16
+SEARCH_NODES = 200000
+
+
+class _OutOfBudget(Exception):
+    """The plan search used up its step budget."""
+
+
+def load_catalog(path: str = COURSES_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Load courses.json into {code: {"credits", "prerequisites", "corequisites", "semesters",
+    "crossListed", "category"}}. Variable-credit courses ([1, 19]) count at their minimum.
+    """
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+    catalog = {}
+    for r in records:
+        credits = r.get("credits") or [DEFAULT_CREDITS]
+        catalog[r["code"]] = {
+            "credits": int(credits[0]),
+            "prerequisites": [list(dict.fromkeys(g)) for g in r.get("prerequisites") or [] if g],
+            "corequisites": list(r.get("corequisites") or []),
+            "semesters": list(r.get("semesters") or []),
+            "crossListed": list(r.get("crossListed") or []),
+            "category": r.get("category") or "Uncategorized",
+        }
+    return catalog
+
+
+def term_sequence(start_term: str, count: int, include_summer: bool = False) -> List[Dict[str, Any]]:
+    """
+    Return `count` consecutive terms as plan semesters ({"year", "term"}),
+    with plan years starting at 1 and advancing at each Fall.
+    """
+    order = ["Fall", "Spring", "Summer"] if include_summer else ["Fall", "Spring"]
+    idx = order.index(start_term.title()) if start_term.title() in order else 0
+    year = 1
+    terms = []
+    for i in range(count):
+        if i > 0 and order[idx] == "Fall":
+            year += 1
+        terms.append({"year": year, "term": order[idx]})
+        idx = (idx + 1) % len(order)
+    return terms
+
+
+class PlanOptimizer:
+    """Build and repair semester plans against a course catalog."""
+
+    def __init__(self, catalog: Dict[str, Dict[str, Any]]) -> None:
+        self.catalog = catalog
+        self._chain_cache: Dict[str, int] = {}
+        self.aliases: Dict[str, Set[str]] = {}
+        for code, entry in catalog.items():
+            for alias in entry.get("crossListed", []):
+                self.aliases.setdefault(code, set()).add(alias)
+                self.aliases.setdefault(alias, set()).add(code)
+
+    def _taken(self, code: str, done: Set[str]) -> bool:
+        """Whether `code` or another listing of it is in `done`."""
+        return code in done or any(a in done for a in self.aliases.get(code, ()))
+
+    def _with_aliases(self, codes: Iterable[str]) -> Set[str]:
+        """`codes` plus the other listings of each."""
+        codes = set(codes)
+        return codes.union(*(self.aliases.get(c, ()) for c in codes))
+
+    # ---------- prerequisite closure ----------
+
+    def _chain_length(self, code: str, stack: Tuple[str, ...] = ()) -> int:
+        """Number of semesters needed to take `code` from scratch (1 if no prereqs)."""
+        if code in self._chain_cache:
+            return self._chain_cache[code]
+        if code not in self.catalog or code in stack:
+            return 0
+        longest = 0
+        for group in self.catalog[code]["prerequisites"]:
+            options = [self._chain_length(c, stack + (code,)) for c in group if c in self.catalog]
+            if options:
+                longest = max(longest, min(options))
+        self._chain_cache[code] = longest + 1
+        return longest + 1
+
+    def close_requirements(self, required: Iterable[str], completed: Set[str]
+                           ) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """
+        Expand `required` with the prerequisites needed to take it.
+
+        For each OR-group not already covered by a completed or required
+        course, the catalog member with the shortest prerequisite chain is
+        added. Returns (courses to schedule, added prerequisites, unresolved
+        groups).
+        """
+        todo: List[str] = []
+        chosen: Set[str] = set()
+        for c in dict.fromkeys(required):
+            if c not in self.catalog:  # schedule the listing the catalog knows
+                c = next((a for a in sorted(self.aliases.get(c, ())) if a in self.catalog), c)
+            if not self._taken(c, completed) and not self._taken(c, chosen):
+                todo.append(c)
+                chosen.add(c)
+        added: List[str] = []
+        unresolved: List[Dict[str, Any]] = []
+        i = 0
+        while i < len(todo):
+            code = todo[i]
+            i += 1
+            for group in self.catalog.get(code, {}).get("prerequisites", []):
+                if any(self._taken(c, completed) or self._taken(c, chosen) for c in group):
+                    continue
+                options = [c for c in group if c in self.catalog]
+                if not options:
+                    unresolved.append({"course": code, "anyOf": group})
+                    continue
+                pick = min(options, key=lambda c: (self._chain_length(c),
+                                                   self.catalog[c]["credits"], c))
+                chosen.add(pick)
+                added.append(pick)
+                todo.append(pick)
+        return todo, added, unresolved
+
+    # ---------- scheduling ----------
+
+    def _group_satisfied(self, group: List[str], done: Set[str]) -> bool:
+        return any(self._taken(c, done) for c in group) or not any(c in self.catalog for c in group)
+
+    def _ready(self, code: str, done: Set[str]) -> bool:
+        return all(self._group_satisfied(g, done) for g in self.catalog[code]["prerequisites"])
+
+    def _offered(self, code: str, term: str, use_offerings: bool) -> bool:
+        offered = self.catalog[code]["semesters"]
+        return not use_offerings or not offered or term in offered
+
+    def schedule(self, courses: List[str], completed: Set[str],
+                 caps: List[int], terms: List[Dict[str, Any]],
+                 use_offerings: bool = True,
+                 pinned: Optional[Dict[str, int]] = None) -> Tuple[List[List[str]], List[str]]:
+        """
+        Assign `courses` to semesters, never exceeding caps[i] credits in
+        semester i. `pinned` fixes some courses to a semester index; the rest
+        are placed greedily, longest dependent chain first.
+        Returns (courses per semester, courses that could not be placed).
+        """
+        pinned = pinned or {}
+        unknown = [c for c in courses if c not in self.catalog]
+        remaining = [c for c in courses if c in self.catalog and c not in pinned]
+        members = set(remaining) | set(pinned)
+
+        # Priority: length of the longest chain of to-be-scheduled courses
+        # that depend on this one.
+        tail = self._tails(members)
+
+        semesters: List[List[str]] = [[] for _ in terms]
+        for code, idx in pinned.items():
+            if 0 <= idx < len(semesters):
+                semesters[idx].append(code)
+
+        done = set(completed)
+        for i, term in enumerate(terms):
+            if not remaining:
+                break
+            load = sum(self.catalog[c]["credits"] for c in semesters[i])
+            ready = sorted(
+                (c for c in remaining
+                 if self._ready(c, done) and self._offered(c, term["term"], use_offerings)),
+                key=lambda c: (-tail[c], -self.catalog[c]["credits"], c),
+            )
+            for code in ready:
+                credits = self.catalog[code]["credits"]
+                if load + credits <= caps[i] or (load == 0 and not semesters[i]):
+                    semesters[i].append(code)
+                    load += credits
+            remaining = [c for c in remaining if c not in semesters[i]]
+            done.update(semesters[i])
+
+        return semesters, remaining + unknown
+
+    def _tails(self, courses: Iterable[str]) -> Dict[str, int]:
+        """Length of the longest chain of `courses` starting at each (itself included)."""
+        members = set(courses)
+        dependents: Dict[str, List[str]] = {c: [] for c in members}
+        for c in members:
+            for group in self.catalog[c]["prerequisites"]:
+                for p in group:
+                    if p in dependents and p != c:
+                        dependents[p].append(c)
+        tail: Dict[str, int] = {}
+
+        def tail_len(c: str, stack: Tuple[str, ...] = ()) -> int:
+            if c not in tail:
+                tail[c] = 1 + max((tail_len(d, stack + (c,)) for d in dependents[c]
+                                   if d not in stack), default=0)
+            return tail[c]
+
+        for c in members:
+            tail_len(c)
+        return tail
+
+    def search(self, courses: List[str], completed: Set[str], caps: List[int],
+               terms: List[Dict[str, Any]], use_offerings: bool, limit: int,
+               max_nodes: int = SEARCH_NODES) -> Tuple[Optional[List[List[str]]], bool]:
+        """
+        Branch and bound for a plan of `courses` in fewer than `limit`
+        semesters. Each semester takes a maximal set of the ready courses
+        that fits its cap: taking a course later than it could be never
+        helps, so the other sets need not be tried. A branch is cut when
+        the rest can't fit in the semesters left to beat the best plan so
+        far: a prerequisite chain is too long, the credits don't fit (also
+        split at each semester), or no way of filling the semesters
+        leaves few enough credits unused.
+
+        Returns (the shortest plan found or None, whether the search
+        finished within `max_nodes` steps).
+        """
+        courses = [c for c in courses if c in self.catalog]
+        members = set(courses)
+        credits = {c: self.catalog[c]["credits"] for c in courses}
+        # Courses nothing else depends on are interchangeable with the others
+        # of the same credits and offerings.
+        loose = self._tails(courses)
+        kind = {c: ("", credits[c], tuple(self.catalog[c]["semesters"]))
+                if loose[c] == 1 and c not in self.aliases else (c, 0, ()) for c in courses}
+        # For the bounds, a course only waits for a prerequisite that is the
+        # one way to satisfy one of its groups.
+        requires: Dict[str, Set[str]] = {c: set() for c in courses}
+        for c in courses:
+            for group in self.catalog[c]["prerequisites"]:
+                if self._group_satisfied(group, completed):
+                    continue
+                options = {p for p in members if p != c and self._taken(p, set(group))}
+                if len(options) == 1:
+                    requires[c] |= options
+        tail: Dict[str, int] = {}
+
+        def chain(c: str, stack: Tuple[str, ...] = ()) -> int:
+            if c not in tail:
+                tail[c] = 1 + max((chain(d, stack + (c,)) for d in courses
+                                   if c in requires[d] and d not in stack), default=0)
+            return tail[c]
+
+        for c in courses:
+            chain(c)
+
+        best: List[Optional[List[List[str]]]] = [None]
+        bound = [min(limit, len(terms) + 1)]
+        nodes = [0]
+        seen: Set[Tuple[int, frozenset]] = set()
+        packs: Dict[Tuple[Tuple[int, ...], Tuple[Tuple[int, int], ...], int], bool] = {}
+
+        def bins_fit(room: Tuple[int, ...], counts: Tuple[Tuple[int, int], ...], slack: int) -> bool:
+            """
+            Whether courses of these (credits, count) pairs fill semesters
+            with `room` credits, leaving at most `slack` unused, ignoring
+            prerequisites. (With a 16 cap and 3-credit courses, for
+            instance, each semester also needs a course of other credits.)
+            """
+            if not room or not counts:
+                return not counts
+            key = (room, counts, slack)
+            if key not in packs:
+                packs[key] = False
+                values = [v for v, _ in counts]
+                limits = [n for _, n in counts]
+
+                def choose(k: int, load: int, taken: List[int]) -> bool:
+                    if k == len(values):
+                        if room[0] - load > slack:
+                            return False
+                        rest = tuple((v, n - t) for v, n, t in zip(values, limits, taken) if n > t)
+                        return bins_fit(room[1:], rest, slack - (room[0] - load))
+                    most = (room[0] - load) // values[k] if values[k] else limits[k]
+                    return any(choose(k + 1, load + t * values[k], taken + [t])
+                               for t in range(min(limits[k], most), -1, -1))
+
+                packs[key] = choose(0, 0, [])
+            return packs[key]
+
+        def fits(i: int, remaining: frozenset, done: Set[str], room: List[int]) -> bool:
+            """
+            Whether `remaining` could still be placed in semesters with
+            `room` credits from i on: every course can start early enough
+            to finish its chain, and for each split point the courses that
+            can't start before it, or must start before it, fit on their side.
+            """
+            left = len(room)
+            earliest: Dict[str, int] = {}
+
+            def start(c: str) -> int:
+                if c not in earliest:
+                    earliest[c] = 0  # cycle guard
+                    at = max((1 + min((start(p) for p in g if p in remaining), default=-1)
+                              for g in self.catalog[c]["prerequisites"]
+                              if not self._group_satisfied(g, done)), default=0)
+                    while at < left and not self._offered(c, terms[i + at]["term"], use_offerings):
+                        at += 1
+                    earliest[c] = at
+                return earliest[c]
+
+            late = [0] * (left + 1)   # credits that can't start before k
+            early = [0] * (left + 1)  # credits that must start before k
+            for c in remaining:
+                first, last = start(c), left - tail[c]
+                if first > last:
+                    return False
+                late[first] += credits[c]
+                early[last + 1] += credits[c]
+            later = sooner = 0
+            for k in range(left - 1, 0, -1):
+                later += late[k]
+                if later > sum(room[k:]):
+                    return False
+            for k in range(1, left):
+                sooner += early[k]
+                if sooner > sum(room[:k]):
+                    return False
+            return True
+
+        def fills(ready: List[str], cap: int, forced: Set[str], slack: float):
+            """
+            Maximal subsets of `ready` (priority order) within `cap` credits
+            that include `forced` and leave at most `slack` credits unused.
+            """
+            oversize = [c for c in ready if credits[c] > cap]
+            fitting = [c for c in ready if credits[c] <= cap]
+            if not forced - set(fitting):
+                for c in oversize:  # a lone course over the cap gets a semester to itself
+                    if not forced - {c}:
+                        yield [c]
+            after = [0] * (len(fitting) + 1)  # credits of fitting[j:]
+            for j in range(len(fitting) - 1, -1, -1):
+                after[j] = after[j + 1] + credits[fitting[j]]
+
+            def extend(j: int, chosen: List[str], load: int, skipped: frozenset):
+                nodes[0] += 1
+                if nodes[0] > max_nodes:
+                    raise _OutOfBudget
+                if cap - min(cap, load + after[j]) > slack:
+                    return
+                if j == len(fitting):
+                    if all(c in chosen or load + credits[c] > cap for c in fitting):
+                        yield list(chosen)
+                    return
+                c = fitting[j]
+                # Interchangeable courses are taken in order: once one is left
+                # out, the later ones are too.
+                if load + credits[c] <= cap and kind[c] not in skipped:
+                    chosen.append(c)
+                    yield from extend(j + 1, chosen, load + credits[c], skipped)
+                    chosen.pop()
+                if c not in forced:
+                    yield from extend(j + 1, chosen, load, skipped | {kind[c]})
+
+            if fitting or not oversize:
+                yield from extend(0, [], 0, frozenset())
+
+        def visit(i: int, remaining: frozenset, done: Set[str], plan: List[List[str]]) -> None:
+            if not remaining:
+                best[0], bound[0] = [list(s) for s in plan], i
+                return
+            left = min(bound[0] - 1, len(terms)) - i  # semesters left to beat the best plan
+            if left <= 0 or max(tail[c] for c in remaining) > left or (i, remaining) in seen:
+                return
+            seen.add((i, remaining))
+            offered = {terms[j]["term"] for j in range(i, i + left)
+                       if any(self._offered(c, terms[j]["term"], use_offerings) for c in remaining)}
+            room = [caps[j] if terms[j]["term"] in offered else 0 for j in range(i, i + left)]
+            forced = {c for c in remaining if tail[c] >= left}
+            if any(credits[c] > cap for c in remaining for cap in room if cap):
+                slack = math.inf  # over-cap courses break the credit count
+            else:
+                slack = sum(room) - sum(credits[c] for c in remaining)
+                counts: Dict[int, int] = {}
+                for c in remaining:
+                    counts[credits[c]] = counts.get(credits[c], 0) + 1
+                if (slack < 0 or not fits(i, remaining, done, room)
+                        or not bins_fit(tuple(room), tuple(sorted(counts.items())), slack)):
+                    return
+            ready = sorted((c for c in remaining
+                            if self._ready(c, done) and self._offered(c, terms[i]["term"], use_offerings)),
+                           key=lambda c: (-tail[c], -credits[c], kind[c], c))
+            if forced - set(ready):
+                return
+            for chosen in fills(ready, room[0], forced, slack):
+                plan.append(chosen)
+                visit(i + 1, remaining.difference(chosen), done | set(chosen), plan)
+                plan.pop()
+
+        try:
+            visit(0, frozenset(courses), set(completed), [])
+        except _OutOfBudget:
+            return best[0], False
+        return best[0], True
+
+    def lower_bound(self, courses: List[str], completed: Set[str], caps: List[int]) -> int:
+        """max(longest unmet prerequisite chain, semesters of `caps` to hold the credits)."""
+        known = [c for c in courses if c in self.catalog]
+        if not known:
+            return 0
+        saved = self._chain_cache
+        # Chains through completed courses cost nothing.
+        self._chain_cache = {c: 0 for c in completed}
+        chain = max(self._chain_length(c) for c in known)
+        self._chain_cache = saved
+        credits = sum(self.catalog[c]["credits"] for c in known)
+        semesters = 0
+        while credits > 0 and semesters < len(caps):
+            credits -= caps[semesters]
+            semesters += 1
+        return max(chain, semesters)
+
+    def optimize(self, completed: Iterable[str], required: Iterable[str],
+                 max_credits=DEFAULT_MAX_CREDITS, start_term: str = "Fall",
+                 include_summer: bool = False, use_offerings: bool = True) -> Dict[str, Any]:
+        """Compute a feasible plan with as few semesters as possible."""
+        completed = self._with_aliases(completed)
+        courses, added, unresolved = self.close_requirements(required, completed)
+        terms = term_sequence(start_term, MAX_SEMESTERS, include_summer)
+        caps = _caps(max_credits, len(terms))
+
+        semesters, unschedulable = self.schedule(courses, completed, caps, terms, use_offerings)
+        used = max((i + 1 for i, s in enumerate(semesters) if s), default=0)
+        bound = self.lower_bound(courses, completed, caps)
+        proven = used == bound
+        if not proven and not unschedulable:
+            shorter, proven = self.search(courses, completed, caps, terms, use_offerings, used)
+            if shorter is not None:
+                semesters, used = shorter, len(shorter)
+        return {
+            "semesters": self._format(semesters[:used], terms),
+            "semesterCount": used,
+            "lowerBound": bound,
+            "optimal": proven and not unschedulable,
+            "addedPrerequisites": added,
+            "unresolved": unresolved,
+            "unschedulable": unschedulable,
+        }
+
+    # ---------- repair ----------
+
+    def validate(self, plan: List[Dict[str, Any]], completed: Set[str], caps: List[int],
+                 use_offerings: bool = True) -> List[Dict[str, Any]]:
+        """Return prerequisite, offering and credit-cap violations in `plan`."""
+        violations = []
+        done = set(completed)
+        for i, sem in enumerate(plan):
+            codes = sem["courses"]
+            credits = sum(self.catalog.get(c, {}).get("credits", 0) for c in codes)
+            if credits > caps[i]:
+                violations.append({"type": "overload", "semester": i,
+                                   "credits": credits, "maxCredits": caps[i]})
+            for code in codes:
+                if code not in self.catalog:
+                    continue
+                missing = [g for g in self.catalog[code]["prerequisites"]
+                           if not self._group_satisfied(g, done)]
+                if missing:
+                    violations.append({"type": "prerequisite", "semester": i,
+                                       "course": code, "missing": missing})
+                if not self._offered(code, sem["term"], use_offerings):
+                    violations.append({"type": "offering", "semester": i, "course": code,
+                                       "offered": self.catalog[code]["semesters"]})
+            done.update(codes)
+        return violations
+
+    def repair(self, plan: List[Dict[str, Any]], completed: Iterable[str],
+               max_credits=DEFAULT_MAX_CREDITS, use_offerings: bool = True) -> Dict[str, Any]:
+        """
+        Validate an existing plan and suggest fixes. Courses without
+        violations stay where they are; the offending ones (and any
+        prerequisites missing from the plan) are re-placed in the earliest
+        semesters that satisfy them.
+        """
+        completed = self._with_aliases(completed)
+        terms = _extend_terms(plan, max(len(plan), MAX_SEMESTERS))
+        caps = _caps(max_credits, len(terms))
+
+        violations = self.validate(plan, completed, caps, use_offerings)
+        bad = {v["course"] for v in violations if "course" in v}
+        overloaded = {v["semester"] for v in violations if v["type"] == "overload"}
+
+        pinned: Dict[str, int] = {}
+        for i, sem in enumerate(plan):
+            load = 0
+            for code in sem["courses"]:
+                if code in bad or code not in self.catalog:
+                    continue
+                credits = self.catalog[code]["credits"]
+                if i in overloaded and load + credits > caps[i]:
+                    continue
+                pinned[code] = i
+                load += credits
+
+        in_plan = [c for sem in plan for c in sem["courses"]]
+        courses, added, unresolved = self.close_requirements(in_plan, completed)
+        # Pinned courses that now sit before a re-placed prerequisite must move too.
+        changed = True
+        while changed:
+            changed = False
+            for code, idx in list(pinned.items()):
+                earlier = completed | {c for c, j in pinned.items() if j < idx}
+                if not self._ready(code, earlier):
+                    del pinned[code]
+                    changed = True
+
+        semesters, unschedulable = self.schedule(courses, completed, caps, terms,
+                                                 use_offerings, pinned)
+        used = max(len(plan), max((i + 1 for i, s in enumerate(semesters) if s), default=0))
+        original = {c: i for i, sem in enumerate(plan) for c in sem["courses"]}
+        moves = []
+        for i, sem in enumerate(semesters):
+            for code in sem:
+                if code not in original:
+                    moves.append({"action": "add", "course": code, "to": i})
+                elif original[code] != i:
+                    moves.append({"action": "move", "course": code,
+                                  "from": original[code], "to": i})
+        return {
+            "valid": not violations,
+            "violations": violations,
+            "suggestions": moves,
+            "repaired": self._format(semesters[:used], terms),
+            "addedPrerequisites": added,
+            "unresolved": unresolved,
+            "unschedulable": unschedulable,
+        }
+
+    def _format(self, semesters: List[List[str]], terms: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{
+            "year": terms[i]["year"],
+            "term": terms[i]["term"],
+            "courses": codes,
+            "credits": sum(self.catalog[c]["credits"] for c in codes if c in self.catalog),
+        } for i, codes in enumerate(semesters)]
+
+
+def _extend_terms(plan: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """
+    The plan's own terms followed by enough later terms to reach `count`.
+    New terms number their year the way the plan does: plan years advance at
+    Fall (planController), frontend keys advance at Spring ("fall1", "spring2").
+    """
+    include_summer = any(s["term"] == "Summer" for s in plan)
+    if not plan:
+        return term_sequence("Fall", count, include_summer)
+    order = ["Fall", "Spring", "Summer"] if include_summer else ["Fall", "Spring"]
+    advance_at = "Fall"
+    for prev, cur in zip(plan, plan[1:]):
+        if prev["term"] == "Fall" and cur["term"] == "Spring" and cur.get("year") != prev.get("year"):
+            advance_at = "Spring"
+            break
+
+    terms = [{"year": s.get("year"), "term": s["term"]} for s in plan]
+    while len(terms) < count:
+        last = terms[-1]
+        term = order[(order.index(last["term"]) + 1) % len(order)] if last["term"] in order else "Fall"
+        year = last["year"]
+        if isinstance(year, int) and term == advance_at:
+            year += 1
+        terms.append({"year": year, "term": term})
+    return terms
+
+
+def _caps(max_credits, count: int) -> List[int]:
+    if isinstance(max_credits, list):
+        caps = [int(c) for c in max_credits]
+        return caps + [caps[-1] if caps else DEFAULT_MAX_CREDITS] * (count - len(caps))
+    return [int(max_credits)] * count
+
+
+def normalize_plan(plan: Any) -> List[Dict[str, Any]]:
+    """
+    Accept either plan shape used by the app and return an ordered list of
+    {"year", "term", "courses": [codes]}:
+      - planController: [{"year": 1, "term": "Fall", "courses": ["CS1114"]}, ...]
+      - frontend/pdf export: {"fall1": [{"code": "CS1114", ...}], "spring2": [...]}
+        ordered like prerequisiteHelper.getCompletedCoursesBysemester.
+    """
+    if isinstance(plan, dict) and "semesters" in plan:
+        plan = plan["semesters"]
+
+    def code_of(c):
+        return c if isinstance(c, str) else (c.get("id") or c.get("code"))
+
+    if isinstance(plan, list):
+        return [{"year": s.get("year"), "term": str(s.get("term", "Fall")).title(),
+                 "courses": [code_of(c) for c in s.get("courses", [])]} for s in plan]
+
+    order = ["fall", "spring"]
+    keyed = []
+    for key, courses in (plan or {}).items():
+        term = key.rstrip("0123456789").lower()
+        digits = key[len(term):]
+        if term not in order or not digits:
+            continue
+        year = int(digits)
+        academic_year = year - 1 if term == "spring" else year
+        keyed.append(((academic_year, order.index(term)), {
+            "year": year, "term": term.title(),
+            "courses": [code_of(c) for c in courses or []],
+        }))
+    return [s for _, s in sorted(keyed, key=lambda kv: kv[0])]
+
+
+def main() -> None:
+    import argparse
+
+    # The catalog path is a CLI flag only: the request body comes from the
+    # client (POST /api/plans/optimize) and must not choose files to open.
+    parser = argparse.ArgumentParser(description="Optimize or repair a semester plan (JSON on stdin).")
+    parser.add_argument("--courses", default=COURSES_PATH, help="catalog JSON (default: courses.json)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    request = json.loads(sys.stdin.read() or "{}")
+    optimizer = PlanOptimizer(load_catalog(args.courses))
+    max_credits = request.get("maxCredits", DEFAULT_MAX_CREDITS)
+    use_offerings = request.get("useOfferings", True)
+
+    if request.get("plan"):
+        result = optimizer.repair(normalize_plan(request["plan"]),
+                                  request.get("completed", []), max_credits, use_offerings)
+    else:
+        result = optimizer.optimize(request.get("completed", []), request.get("required", []),
+                                    max_credits, request.get("startTerm", "Fall"),
+                                    request.get("includeSummer", False), use_offerings)
+    result["elapsedMs"] = round((time.perf_counter() - started) * 1000, 2)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
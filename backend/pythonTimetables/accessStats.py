@@ -0,0 +1,138 @@
+"""
+Per-(term, course) access statistics for cache prewarming.
+
+Lookups are heavily skewed: a few dozen courses get most of the traffic,
+and it spikes around registration. Each course-id lookup served by the
+bridge is recorded here, and prewarm.py warms the caches for the most
+looked-up courses.
+
+Records are lines appended to <TIMETABLE_CACHE_DIR>/access/<term>.log:
+
+    <epoch seconds> <course id> [<weight>]
+
+A record is one O_APPEND write, so processes never interleave lines and no
+lock is taken on the lookup path. Without TIMETABLE_CACHE_DIR nothing is
+recorded. Terms must be TERMYEAR codes and only ids of the form
+SUBJECT1234 are written, since ids come from clients and a stray newline
+could otherwise forge records. Timestamps in the future count as now.
+
+Scores decay with a half-life (TIMETABLE_ACCESS_HALF_LIFE, default seven
+days), so last week's spike outranks last term's. Once a log passes
+COMPACT_BYTES it is rewritten as one line per course holding its score at
+that time. Records appended while a compaction runs may be lost, which only
+slightly skews the statistics.
+
+    python pythonTimetables/accessStats.py 202701 --top 20
+"""
+import math
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Tuple
+
+CACHE_DIR = os.environ.get("TIMETABLE_CACHE_DIR", "")
+HALF_LIFE = float(os.environ.get("TIMETABLE_ACCESS_HALF_LIFE", str(7 * 86400)))
+COMPACT_BYTES = 1 << 20
+_TERM_RE = re.compile(r"\d{6}")
+_COURSE_ID_RE = re.compile(r"[A-Z]+\d{4}")
+
+
+def _log_path(term: str) -> str:
+    """<dir>/access/<term>.log, or "" without a cache dir or for a malformed term."""
+    if not CACHE_DIR or not _TERM_RE.fullmatch(str(term)):
+        return ""
+    return os.path.join(CACHE_DIR, "access", f"{term}.log")
+
+
+def record_access(term: str, course_ids: Iterable[str]) -> None:
+    """Record one lookup of each of `course_ids` (normalized ids) in `term`."""
+    path = _log_path(term)
+    if not path:
+        return
+    now = time.time()
+    data = "".join(f"{now:.0f} {cid}\n" for cid in course_ids
+                   if isinstance(cid, str) and _COURSE_ID_RE.fullmatch(cid)).encode("ascii")
+    if not data:
+        return
+    try:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # statistics are best effort
+
+
+def access_scores(term: str, now: float = None, half_life: float = HALF_LIFE) -> Dict[str, float]:
+    """Decayed lookup count per course id for `term` ({} if nothing is recorded)."""
+    path = _log_path(term)
+    now = time.time() if now is None else now
+    scores: Dict[str, float] = {}
+    try:
+        with open(path, encoding="ascii", errors="replace") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 2 or not _COURSE_ID_RE.fullmatch(parts[1]):
+                    continue
+                try:
+                    ts = min(float(parts[0]), now)
+                    weight = float(parts[2]) if len(parts) > 2 else 1.0
+                except ValueError:
+                    continue
+                if not (math.isfinite(ts) and math.isfinite(weight)):
+                    continue
+                decay = math.pow(0.5, max(0.0, now - ts) / half_life)
+                scores[parts[1]] = scores.get(parts[1], 0.0) + weight * decay
+    except OSError:
+        pass
+    return scores
+
+
+def top_courses(term: str, n: int, now: float = None) -> List[Tuple[str, float]]:
+    """The `n` most looked-up course ids of `term` with their scores, best first."""
+    scores = access_scores(term, now)
+    return sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+def compact(term: str, min_bytes: int = COMPACT_BYTES) -> bool:
+    """Rewrite `term`'s log as one line per course once it is over `min_bytes`."""
+    path = _log_path(term)
+    try:
+        if not path or os.path.getsize(path) < min_bytes:
+            return False
+    except OSError:
+        return False
+    now = time.time()
+    scores = access_scores(term, now)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="ascii") as f:
+            for cid, score in sorted(scores.items()):
+                if score >= 0.01:
+                    f.write(f"{now:.0f} {cid} {score:.3f}\n")
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show a term's most looked-up courses.")
+    parser.add_argument("term", help="TERMYEAR code, e.g. 202701")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--compact", action="store_true", help="compact the log first")
+    args = parser.parse_args()
+
+    if not CACHE_DIR:
+        parser.error("TIMETABLE_CACHE_DIR is not set; no access statistics are kept.")
+    if args.compact:
+        compact(args.term, min_bytes=0)
+    for course_id, score in top_courses(args.term, args.top):
+        print(f"{score:10.1f}  {course_id}")
@@ -0,0 +1,94 @@
+"""
+Import-time budget check for the timetable modules.
+
+The Node bridge and the seed script spawn a fresh interpreter per call, so
+module import time is paid on every request. This runs
+``python -X importtime -c "import <module>"`` in a clean subprocess, reads the
+cumulative time for the module from stderr and fails when it is over budget.
+
+Usage (from backend/):
+    python pythonTimetables/checkImportTime.py
+    python pythonTimetables/checkImportTime.py --budget-ms 40 --repeat 7 timeTablesVTT
+
+Exit status is 0 when every module is within budget, 1 otherwise.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "50"))
+DEFAULT_MODULES = ["timeTablesVTT", "courseJson"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (\s*)(\S+)\s*$")
+
+
+def _run_importtime(module: str) -> List[Tuple[int, int, int, str]]:
+    """
+    Import `module` in a fresh interpreter under ``-X importtime`` and return
+    (self_us, cumulative_us, depth, name) rows parsed from stderr.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = here + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_LINE.match(line)
+        if m:
+            rows.append((int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2, m.group(4)))
+    return rows
+
+
+def measure_import_us(module: str) -> int:
+    """
+    Return the cumulative import time of `module` in microseconds, as reported
+    by ``-X importtime`` in a fresh interpreter.
+    """
+    for _, cumulative, depth, name in _run_importtime(module):
+        if name == module and depth == 0:
+            return cumulative
+    raise RuntimeError(f"No importtime entry found for {module!r}")
+
+
+def slowest_imports(module: str, top: int = 10) -> List[str]:
+    """Return the `top` nested imports of `module` by self time, for diagnostics."""
+    rows = sorted(_run_importtime(module), reverse=True)
+    return [f"{us / 1000:8.2f} ms  {name}" for us, _, _, name in rows[:top]]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per module; the median is compared to the budget")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        measure_import_us(module)  # warm-up: populate __pycache__
+        samples = [measure_import_us(module) / 1000 for _ in range(args.repeat)]
+        median_ms = statistics.median(samples)
+        ok = median_ms <= args.budget_ms
+        failed |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {module}: median {median_ms:.2f} ms "
+              f"(min {min(samples):.2f}, max {max(samples):.2f}) budget {args.budget_ms:.0f} ms")
+        if not ok:
+            print("  slowest nested imports:")
+            for row in slowest_imports(module):
+                print(f"    {row}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,465 @@
+"""
+Canonical JSON encoding for course lookup responses, with an encoded-bytes cache.
+
+The bridge used to walk every result through a reflective `to_jsonable` pass
+and `json.dumps` it on every call. Lookup results are plain dicts built by
+`searchIDData`, `searchID` and `searchCRNData`, so here they are encoded once
+into canonical bytes and cached per (term, course) next to the data caches.
+A hot lookup is then a memory (or file) copy.
+
+Encoding (schema version 1):
+    - UTF-8, no whitespace (separators "," and ":"), non-ASCII kept as is.
+    - Keys keep the order the lookup builds them in:
+        searchIDData:  year, semester, courseId, subject, code, name, creditHours,
+                       prerequisites, catalogDescription, comments, pathways,
+                       crossListed
+        searchID:      the above up to pathways, plus sections[{crn, type,
+                       modality, capacity, instructor,
+                       schedule[{day, start, end, location}]}]
+        searchCRNData: searchIDData keys up to pathways, plus crn, type,
+                       modality, capacity, instructor, schedule
+      each followed by freshness {source: {state, fetchedAt}} from the
+      lookup (see timeTablesVTT.collect_freshness), and, from a lookup
+      given a deadline, completeness {sections, pathways, banner: bool}
+      (absent: complete).
+    - Enums are encoded by name, except Day which keeps its value ("Monday").
+    - NaN / Infinity (pandas empty cells) become null; numpy scalars become
+      plain numbers; sets and tuples become arrays.
+    - Schedule entries are sorted by (day order, start, end, location) so the
+      same data always encodes to the same bytes.
+
+A `fields` projection returns only the identity keys (year, semester,
+courseId, subject, code) and the fields asked for, in the order above.
+
+Cache: an in-process LRU with a TTL, plus, when TIMETABLE_CACHE_DIR is set,
+files under <dir>/v1/<term>/<key>.json so the one-process-per-request bridge
+also gets hits. TIMETABLE_CACHE_TTL sets the TTL in seconds (default 300).
+Empty results (the lookup found no sections; timeTablesVTT marks them as
+EmptyResult, projected or not) are kept for TIMETABLE_CACHE_NEGATIVE_TTL
+instead (default 1800), so repeated lookups of a typo or an unoffered course
+don't go upstream every few minutes. On disk they are stored behind a "-"
+line.
+
+Past the TTL, entries younger than TIMETABLE_CACHE_STALE_TTL (default one
+day) are served at once while a background thread recomputes them. The bridge
+returns as soon as the response line is written, so the refresh doesn't
+delay the response. When recomputing fails, or Banner or the timetable are
+down and the lookup carries error placeholders, the last good entry is served
+whatever its age. Results with errors are never stored. Cached responses get a
+trailing "cache": {"state": "fresh"|"stale"|"fallback"|"miss"|"partial",
+"storedAt"} member. It is spliced in per response and is not part of the
+stored bytes.
+
+A lookup with a deadline may come back partial: some part missed the
+deadline and is empty, flagged false under "completeness". Partial results
+are returned ("partial") but never stored. The full lookup is recomputed
+in the background instead, so the next call is served complete from the
+cache.
+
+searchIDDataBatchJSON stores and reads each course under its single-id
+searchIDDataJSON entry, so plan loads and single lookups warm each other.
+
+Course-id lookups are recorded in the access statistics (accessStats.py).
+prewarm.py uses them and `warm_id_data()` to fill this cache for the most
+looked-up courses before users ask for them.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Optional, Set, Tuple
+
+try:
+    from pythonTimetables.accessStats import record_access
+    from pythonTimetables.timeTablesVTT import (
+        Day, EmptyResult, _CRN_FIELDS, _ID_DATA_FIELDS, _SECTION_FIELDS, _fanout_queries,
+        _fields_key, _get_next_semester, _normalize_course_id, parse_semester, parse_year,
+        searchCRNData, searchID, searchIDData, searchIDDataBatch, term_code,
+    )
+except ModuleNotFoundError:
+    from accessStats import record_access
+    from timeTablesVTT import (
+        Day, EmptyResult, _CRN_FIELDS, _ID_DATA_FIELDS, _SECTION_FIELDS, _fanout_queries,
+        _fields_key, _get_next_semester, _normalize_course_id, parse_semester, parse_year,
+        searchCRNData, searchID, searchIDData, searchIDDataBatch, term_code,
+    )
+
+SCHEMA_VERSION = 1
+_NEGATIVE_MARK = b"-\n"  # leads the file of an empty result
+CACHE_DIR = os.environ.get("TIMETABLE_CACHE_DIR", "")
+CACHE_TTL = float(os.environ.get("TIMETABLE_CACHE_TTL", "300"))
+CACHE_STALE_TTL = float(os.environ.get("TIMETABLE_CACHE_STALE_TTL", "86400"))
+CACHE_NEGATIVE_TTL = float(os.environ.get("TIMETABLE_CACHE_NEGATIVE_TTL", "1800"))
+
+_DAY_ORDER = {d.value: i for i, d in enumerate(Day)}
+_TERM_RE = re.compile(r"\d{6}")
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.+-]|^\.")
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+def _clean(obj):
+    """Normalize a lookup result to strict-JSON-compatible builtins."""
+    if isinstance(obj, dict):
+        out = {k: _clean(v) for k, v in obj.items()}
+        sched = out.get("schedule")
+        if isinstance(sched, list):
+            sched.sort(key=lambda m: (_DAY_ORDER.get(m.get("day"), len(_DAY_ORDER)),
+                                      str(m.get("start")), str(m.get("end")),
+                                      str(m.get("location"))))
+        return out
+    if isinstance(obj, (list, tuple, set)):
+        return [_clean(x) for x in obj]
+    if obj is None or isinstance(obj, (str, bool, int)):
+        return obj
+    if isinstance(obj, float):
+        return None if math.isnan(obj) or math.isinf(obj) else obj
+    if isinstance(obj, Day):
+        return obj.value
+    if isinstance(obj, Enum):
+        return obj.name
+    if hasattr(obj, "item"):  # numpy scalar
+        return _clean(obj.item())
+    return str(obj)
+
+
+def encode(result) -> bytes:
+    """Encode a lookup result dict into canonical JSON bytes."""
+    return _encoder.encode(_clean(result)).encode("utf-8")
+
+
+class EncodedCache:
+    """LRU of encoded responses with a TTL, a stale window and an optional on-disk layer."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = CACHE_TTL,
+                 stale_ttl: float = CACHE_STALE_TTL, directory: str = CACHE_DIR,
+                 negative_ttl: float = CACHE_NEGATIVE_TTL) -> None:
+        self._maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = max(stale_ttl, ttl, negative_ttl)
+        self._dir = os.path.join(directory, f"v{SCHEMA_VERSION}") if directory else ""
+        self._lock = threading.Lock()
+        # key -> (bytes, stored_at, empty); kept past the TTL as the last good value
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bytes, float, bool]]" = OrderedDict()
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self.stats = {"hits": 0, "disk_hits": 0, "stale_hits": 0, "negative_hits": 0,
+                      "fallbacks": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        """<dir>/<term>/<name>.json; the term must be a TERMYEAR code, the name is whitelisted."""
+        term, name = key
+        if not _TERM_RE.fullmatch(term):
+            raise ValueError(f"Invalid term {term!r} in cache key.")
+        return os.path.join(self._dir, term, _UNSAFE_NAME_RE.sub("_", name) + ".json")
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def lookup(self, key: Tuple[str, str]) -> Optional[Tuple[bytes, float, bool]]:
+        """
+        Return the newest (bytes, stored_at, empty) for `key` from memory or
+        disk, whatever its age, or None. Callers judge freshness against
+        `ttl_for(empty)`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if self._dir and (entry is None or time.time() - entry[1] >= self.ttl):
+            # another process may have refreshed the file since
+            path = self._path(key)
+            try:
+                stored_at = os.path.getmtime(path)
+                if entry is None or stored_at > entry[1]:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    empty = data.startswith(_NEGATIVE_MARK)
+                    entry = (data[len(_NEGATIVE_MARK):] if empty else data, stored_at, empty)
+                    self._remember(key, *entry)
+                    self._count("disk_hits")
+            except OSError:
+                pass
+        return entry
+
+    def ttl_for(self, empty: bool) -> float:
+        return self.negative_ttl if empty else self.ttl
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        """Bytes for `key` if stored within its TTL, else None."""
+        entry = self.lookup(key)
+        if entry is not None and time.time() - entry[1] < self.ttl_for(entry[2]):
+            return entry[0]
+        return None
+
+    def put(self, key: Tuple[str, str], data: bytes, empty: bool = False) -> None:
+        """Store `data` for `key`; `empty` gives it the negative TTL."""
+        stored_at = time.time()
+        if self._dir:
+            path = self._path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    if empty:
+                        f.write(_NEGATIVE_MARK)
+                    f.write(data)
+                os.replace(tmp, path)  # atomic: readers never see a partial file
+                stored_at = os.path.getmtime(path)  # so lookup() sees the file as ours
+            except OSError:
+                pass
+        self._remember(key, data, stored_at, empty)
+
+    def _remember(self, key, data: bytes, stored_at: float, empty: bool) -> None:
+        with self._lock:
+            self._entries[key] = (data, stored_at, empty)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key: Tuple[str, str], compute) -> None:
+        """
+        Recompute `key` on a background thread unless one already is. The
+        thread is not a daemon, so a one-shot bridge process finishes the
+        refresh after writing its response.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                result = compute()
+                if _is_cacheable(result):
+                    self.put(key, encode(result), isinstance(result, EmptyResult))
+                    self._count("refreshes")
+                else:
+                    self._count("refresh_errors")
+            except Exception:
+                self._count("refresh_errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"refresh-{key[1]}").start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = EncodedCache()
+
+
+def _is_partial(result) -> bool:
+    """True if part of `result` missed its lookup's deadline."""
+    completeness = result.get("completeness") if isinstance(result, dict) else None
+    return not all((completeness or {}).values())
+
+
+def _is_cacheable(result) -> bool:
+    """
+    False if any upstream source behind `result` failed or was served from a
+    fallback, or if `result` is partial.
+    """
+    freshness = result.get("freshness") if isinstance(result, dict) else None
+    return not _is_partial(result) and not any(
+        part.get("state") in ("error", "fallback") for part in (freshness or {}).values())
+
+
+def _with_cache_state(data: bytes, state: str, stored_at: Optional[float]) -> bytes:
+    """Append the "cache" member to an encoded object."""
+    if not data.endswith(b"}"):
+        return data
+    meta = _encoder.encode({"state": state,
+                            "storedAt": round(stored_at, 3) if stored_at else None})
+    sep = b"," if len(data) > 2 else b""
+    return data[:-1] + sep + b'"cache":' + meta.encode("utf-8") + b"}"
+
+
+def _cached(key: Tuple[str, str], compute, complete=None) -> bytes:
+    """
+    Serve `key` from the cache, or from `compute()`. `complete` is the same
+    lookup without a deadline; background refreshes use it (default
+    `compute`).
+    """
+    complete = complete or compute
+    entry = _cache.lookup(key)
+    if entry is not None:
+        data, stored_at, empty = entry
+        age = time.time() - stored_at
+        if age < _cache.ttl_for(empty):
+            _cache._count("negative_hits" if age >= _cache.ttl else "hits")
+            return _with_cache_state(data, "fresh", stored_at)
+        if age < _cache.stale_ttl:
+            _cache._count("stale_hits")
+            _cache.refresh(key, complete)
+            return _with_cache_state(data, "stale", stored_at)
+
+    _cache._count("misses")
+    try:
+        result = compute()
+    except Exception:
+        if entry is None:
+            raise
+        _cache._count("fallbacks")
+        return _with_cache_state(entry[0], "fallback", entry[1])
+    data = encode(result)
+    if _is_partial(result):
+        _cache.refresh(key, complete)
+        return _with_cache_state(data, "partial", None)
+    if _is_cacheable(result):
+        _cache.put(key, data, isinstance(result, EmptyResult))
+    elif entry is not None:
+        # upstream errors in the fresh result; the last good one is better
+        _cache._count("fallbacks")
+        return _with_cache_state(entry[0], "fallback", entry[1])
+    return _with_cache_state(data, "miss", None)
+
+
+def _scope_suffix(campuses, modalities, section_types) -> str:
+    """Key suffix for a non-default fan-out scope ('' for Blacksburg, all, all)."""
+    queries = _fanout_queries(campuses, modalities, section_types)
+    if queries == _fanout_queries(None, None, None):
+        return ""
+    return "-" + "+".join(f"{c.name}.{m.name}.{t.name}" for c, m, t in queries).lower()
+
+
+def _fields_suffix(fields, allowed: frozenset) -> str:
+    """Key suffix for a `fields` projection ('' for all fields)."""
+    key = _fields_key(fields, allowed)
+    return "" if key is None else "-f." + ".".join(key)
+
+
+def _id_data_key(course_id: str, fetch_banner: bool = True, campuses=None, modalities=None,
+                 section_types=None, fields=None) -> Tuple[str, str]:
+    year, semester_str = _get_next_semester()
+    term = term_code(year, parse_semester(semester_str))
+    return (term, f"id-{_normalize_course_id(course_id)}-{int(bool(fetch_banner))}"
+                  f"{_scope_suffix(campuses, modalities, section_types)}"
+                  f"{_fields_suffix(fields, _ID_DATA_FIELDS)}")
+
+
+def searchIDDataJSON(course_id: str, fetch_banner: bool = True,
+                     campuses=None, modalities=None, section_types=None,
+                     deadline: float = None, fields=None) -> bytes:
+    """searchIDData(course_id, fetch_banner, ...) as canonical JSON bytes (cached)."""
+    key = _id_data_key(course_id, fetch_banner, campuses, modalities, section_types, fields)
+    record_access(key[0], [_normalize_course_id(course_id)])
+    return _cached(key,
+                   lambda: searchIDData(course_id, fetch_banner, campuses, modalities,
+                                        section_types, deadline, fields),
+                   lambda: searchIDData(course_id, fetch_banner, campuses, modalities,
+                                        section_types, fields=fields))
+
+
+def searchIDDataBatchJSON(course_ids, fetch_banner: bool = True, fields=None) -> bytes:
+    """
+    searchIDDataBatch(course_ids, fetch_banner, fields) as canonical JSON
+    bytes. Each course is read from and stored under the same entry as
+    searchIDDataJSON(course_id, fetch_banner, fields=fields), so batch and
+    single lookups share the cache. Only ids without a usable entry go
+    upstream, in one batch; stale entries are served and refreshed in the
+    background.
+    """
+    keys = {course_id: _id_data_key(course_id, fetch_banner, fields=fields)
+            for course_id in dict.fromkeys(course_ids)}
+    if keys:
+        record_access(next(iter(keys.values()))[0],
+                      [_normalize_course_id(course_id) for course_id in keys])
+    parts = {}
+    entries = {}
+    for course_id, key in keys.items():
+        entry = entries[course_id] = _cache.lookup(key)
+        if entry is None:
+            continue
+        data, stored_at, empty = entry
+        age = time.time() - stored_at
+        if age < _cache.ttl_for(empty):
+            _cache._count("negative_hits" if age >= _cache.ttl else "hits")
+            parts[course_id] = _with_cache_state(data, "fresh", stored_at)
+        elif age < _cache.stale_ttl:
+            _cache._count("stale_hits")
+            _cache.refresh(key, lambda course_id=course_id: searchIDData(
+                course_id, fetch_banner, fields=fields))
+            parts[course_id] = _with_cache_state(data, "stale", stored_at)
+
+    missing = [course_id for course_id in keys if course_id not in parts]
+    if missing:
+        _cache._count("misses")
+        try:
+            results = searchIDDataBatch(missing, fetch_banner, fields)
+        except Exception:
+            if not all(entries[course_id] for course_id in missing):
+                raise
+            results = {}
+        for course_id in missing:
+            result, entry = results.get(course_id), entries[course_id]
+            if result is not None and "error" not in result and _is_cacheable(result):
+                data = encode(result)
+                _cache.put(keys[course_id], data, isinstance(result, EmptyResult))
+                parts[course_id] = _with_cache_state(data, "miss", None)
+            elif entry is not None:
+                # upstream errors in the fresh result; the last good one is better
+                _cache._count("fallbacks")
+                parts[course_id] = _with_cache_state(entry[0], "fallback", entry[1])
+            else:
+                parts[course_id] = encode(result)
+    return b"{" + b",".join(_encoder.encode(str(course_id)).encode("utf-8") + b":" + parts[course_id]
+                            for course_id in keys) + b"}"
+
+
+def searchIDJSON(year: str, semester_str: str, course_id: str, fetch_banner: bool = True,
+                 campuses=None, modalities=None, section_types=None,
+                 deadline: float = None, fields=None) -> bytes:
+    """searchID(...) as canonical JSON bytes (cached)."""
+    term = term_code(parse_year(year), parse_semester(semester_str))
+    record_access(term, [_normalize_course_id(course_id)])
+    key = (term, f"sections-{_normalize_course_id(course_id)}-{int(bool(fetch_banner))}"
+                 f"{_scope_suffix(campuses, modalities, section_types)}"
+                 f"{_fields_suffix(fields, _SECTION_FIELDS)}")
+    return _cached(key,
+                   lambda: searchID(year, semester_str, course_id, fetch_banner,
+                                    campuses, modalities, section_types, deadline, fields),
+                   lambda: searchID(year, semester_str, course_id, fetch_banner,
+                                    campuses, modalities, section_types, fields=fields))
+
+
+def searchCRNDataJSON(year: str, semester: str, crn: str, deadline: float = None,
+                      fields=None) -> bytes:
+    """searchCRNData(...) as canonical JSON bytes (cached)."""
+    term = term_code(parse_year(year), parse_semester(semester))
+    key = (term, f"crn-{str(crn).strip()}{_fields_suffix(fields, _CRN_FIELDS)}")
+    return _cached(key, lambda: searchCRNData(year, semester, crn, deadline, fields),
+                   lambda: searchCRNData(year, semester, crn, fields=fields))
+
+
+def warm_id_data(course_id: str, min_ttl_left: float = 0.0) -> str:
+    """
+    Make sure the default searchIDData lookup of `course_id` is cached and
+    stays fresh for at least `min_ttl_left` more seconds, recomputing it on
+    the caller's thread if not. Returns "fresh" (nothing to do), "warmed",
+    or "failed" (upstream errors; the last good entry, if any, is kept).
+    """
+    key = _id_data_key(course_id)
+    entry = _cache.lookup(key)
+    if entry is not None and time.time() - entry[1] + min_ttl_left < _cache.ttl_for(entry[2]):
+        return "fresh"
+    try:
+        result = searchIDData(course_id)
+    except Exception:
+        return "failed"
+    if not _is_cacheable(result):
+        return "failed"
+    _cache.put(key, encode(result), isinstance(result, EmptyResult))
+    return "warmed"
+
+
+def cache_stats() -> dict:
+    with _cache._lock:
+        return dict(_cache.stats)
@@ -0,0 +1,215 @@
+"""
+Cross-listed course detection and a canonical-id map.
+
+Cross-listed courses (CS/ECE, CS/MATH) are one physical offering with a
+listing under each subject. They share the room, meeting times and
+instructor, and sometimes a CRN. Until now each listing was fetched, Banner
+queried and stored as its own course.
+
+`detect_cross_listings()` groups course ids whose sections share a CRN, or
+share a meeting signature (the instructor plus the full set of (day, start,
+end, location) meetings) and a course number under different subjects
+(CS3414 / MATH3414). Stacked courses (CS4824 / CS5824) meet together too,
+but they are different courses, so a shared room and time alone never
+joins two numbers. Sections without a real room or time (ARR, TBA,
+online) have no signature, since two of those meeting "together" means
+nothing. Each group's canonical id is its first id in sorted order.
+
+The map is written to TIMETABLE_CROSS_LISTINGS (default
+backend/cross_listings.json) by configSeed or the CLI, and read from there:
+
+    {"term": "202601", "builtAt": ..., "groups": [["CS3414", "MATH3414"], ...]}
+
+Lookups only use a map built for the term they look up.
+
+Users:
+    - searchIDData / searchIDDataBatch look a course up under its canonical
+      id, so the listings of one offering share one timetable and Banner
+      fetch. Results keep the requested id and list the other listings
+      under "crossListed". Section lookups (searchID, searchCRNData) are
+      not canonicalized, since each listing has its own CRNs.
+    - configSeed stores "crossListed" on each course record. The frontend
+      prerequisite check and planOptimizer count a completed listing as
+      completing all of its aliases.
+
+    python pythonTimetables/crossListings.py 2026 Spring [--subjects CS ECE MATH]
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from pythonTimetables.timeTablesVTT import (
+        Course, _normalize_course_id, iter_timetable, parse_semester, term_code,
+    )
+except ModuleNotFoundError:
+    from timeTablesVTT import (
+        Course, _normalize_course_id, iter_timetable, parse_semester, term_code,
+    )
+
+CROSS_LISTINGS_PATH = os.environ.get(
+    "TIMETABLE_CROSS_LISTINGS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cross_listings.json"))
+
+_NO_PLACE = ("", "ARR", "TBA", "ONLINE", "(ARR)")
+
+
+def meeting_signature(course: Course) -> Optional[tuple]:
+    """(instructor, sorted meetings) for a section with a real room and time, else None."""
+    meetings = []
+    for day, slots in course.get_schedule().items():
+        for start, end, location in slots:
+            if not all(isinstance(v, str) for v in (start, end, location)):
+                return None
+            if location.strip().upper() in _NO_PLACE or start.strip().upper() in _NO_PLACE:
+                return None
+            meetings.append((day.value, start.strip(), end.strip(), " ".join(location.split())))
+    if not meetings:
+        return None
+    professor = course.get_professor()
+    return (professor if isinstance(professor, str) else "", tuple(sorted(meetings)))
+
+
+def detect_cross_listings(sections: Iterable[Course]) -> List[List[str]]:
+    """Groups (two or more ids, sorted) of course ids listing the same offering."""
+    parent: Dict[str, str] = {}
+
+    def find(x: str) -> str:
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: str, b: str) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    first_by_key: Dict[tuple, str] = {}
+    for course in sections:
+        course_id = f"{course.get_subject()}{course.get_code()}"
+        find(course_id)
+        keys = [("crn", course.get_crn())]
+        signature = meeting_signature(course)
+        if signature is not None:
+            # the code is part of the key: ids under one key differ only by subject
+            keys.append(("meets", course.get_code()) + signature)
+        for key in keys:
+            other = first_by_key.setdefault(key, course_id)
+            if other != course_id:
+                union(other, course_id)
+
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for course_id in parent:
+        groups[find(course_id)].append(course_id)
+    return sorted(sorted(g) for g in groups.values() if len(g) > 1)
+
+
+class CrossListings:
+    """Alias groups with the first id of each as its canonical id."""
+
+    def __init__(self, groups: Iterable[Iterable[str]], term: str = "", built_at: float = None) -> None:
+        self.term = term
+        self.built_at = built_at or time.time()
+        self.groups = [sorted(set(g)) for g in groups]
+        self._group_of: Dict[str, List[str]] = {c: g for g in self.groups for c in g}
+
+    def canonical(self, course_id: str) -> str:
+        course_id = _normalize_course_id(course_id)
+        group = self._group_of.get(course_id)
+        return group[0] if group else course_id
+
+    def aliases(self, course_id: str) -> List[str]:
+        """The other listings of `course_id` ([] if it has none)."""
+        course_id = _normalize_course_id(course_id)
+        return [c for c in self._group_of.get(course_id, []) if c != course_id]
+
+    def same(self, a: str, b: str) -> bool:
+        return self.canonical(a) == self.canonical(b)
+
+    def to_dict(self) -> dict:
+        return {"term": self.term, "builtAt": self.built_at, "groups": self.groups}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CrossListings":
+        return cls(data["groups"], data.get("term", ""), data.get("builtAt"))
+
+
+def build_cross_listings(year: str, semester: str, subjects: List[str] = None) -> CrossListings:
+    """
+    Detect a term's cross-listings: from one term-wide query (parsed on the
+    process pool), or one query per subject when `subjects` is given.
+    """
+    sem = parse_semester(semester)
+    if subjects:
+        sections = [c for subject in subjects for c in iter_timetable(year, sem, subject=subject)]
+    else:
+        try:
+            from pythonTimetables.parallelParse import search_timetable_parallel
+        except ModuleNotFoundError:
+            from parallelParse import search_timetable_parallel
+        sections = search_timetable_parallel(year, sem)
+    return CrossListings(detect_cross_listings(sections), term_code(str(year), sem))
+
+
+def save_cross_listings(listings: CrossListings, path: str = CROSS_LISTINGS_PATH) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(listings.to_dict(), f, indent=1)
+    os.replace(tmp, path)
+
+
+_lock = threading.Lock()
+_loaded: Optional[Tuple[float, CrossListings]] = None
+
+
+def cross_listings(term: str = None) -> Optional[CrossListings]:
+    """
+    The stored map, reloaded when the file changes; None if there is none,
+    or if `term` is given and the map was built for another term.
+    """
+    global _loaded
+    try:
+        mtime = os.path.getmtime(CROSS_LISTINGS_PATH)
+    except OSError:
+        return None
+    with _lock:
+        if _loaded is None or _loaded[0] != mtime:
+            try:
+                with open(CROSS_LISTINGS_PATH, encoding="utf-8") as f:
+                    _loaded = (mtime, CrossListings.from_dict(json.load(f)))
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+        listings = _loaded[1]
+    return listings if term is None or listings.term == term else None
+
+
+def canonical_course_id(course_id: str, term: str = None) -> str:
+    listings = cross_listings(term)
+    return listings.canonical(course_id) if listings else _normalize_course_id(course_id)
+
+
+def course_aliases(course_id: str, term: str = None) -> List[str]:
+    listings = cross_listings(term)
+    return listings.aliases(course_id) if listings else []
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Detect a term's cross-listed courses.")
+    parser.add_argument("year")
+    parser.add_argument("semester")
+    parser.add_argument("--subjects", nargs="+", help="only these subjects (default: term-wide)")
+    parser.add_argument("--out", default=CROSS_LISTINGS_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = build_cross_listings(args.year, args.semester, args.subjects)
+    save_cross_listings(result, args.out)
+    print(f"{len(result.groups)} cross-listed groups in {time.perf_counter() - start:.1f}s -> {args.out}")
+    for group in result.groups:
+        print("  " + " = ".join(group))
@@ -0,0 +1,190 @@
+"""
+Pre-validation of course ids before they reach the timetable.
+
+A lookup for a typo or a retired course used to cost a full timetable POST
+every time, only to come back "NO SECTIONS FOUND". Course-id lookups
+(searchID, searchIDData, searchIDDataBatch) now ask `rejection()` first. An
+id it rejects gets the usual empty result without an upstream call.
+
+Two sources:
+
+    subjects   the timetable's subject list (`get_subjects()`), stored in
+               TIMETABLE_SUBJECTS (default <TIMETABLE_CACHE_DIR>/subjects.json,
+               else backend/subjects.json). configSeed and prewarm write it.
+               With TIMETABLE_CACHE_DIR set, a lookup that finds it missing or
+               older than TIMETABLE_SUBJECTS_TTL (default one day) also
+               refetches it in the background for the next process. Without
+               a shared cache lookups only read it. An unknown subject is
+               rejected.
+    catalog    a known-course set written by configSeed from the catalog
+               scrape (TIMETABLE_KNOWN_COURSES, default
+               backend/known_courses.json), with the code range of each
+               subject the scrape covers (the undergraduate CS catalog is
+               CS codes below 5000). Listed ids skip the subject check. Ids
+               missing from a covered range are counted but still looked up:
+               the catalog lags new courses, so it can't prove an id has no
+               sections.
+
+Either source is skipped when its data is unavailable. Validation only ever
+avoids upstream calls for ids that would come back empty; it never turns a
+possible answer into a rejection on a guess.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional
+
+try:
+    from pythonTimetables.timeTablesVTT import get_subjects
+except ModuleNotFoundError:
+    from timeTablesVTT import get_subjects
+
+SUBJECTS_TTL = float(os.environ.get("TIMETABLE_SUBJECTS_TTL", "86400"))
+CACHE_DIR = os.environ.get("TIMETABLE_CACHE_DIR", "")
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBJECTS_PATH = os.environ.get(
+    "TIMETABLE_SUBJECTS",
+    os.path.join(CACHE_DIR, "subjects.json") if CACHE_DIR else os.path.join(_BACKEND_DIR, "subjects.json"))
+KNOWN_COURSES_PATH = os.environ.get("TIMETABLE_KNOWN_COURSES", os.path.join(_BACKEND_DIR, "known_courses.json"))
+
+_lock = threading.Lock()
+_subjects: Optional[FrozenSet[str]] = None
+_subjects_at = 0.0
+_refreshing = False
+_known = None  # (mtime, KnownCourses)
+stats: Dict[str, int] = {"passed": 0, "unknown_subject": 0, "catalog_miss": 0}
+
+
+def known_subjects() -> Optional[FrozenSet[str]]:
+    """
+    Subject codes offered by the timetable, or None if no list has been
+    stored. Never fetches on the caller's thread. With a shared cache, a
+    missing or expired list is refetched in the background, and the expired
+    one is used meanwhile.
+    """
+    global _subjects, _subjects_at
+    with _lock:
+        if _subjects is None or time.time() - _subjects_at >= SUBJECTS_TTL:
+            try:
+                with open(SUBJECTS_PATH, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data["subjects"] and (_subjects is None or data["fetchedAt"] > _subjects_at):
+                    _subjects, _subjects_at = frozenset(data["subjects"]), data["fetchedAt"]
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        if CACHE_DIR and (_subjects is None or time.time() - _subjects_at >= SUBJECTS_TTL):
+            _refresh_subjects()
+        return _subjects
+
+
+def update_subjects() -> int:
+    """Fetch the subject list now and store it; returns the number of subjects."""
+    global _subjects, _subjects_at
+    fetched = frozenset(code for code, _ in get_subjects())
+    if not fetched:
+        raise ValueError("The timetable returned no subjects.")
+    fetched_at = time.time()
+    os.makedirs(os.path.dirname(os.path.abspath(SUBJECTS_PATH)), exist_ok=True)
+    tmp = f"{SUBJECTS_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"fetchedAt": fetched_at, "subjects": sorted(fetched)}, f)
+    os.replace(tmp, SUBJECTS_PATH)
+    with _lock:
+        _subjects, _subjects_at = fetched, fetched_at
+    return len(fetched)
+
+
+def _refresh_subjects() -> None:
+    """Fetch the subject list on a background thread (caller holds _lock)."""
+    global _refreshing
+    if _refreshing:
+        return
+    _refreshing = True
+
+    def run():
+        global _refreshing
+        try:
+            update_subjects()
+        except Exception:
+            pass  # keep the last list rather than reject everything
+        finally:
+            with _lock:
+                _refreshing = False
+
+    # Not a daemon: a one-shot bridge process finishes the fetch and stores it
+    # in the shared cache for the next one.
+    threading.Thread(target=run, name="refresh-subjects").start()
+
+
+class KnownCourses:
+    """Catalog course ids, and the code range each scraped subject covers."""
+
+    def __init__(self, covers: Mapping[str, Iterable[int]], courses: Iterable[str]) -> None:
+        self.ranges = {s.upper(): (int(lo), int(hi)) for s, (lo, hi) in covers.items()}
+        self.courses = frozenset(c.upper() for c in courses)
+
+    def covers(self, subject: str, code: str) -> bool:
+        """True if the scrape of `subject` included `code`'s range."""
+        bounds = self.ranges.get(subject)
+        return bounds is not None and code.isdigit() and bounds[0] <= int(code) <= bounds[1]
+
+    def __contains__(self, course_id: str) -> bool:
+        return course_id in self.courses
+
+
+def write_known_courses(courses: Iterable[str], covers: Mapping[str, Iterable[int]],
+                        path: str = KNOWN_COURSES_PATH) -> None:
+    """
+    Store the known-course set. `covers` maps each subject to the inclusive
+    (low, high) code range `courses` lists completely.
+    """
+    data = {"covers": {s: list(bounds) for s, bounds in sorted(covers.items())},
+            "courses": sorted(set(courses))}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=0)
+    os.replace(tmp, path)
+
+
+def known_courses() -> Optional[KnownCourses]:
+    """The known-course set, reloaded when the file changes; None if there is none."""
+    global _known
+    try:
+        mtime = os.path.getmtime(KNOWN_COURSES_PATH)
+    except OSError:
+        return None
+    with _lock:
+        if _known is None or _known[0] != mtime:
+            try:
+                with open(KNOWN_COURSES_PATH, encoding="utf-8") as f:
+                    data = json.load(f)
+                _known = (mtime, KnownCourses(data["covers"], data["courses"]))
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                return None
+        return _known[1]
+
+
+def _count(stat: str) -> None:
+    with _lock:
+        stats[stat] += 1
+
+
+def rejection(subject: str, code: str) -> Optional[str]:
+    """
+    Why `subject` `code` cannot have sections, or None if it may. `subject`
+    is upper case, as the lookups normalize it.
+    """
+    known = known_courses()
+    if known is not None and known.covers(subject, code):
+        if f"{subject}{code}" in known:
+            _count("passed")
+            return None
+        _count("catalog_miss")  # possibly added since the scrape; ask the timetable
+
+    subjects = known_subjects()
+    if subjects is not None and subject not in subjects:
+        _count("unknown_subject")
+        return f"Unknown subject {subject!r}."
+    _count("passed")
+    return None
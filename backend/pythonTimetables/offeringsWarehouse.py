@@ -0,0 +1,249 @@
+"""
+Multi-term offerings warehouse.
+
+Harvests every term listed by `get_semesters()` into a local SQLite file, one
+row per (term, CRN), so questions like "which terms is CS3114 offered in",
+"how many sections does it usually have" and "who has taught it" are indexed
+queries instead of live timetable searches. The same data replaces the
+hardcoded ["Fall", "Spring"] semesters in courses.json with real offering
+patterns.
+
+Usage (from backend/):
+    python pythonTimetables/offeringsWarehouse.py harvest --subjects CS MATH STAT
+    python pythonTimetables/offeringsWarehouse.py offered CS3114
+    python pythonTimetables/offeringsWarehouse.py update-courses courses.json
+"""
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from pythonTimetables.timeTablesVTT import (
+        Semester, clean_int, get_semesters, get_subjects, iter_timetable, term_code,
+    )
+except ModuleNotFoundError:
+    from timeTablesVTT import (
+        Semester, clean_int, get_semesters, get_subjects, iter_timetable, term_code,
+    )
+
+DEFAULT_DB_PATH = os.environ.get(
+    "OFFERINGS_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "offerings.sqlite3")
+)
+
+# Regular terms, in the order they are reported in courses.json.
+_PATTERN_SEMESTERS = [Semester.FALL, Semester.SPRING, Semester.SUMMER, Semester.WINTER]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    term          TEXT NOT NULL,   -- TERMYEAR code, e.g. '202609'
+    year          TEXT NOT NULL,
+    semester      TEXT NOT NULL,   -- 'Fall', 'Spring', ...
+    crn           TEXT NOT NULL,
+    course_id     TEXT NOT NULL,   -- 'CS3114'
+    subject       TEXT NOT NULL,
+    code          TEXT NOT NULL,
+    name          TEXT,
+    section_type  TEXT,
+    modality      TEXT,
+    credit_hours  TEXT,
+    capacity      INTEGER,
+    professor     TEXT,
+    PRIMARY KEY (term, crn)
+);
+CREATE INDEX IF NOT EXISTS sections_course_term ON sections (course_id, term);
+CREATE INDEX IF NOT EXISTS sections_subject_term ON sections (subject, term);
+CREATE INDEX IF NOT EXISTS sections_professor ON sections (professor);
+
+CREATE TABLE IF NOT EXISTS harvests (
+    term          TEXT NOT NULL,
+    subject       TEXT NOT NULL,
+    harvested_at  REAL NOT NULL,
+    section_count INTEGER NOT NULL,
+    PRIMARY KEY (term, subject)
+);
+"""
+
+
+class OfferingsWarehouse:
+    """SQLite-backed store of timetable sections keyed by (term, CRN)."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- loading ----------
+
+    def store_sections(self, year: str, semester: Semester, subject: str,
+                       sections: Iterable) -> int:
+        """
+        Replace the stored sections for (term, subject) with `sections`
+        (an iterable of `Course`). Returns the number of rows written.
+        """
+        term = term_code(year, semester)
+        rows = [(
+            term, str(year), semester.name.title(), c.get_crn(),
+            f"{c.get_subject()}{c.get_code()}", c.get_subject(), c.get_code(),
+            c.get_name(),
+            c.get_type().name if c.get_type() else None,
+            c.get_modality().name if c.get_modality() else None,
+            str(c.get_credit_hours()),
+            clean_int(c.get_capacity()),
+            c.get_professor() if isinstance(c.get_professor(), str) else None,
+        ) for c in sections]
+
+        with self._conn:
+            self._conn.execute("DELETE FROM sections WHERE term = ? AND subject = ?",
+                               (term, subject))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sections VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO harvests VALUES (?,?,?,?)",
+                               (term, subject, time.time(), len(rows)))
+        return len(rows)
+
+    def harvest(self, subjects: Optional[List[str]] = None,
+                terms: Optional[Iterable[Tuple[Semester, str]]] = None,
+                skip_harvested: bool = False, log=print) -> int:
+        """
+        Pull every (term, subject) pair into the store, one timetable query
+        each. `terms` defaults to `get_semesters()` and `subjects` to every
+        subject from `get_subjects()`. Returns the total rows written.
+        """
+        terms = sorted(terms if terms is not None else get_semesters(),
+                       key=lambda t: term_code(t[1], t[0]))
+        if subjects is None:
+            subjects = sorted(s for s, _ in get_subjects())
+
+        harvested = set(self._conn.execute("SELECT term, subject FROM harvests"))
+        total = 0
+        for semester, year in terms:
+            for subject in subjects:
+                if skip_harvested and (term_code(year, semester), subject) in harvested:
+                    continue
+                try:
+                    n = self.store_sections(year, semester, subject,
+                                            iter_timetable(year, semester, subject=subject))
+                except Exception as e:
+                    log(f"  -> {semester.name.title()} {year} {subject}: {e}")
+                    continue
+                total += n
+                log(f"{semester.name.title()} {year} {subject}: {n} sections")
+        return total
+
+    # ---------- queries ----------
+
+    def terms_offered(self, course_id: str) -> List[Tuple[str, str]]:
+        """Return (year, semester) pairs in which `course_id` had sections, oldest first."""
+        return list(self._conn.execute(
+            "SELECT DISTINCT year, semester FROM sections WHERE course_id = ? ORDER BY term",
+            (course_id.upper(),)))
+
+    def section_counts(self, course_id: str) -> Dict[str, int]:
+        """Return {term: section count} for `course_id`."""
+        return dict(self._conn.execute(
+            "SELECT term, COUNT(*) FROM sections WHERE course_id = ? GROUP BY term ORDER BY term",
+            (course_id.upper(),)))
+
+    def typical_section_count(self, course_id: str, semester: Semester = None) -> Optional[float]:
+        """
+        Median number of sections per offered term, optionally restricted to
+        one semester type. None if the course was never offered.
+        """
+        counts = sorted(
+            n for term, n in self.section_counts(course_id).items()
+            if semester is None or term.endswith(semester.value)
+        )
+        if not counts:
+            return None
+        mid = len(counts) // 2
+        return float(counts[mid]) if len(counts) % 2 else (counts[mid - 1] + counts[mid]) / 2
+
+    def instructor_history(self, course_id: str) -> List[Dict[str, object]]:
+        """Return [{year, semester, professor, sections}] for `course_id`, oldest first."""
+        return [
+            {"year": y, "semester": s, "professor": p, "sections": n}
+            for y, s, p, n in self._conn.execute(
+                "SELECT year, semester, professor, COUNT(*) FROM sections "
+                "WHERE course_id = ? AND professor IS NOT NULL "
+                "GROUP BY term, professor ORDER BY term, professor",
+                (course_id.upper(),))
+        ]
+
+    def offering_pattern(self, course_id: str) -> List[str]:
+        """
+        Semester names the course is offered in, e.g. ['Fall', 'Spring'],
+        based on every harvested term.
+        """
+        offered = {s for _, s in self.terms_offered(course_id)}
+        return [s.name.title() for s in _PATTERN_SEMESTERS if s.name.title() in offered]
+
+    def harvested_subjects(self) -> set:
+        return {s for (s,) in self._conn.execute("SELECT DISTINCT subject FROM harvests")}
+
+    def update_courses_json(self, path: str) -> int:
+        """
+        Rewrite the "semesters" field of each record in courses.json from the
+        harvested offering pattern. Courses whose subject was never harvested,
+        or that had no sections in any term, keep their current value.
+        Returns the number of records changed.
+        """
+        with open(path, encoding="utf-8") as f:
+            courses = json.load(f)
+
+        subjects = self.harvested_subjects()
+        changed = 0
+        for course in courses:
+            if course.get("category") not in subjects:
+                continue
+            pattern = self.offering_pattern(course.get("code", ""))
+            if pattern and pattern != course.get("semesters"):
+                course["semesters"] = pattern
+                changed += 1
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(courses, f, ensure_ascii=False, indent=2)
+        return changed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Harvest and query multi-term offerings.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("harvest")
+    p.add_argument("--subjects", nargs="*", help="default: every subject in get_subjects()")
+    p.add_argument("--resume", action="store_true", help="skip (term, subject) pairs already stored")
+    p = sub.add_parser("offered")
+    p.add_argument("course_id")
+    p = sub.add_parser("update-courses")
+    p.add_argument("courses_json")
+    args = parser.parse_args()
+
+    with OfferingsWarehouse(args.db) as wh:
+        if args.command == "harvest":
+            n = wh.harvest(subjects=args.subjects, skip_harvested=args.resume)
+            print(f"Stored {n} sections in {args.db}.")
+        elif args.command == "offered":
+            cid = args.course_id.upper()
+            print(json.dumps({
+                "courseId": cid,
+                "terms": wh.terms_offered(cid),
+                "pattern": wh.offering_pattern(cid),
+                "typicalSections": wh.typical_section_count(cid),
+                "instructors": wh.instructor_history(cid),
+            }, indent=2))
+        else:
+            n = wh.update_courses_json(args.courses_json)
+            print(f"Updated semesters for {n} courses in {args.courses_json}.")
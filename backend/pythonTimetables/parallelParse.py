@@ -0,0 +1,228 @@
+"""
+Multi-core parsing of term-wide timetable pages.
+
+A subject='%' results page has thousands of rows, and turning them into
+`Course` objects (cell scanning, regexes per row, enum lookups, schedule sets)
+is CPU-bound. Here the results table is cut into row chunks in the parent,
+with a cheap tag scan. A process pool parses the chunks and sends back compact
+tuples, which are rebuilt into `Course` objects in page order.
+
+Each chunk carries the first row of the next chunk as look-ahead. A section on
+the last row of a chunk therefore still sees its "* Additional Times *"
+continuation row. A continuation row at the start of a chunk is not a section
+row, so it is skipped there as in the serial parse. The result is the same as
+`list(iter_timetable(...))`.
+
+Pages under MIN_PARALLEL_ROWS rows are parsed serially, because pool overhead
+would dominate. TIMETABLE_PARSE_WORKERS sets the pool size (default: CPU count).
+
+Benchmark (from backend/):
+    python pythonTimetables/parallelParse.py --rows 8000 --workers 1 2 4
+    python pythonTimetables/parallelParse.py --html term.html --workers 1 4
+"""
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+try:
+    from pythonTimetables.timeTablesVTT import (
+        Course, Day, Modality, SectionType, Semester, _TIMETABLE_TABLE,
+        _iter_courses, _iter_timetable_rows, _timetable_html,
+    )
+except ModuleNotFoundError:
+    from timeTablesVTT import (
+        Course, Day, Modality, SectionType, Semester, _TIMETABLE_TABLE,
+        _iter_courses, _iter_timetable_rows, _timetable_html,
+    )
+
+PARSE_WORKERS = int(os.environ.get("TIMETABLE_PARSE_WORKERS", "0")) or os.cpu_count() or 1
+MIN_PARALLEL_ROWS = 1500
+CHUNK_ROWS = 500
+
+_TABLE_OR_ROW = re.compile(r'<(/?)(table|tr)\b[^>]*>', re.IGNORECASE)
+
+# (crn, subject, code, name, section type, modality, credit hours, capacity,
+#  professor, ((day name, ((start, end, location), ...)), ...))
+Record = tuple
+
+
+def split_rows(html: str, table_index: int = _TIMETABLE_TABLE) -> Tuple[List[int], int]:
+    """
+    Return (row_starts, table_end): the offset of each top-level <tr> of the
+    `table_index`-th table and the offset of its closing tag (or the end of
+    the page). Rows of nested tables are not split points.
+    """
+    tables_seen = depth = 0
+    rows: List[int] = []
+    for m in _TABLE_OR_ROW.finditer(html):
+        closing, tag = m.group(1), m.group(2).lower()
+        if tag == 'table':
+            if closing:
+                if depth:
+                    depth -= 1
+                    if not depth:
+                        return rows, m.start()
+            else:
+                if depth:
+                    depth += 1
+                elif tables_seen == table_index:
+                    depth = 1
+                tables_seen += 1
+        elif depth == 1 and not closing:
+            rows.append(m.start())
+    return rows, len(html)
+
+
+def _to_record(course: Course) -> Record:
+    d = course._course_data
+    return (d['crn'], d['subject'], d['code'], d['name'], d['section_type'].name,
+            d['modality'].name if d['modality'] else None,
+            d['credit_hours'], d['capacity'], d['professor'],
+            tuple((day.name, tuple(slots)) for day, slots in d['schedule'].items()))
+
+
+def _from_record(year: str, semester: Semester, record: Record) -> Course:
+    """Rebuild a Course from `_to_record` output without re-parsing."""
+    (crn, subject, code, name, section_type, modality, credit_hours,
+     capacity, professor, schedule) = record
+    course = Course.__new__(Course)
+    course._course_data = {
+        'year': year,
+        'semester': semester,
+        'crn': crn,
+        'subject': subject,
+        'code': code,
+        'name': name,
+        'section_type': SectionType[section_type],
+        'modality': Modality[modality] if modality else None,
+        'credit_hours': credit_hours,
+        'capacity': capacity,
+        'professor': professor,
+        'schedule': {Day[day]: set(slots) for day, slots in schedule},
+    }
+    course._banner_info = None
+    return course
+
+
+def _parse_chunk(task: tuple) -> List[Record]:
+    """Pool worker: parse one chunk of rows (plus look-ahead row) into records."""
+    text, year, semester, skip_header, has_lookahead = task
+    rows = list(_iter_timetable_rows(text, table_index=0, skip_header=skip_header))
+    last = len(rows) - 1 if has_lookahead else len(rows)
+    return [_to_record(Course(year, semester, rows[i], rows[i + 1] if i + 1 < len(rows) else None))
+            for i in range(last) if isinstance(rows[i][0], str)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Reuse one pool per process; worker start-up is paid once, not per page."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+    return _pool
+
+
+def chunk_tasks(html: str, year: str, semester: Semester,
+                workers: int, chunk_rows: int = CHUNK_ROWS) -> List[tuple]:
+    """Cut the results table into `_parse_chunk` tasks with one look-ahead row each."""
+    rows, table_end = split_rows(html)
+    bounds = rows + [table_end]
+    size = max(1, min(chunk_rows, math.ceil(len(rows) / workers)))
+    tasks = []
+    for start in range(0, len(rows), size):
+        end = min(start + size, len(rows))
+        lookahead = html[bounds[end]:bounds[end + 1]] if end < len(rows) else ''
+        text = '<table>' + html[bounds[start]:bounds[end]] + lookahead + '</table>'
+        tasks.append((text, year, semester, start == 0, bool(lookahead)))
+    return tasks
+
+
+def parse_timetable_parallel(html: str, year: str, semester: Semester,
+                             workers: int = None, chunk_rows: int = CHUNK_ROWS,
+                             min_rows: int = MIN_PARALLEL_ROWS) -> List[Course]:
+    """
+    Parse a timetable results page into Course objects on a process pool.
+    Falls back to the serial parser for small pages or `workers <= 1`.
+    """
+    if not html:
+        return []
+    workers = workers or PARSE_WORKERS
+    if workers <= 1 or len(split_rows(html)[0]) < min_rows:
+        return list(_iter_courses(html, year, semester))
+
+    courses = []
+    for records in _get_pool(workers).map(
+            _parse_chunk, chunk_tasks(html, year, semester, workers, chunk_rows)):
+        courses.extend(_from_record(year, semester, r) for r in records)
+    return courses
+
+
+def search_timetable_parallel(year: str, semester: Semester, workers: int = None,
+                              **filters) -> List[Course]:
+    """`search_timetable(year, semester, **filters)` with the parse done on the pool."""
+    return parse_timetable_parallel(_timetable_html(year, semester, **filters),
+                                    year, semester, workers)
+
+
+def synthetic_page(rows: int, continuation_every: int = 4) -> str:
+    """A results page shaped like the timetable's, for benchmarks."""
+    def tr(cells):
+        return '<TR>' + ''.join(f'<TD class="dedefault">{c}</TD>' for c in cells) + '</TR>\n'
+
+    parts = ['<HTML><BODY>'] + ['<TABLE><TR><TD>nav</TD></TR></TABLE>'] * _TIMETABLE_TABLE
+    parts.append('<TABLE class="dataentrytable">')
+    parts.append(tr(['CRN', 'Course', 'Title', 'Schedule Type', 'Modality', 'Cr Hrs',
+                     'Capacity', 'Instructor', 'Days', 'Begin', 'End', 'Location', 'Exam']))
+    for i in range(rows):
+        parts.append(tr([f'<b>{10000 + i}</b>', f'CS-{1000 + i % 9000}', f'Course&nbsp;{i}',
+                         'L', 'Face-to-Face Instruction', '3', str(20 + i % 80), 'Staff',
+                         'M W F', '9:05AM', '9:55AM', f'MCB {100 + i % 50}', 'x']))
+        if continuation_every and i % continuation_every == 0:
+            parts.append(tr(['', '', '', '', '* Additional Times *', '', '', '',
+                             'T', '2:00PM', '3:15PM', 'TORG 1040', '']))
+    parts.append('</TABLE></BODY></HTML>')
+    return ''.join(parts)
+
+
+if __name__ == "__main__":
+    import argparse
+    import statistics
+
+    parser = argparse.ArgumentParser(description="Benchmark parallel timetable parsing.")
+    parser.add_argument("--html", help="saved results page (default: synthetic)")
+    parser.add_argument("--rows", type=int, default=8000, help="synthetic page size")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, encoding="utf-8") as f:
+            page = f.read()
+    else:
+        page = synthetic_page(args.rows)
+    year, sem = "2026", Semester.FALL
+    n_rows = len(split_rows(page)[0])
+
+    baseline = None
+    reference = [_to_record(c) for c in _iter_courses(page, year, sem)]
+    for workers in args.workers:
+        courses = parse_timetable_parallel(page, year, sem, workers, min_rows=0)  # warm pool
+        if [_to_record(c) for c in courses] != reference:
+            raise SystemExit(f"workers={workers}: result differs from the serial parse")
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            parse_timetable_parallel(page, year, sem, workers, min_rows=0)
+            times.append(time.perf_counter() - start)
+        median = statistics.median(times)
+        baseline = baseline or median
+        print(f"workers={workers:<3d} rows={n_rows} sections={len(courses)} "
+              f"median {median * 1000:.0f} ms  speedup x{baseline / median:.2f}")
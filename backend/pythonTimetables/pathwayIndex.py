@@ -0,0 +1,244 @@
+"""
+Per-term pathway index: pathway code -> courses and course -> pathway codes.
+
+Built from one timetable query per `Pathway` code (CORE_CODE=<code>, every
+subject), 17 queries per term. Until now every course lookup regex-scanned
+its own timetable page for codes. Answering "all courses satisfying G06A
+next term" that way took one lookup per course in the catalog. Per-course
+tags also come from the index, so they only list pathways the timetable
+actually files the course under, not every code-shaped string on its page.
+
+An index is kept in memory and stored at <dir>/<term>.json, so the
+one-process-per-request bridge reuses it. The directory is
+TIMETABLE_PATHWAY_INDEX_DIR, else <TIMETABLE_CACHE_DIR>/pathways, else
+backend/pathway_index. TIMETABLE_PATHWAY_INDEX_TTL sets how long an index
+is used before it is rebuilt, in seconds (default six hours).
+
+Requests never build an index; that takes 17 term-wide queries.
+`lookup_pathways()` returns None when no fresh index for the term is
+available, and callers fall back to scanning the course's page.
+`coursesByPathway()` serves an existing index whatever its age (the
+response carries builtAt) and raises IndexNotBuilt when there is none,
+which the route answers with 503. Build one with `get_pathway_index()`,
+from configSeed or prewarm.py, or from the CLI:
+
+    python pythonTimetables/pathwayIndex.py 2026 Spring --pathway G06A
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from pythonTimetables.timeTablesVTT import (
+        Campus, Course, Pathway, _get_next_semester, _normalize_course_id,
+        iter_timetable, parse_semester, parse_year, term_code,
+    )
+except ModuleNotFoundError:
+    from timeTablesVTT import (
+        Campus, Course, Pathway, _get_next_semester, _normalize_course_id,
+        iter_timetable, parse_semester, parse_year, term_code,
+    )
+
+INDEX_TTL = float(os.environ.get("TIMETABLE_PATHWAY_INDEX_TTL", str(6 * 3600)))
+CACHE_DIR = os.environ.get("TIMETABLE_CACHE_DIR", "")
+INDEX_DIR = os.environ.get("TIMETABLE_PATHWAY_INDEX_DIR") or (
+    os.path.join(CACHE_DIR, "pathways") if CACHE_DIR else
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pathway_index"))
+_TERM_RE = re.compile(r"\d{6}")
+
+# Codes in Pathway declaration order (CLE areas, then Pathways concepts).
+PATHWAY_CODES: Tuple[str, ...] = tuple(p.value for p in Pathway if p is not Pathway.ALL)
+
+
+class IndexNotBuilt(LookupError):
+    """No pathway index has been built for the term yet."""
+
+
+class PathwayIndex:
+    """Pathway tags of one term's courses and sections."""
+
+    def __init__(self, year: str, semester: str, built_at: float = None) -> None:
+        self.year = str(year)
+        self.semester = parse_semester(semester).name.title()
+        self.built_at = built_at or time.time()
+        self.courses: Dict[str, Set[str]] = {code: set() for code in PATHWAY_CODES}
+        self.crns: Dict[str, Set[str]] = {code: set() for code in PATHWAY_CODES}
+        self.names: Dict[str, str] = {}
+
+    def add(self, pathway: str, courses: Iterable[Course]) -> None:
+        """Record every section in `courses` as satisfying `pathway`."""
+        for course in courses:
+            course_id = f"{course.get_subject()}{course.get_code()}"
+            self.courses[pathway].add(course_id)
+            self.crns[pathway].add(course.get_crn())
+            self.names.setdefault(course_id, course.get_name())
+
+    def pathways_for(self, course_id: str) -> List[str]:
+        """Pathway codes of a course, in Pathway order ([] if it has none)."""
+        course_id = _normalize_course_id(course_id)
+        return [code for code in PATHWAY_CODES if course_id in self.courses[code]]
+
+    def courses_for(self, pathway: str) -> List[str]:
+        """Course ids satisfying `pathway` (a code such as 'G06A' or a Pathway member)."""
+        code = pathway.value if isinstance(pathway, Pathway) else str(pathway).strip().upper()
+        if code not in self.courses:
+            raise ValueError(f"Unknown pathway {pathway!r}; expected one of {', '.join(PATHWAY_CODES)}.")
+        return sorted(self.courses[code])
+
+    def to_dict(self) -> dict:
+        return {
+            "year": self.year,
+            "semester": self.semester,
+            "builtAt": self.built_at,
+            "courses": {code: sorted(ids) for code, ids in self.courses.items()},
+            "crns": {code: sorted(crns) for code, crns in self.crns.items()},
+            "names": self.names,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PathwayIndex":
+        index = cls(data["year"], data["semester"], data["builtAt"])
+        for code in PATHWAY_CODES:
+            index.courses[code] = set(data["courses"].get(code, []))
+            index.crns[code] = set(data["crns"].get(code, []))
+        index.names = dict(data.get("names", {}))
+        return index
+
+
+def build_pathway_index(year: str, semester: str,
+                        campus: Campus = Campus.BLACKSBURG) -> PathwayIndex:
+    """Query the timetable once per pathway code and index the results."""
+    sem = parse_semester(semester)
+    index = PathwayIndex(year, semester)
+    for code in PATHWAY_CODES:
+        index.add(code, iter_timetable(year, sem, campus=campus, pathway=Pathway(code)))
+    return index
+
+
+_indexes: Dict[str, PathwayIndex] = {}
+_indexes_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def _term_key(year: str, semester: str) -> str:
+    return term_code(parse_year(year), parse_semester(semester))
+
+
+def _path(term: str) -> str:
+    if not _TERM_RE.fullmatch(term):
+        raise ValueError(f"Invalid term {term!r}.")
+    return os.path.join(INDEX_DIR, f"{term}.json")
+
+
+def _load(term: str) -> Optional[PathwayIndex]:
+    path = _path(term)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return PathwayIndex.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save(term: str, index: PathwayIndex) -> None:
+    path = _path(term)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def cached_pathway_index(year: str, semester: str, max_age: float = INDEX_TTL) -> Optional[PathwayIndex]:
+    """The term's index from memory or disk if younger than `max_age`, else None."""
+    term = _term_key(year, semester)
+    with _indexes_lock:
+        index = _indexes.get(term)
+    if index is None or time.time() - index.built_at > max_age:
+        loaded = _load(term)
+        if loaded is not None and (index is None or loaded.built_at > index.built_at):
+            index = loaded
+            with _indexes_lock:
+                _indexes[term] = index
+    if index is not None and time.time() - index.built_at <= max_age:
+        return index
+    return None
+
+
+def get_pathway_index(year: str, semester: str, max_age: float = INDEX_TTL) -> PathwayIndex:
+    """The term's index, building (and storing) it when none is fresh enough."""
+    index = cached_pathway_index(year, semester, max_age)
+    if index is not None:
+        return index
+    with _build_lock:
+        index = cached_pathway_index(year, semester, max_age)  # built while we waited
+        if index is None:
+            index = build_pathway_index(year, semester)
+            term = _term_key(year, semester)
+            with _indexes_lock:
+                _indexes[term] = index
+            _save(term, index)
+    return index
+
+
+def lookup_pathways(year: str, semester: str, course_id: str) -> Optional[List[str]]:
+    """A course's pathway codes from an existing index, or None if there is none."""
+    index = cached_pathway_index(year, semester)
+    return index.pathways_for(course_id) if index is not None else None
+
+
+def coursesByPathway(pathway: str, year: str = None, semester: str = None) -> dict:
+    """
+    Courses satisfying `pathway` in a term (default: the next semester),
+    from an existing index. Raises IndexNotBuilt if the term has none.
+
+    Returns:
+      dict with keys year, semester, pathway, builtAt, and courses
+      [{courseId, name}] sorted by course id.
+    """
+    if year is None or semester is None:
+        year, semester = _get_next_semester()
+    index = cached_pathway_index(year, semester, max_age=math.inf)
+    if index is None:
+        raise IndexNotBuilt(f"The pathway index for {parse_semester(semester).name.title()} "
+                            f"{year} has not been built yet.")
+    code = pathway.value if isinstance(pathway, Pathway) else str(pathway).strip().upper()
+    return {
+        "year": index.year,
+        "semester": index.semester,
+        "pathway": code,
+        "builtAt": index.built_at,
+        "courses": [{"courseId": cid, "name": index.names.get(cid)}
+                    for cid in index.courses_for(code)],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a term's pathway index.")
+    parser.add_argument("year")
+    parser.add_argument("semester")
+    parser.add_argument("--pathway", help="print the courses satisfying this code")
+    parser.add_argument("--course", help="print this course's pathway codes")
+    parser.add_argument("--rebuild", action="store_true", help="ignore a stored index")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    idx = get_pathway_index(args.year, args.semester, max_age=0 if args.rebuild else INDEX_TTL)
+    print(f"{idx.semester} {idx.year}: {len(idx.names)} courses in "
+          f"{sum(1 for c in PATHWAY_CODES if idx.courses[c])} pathways "
+          f"({time.perf_counter() - start:.1f}s)")
+    if args.pathway:
+        print("\n".join(idx.courses_for(args.pathway)))
+    if args.course:
+        print(", ".join(idx.pathways_for(args.course)) or "(none)")
+    if not args.pathway and not args.course:
+        for code in PATHWAY_CODES:
+            print(f"  {code:5s} {len(idx.courses[code]):5d} courses {len(idx.crns[code]):6d} sections")
@@ -0,0 +1,216 @@
+"""
+Cache prewarming for the most looked-up courses.
+
+The bridge caches lookups in the encoded cache (courseJson) and the pathway
+index (pathwayIndex), both shared across processes under
+TIMETABLE_CACHE_DIR. After a deploy, or when a registration window opens,
+those caches are cold. The first user to look up each popular course then
+waits for the timetable and Banner.
+
+`warm()` fills them ahead of time for the next semester:
+    1. the timetable's subject list, for id pre-validation (knownCourses.py);
+    2. the pathway index, if none is fresh (17 timetable queries);
+    3. the default searchIDData lookup (timetable sections, Banner comments,
+       pathways) of the top courses by access statistics (accessStats.py).
+       If fewer than `top` courses have been looked up, the rest come from
+       the catalog (courses.json) courses offered that semester, so a fresh
+       deploy warms something.
+Entries still fresh are skipped. A lookup makes several upstream requests
+(timetable, Banner), so warming runs through a transport that paces every
+request to `share` of its host's rate limit (rateLimit.py). Warming
+therefore never takes the whole budget from users.
+
+The in-process caches (timetable pages, Banner comments) live only as long
+as one bridge process, so they are not warmed directly. Their results reach
+users through the encoded entries built from them.
+
+`schedule()` warms once at startup, then every `interval` seconds, and
+`lead` seconds before each hot window (TIMETABLE_HOT_WINDOWS, e.g.
+"2026-11-02T07:00,07:30"). A full "YYYY-MM-DDTHH:MM" is a one-off window;
+"HH:MM" repeats daily. server.js starts the scheduler when
+TIMETABLE_CACHE_DIR is set, unless TIMETABLE_PREWARM=off.
+
+CLI (from backend/):
+    python pythonTimetables/prewarm.py warm --top 50
+    python pythonTimetables/prewarm.py schedule --interval 21600
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+try:
+    from pythonTimetables.accessStats import CACHE_DIR, compact, top_courses
+    from pythonTimetables.courseJson import warm_id_data
+    from pythonTimetables.knownCourses import update_subjects
+    from pythonTimetables.pathwayIndex import cached_pathway_index, get_pathway_index
+    from pythonTimetables.rateLimit import bucket_for, host_of
+    from pythonTimetables.timeTablesVTT import _get_next_semester, parse_semester, term_code
+    from pythonTimetables.transport import Transport, get_transport, use_transport
+except ModuleNotFoundError:
+    from accessStats import CACHE_DIR, compact, top_courses
+    from courseJson import warm_id_data
+    from knownCourses import update_subjects
+    from pathwayIndex import cached_pathway_index, get_pathway_index
+    from rateLimit import bucket_for, host_of
+    from timeTablesVTT import _get_next_semester, parse_semester, term_code
+    from transport import Transport, get_transport, use_transport
+
+TOP_N = int(os.environ.get("TIMETABLE_PREWARM_TOP", "50"))
+SHARE = float(os.environ.get("TIMETABLE_PREWARM_SHARE", "0.5"))
+INTERVAL = float(os.environ.get("TIMETABLE_PREWARM_INTERVAL", str(6 * 3600)))
+LEAD = float(os.environ.get("TIMETABLE_PREWARM_LEAD", "600"))
+HOT_WINDOWS = os.environ.get("TIMETABLE_HOT_WINDOWS", "")
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "courses.json")
+
+
+class _PacedTransport(Transport):
+    """
+    Wraps `inner`, spacing each host's requests to `share` of its rate
+    limit (no spacing for unlimited hosts).
+    """
+
+    def __init__(self, inner: Transport, share: float = SHARE) -> None:
+        self.inner = inner
+        self.share = share
+        self._lock = threading.Lock()
+        self._next: Dict[str, float] = {}  # host -> earliest monotonic time of its next request
+
+    def request(self, method, url, data=None, timeout=None):
+        host = host_of(url)
+        bucket = bucket_for(host)
+        if bucket is not None and self.share > 0:
+            with self._lock:
+                now = time.monotonic()
+                at = max(now, self._next.get(host, 0.0))
+                self._next[host] = at + 1.0 / (bucket.rate * self.share)
+            if at > now:
+                time.sleep(at - now)
+        return self.inner.request(method, url, data=data, timeout=timeout)
+
+    def close(self) -> None:
+        pass  # the inner transport is the process's and stays open
+
+
+def catalog_courses(semester: str, path: str = CATALOG_PATH) -> List[str]:
+    """Catalog course codes offered in `semester` (all of them if none say)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            courses = json.load(f)
+    except (OSError, ValueError):
+        return []
+    semester = parse_semester(semester).name.title()
+    return [c["code"] for c in courses
+            if c.get("code") and (not c.get("semesters") or semester in c["semesters"])]
+
+
+def prewarm_courses(term: str, semester: str, top: int = TOP_N) -> List[str]:
+    """The `top` course ids to warm: most looked-up first, then catalog courses."""
+    chosen = [course_id for course_id, _ in top_courses(term, top)]
+    if len(chosen) < top:
+        seen = set(chosen)
+        chosen += [c for c in catalog_courses(semester) if c not in seen][:top - len(chosen)]
+    return chosen
+
+
+def warm(top: int = TOP_N, share: float = SHARE, pathways: bool = True,
+         min_ttl_left: float = 0.0) -> Dict[str, int]:
+    """
+    Warm the next semester's pathway index and its top `top` course lookups.
+    Returns counts of courses by outcome ("fresh", "warmed", "failed"), plus
+    "pathways": 1 if the index was rebuilt.
+    """
+    year, semester = _get_next_semester()
+    term = term_code(year, parse_semester(semester))
+    compact(term)
+    counts = {"fresh": 0, "warmed": 0, "failed": 0, "pathways": 0}
+    with use_transport(_PacedTransport(get_transport(), share)):
+        try:
+            update_subjects()
+        except Exception as e:
+            print(f"prewarm: subject list failed: {e}", file=sys.stderr)
+        if pathways and cached_pathway_index(year, semester) is None:
+            try:
+                get_pathway_index(year, semester)
+                counts["pathways"] = 1
+            except Exception as e:
+                print(f"prewarm: pathway index for {term} failed: {e}", file=sys.stderr)
+        for course_id in prewarm_courses(term, semester, top):
+            counts[warm_id_data(course_id, min_ttl_left)] += 1
+    return counts
+
+
+def parse_windows(spec: str) -> List[str]:
+    """Split a hot-window list, checking each is "YYYY-MM-DDTHH:MM" or "HH:MM"."""
+    windows = [w.strip() for w in spec.split(",") if w.strip()]
+    for w in windows:
+        datetime.strptime(w, "%H:%M" if len(w) <= 5 else "%Y-%m-%dT%H:%M")
+    return windows
+
+
+def next_window(windows: List[str], lead: float, now: datetime = None) -> Optional[datetime]:
+    """When to warm for the next hot window: its start minus `lead`, after `now`."""
+    now = now or datetime.now()
+    starts = []
+    for w in windows:
+        if len(w) <= 5:
+            at = datetime.combine(now.date(), datetime.strptime(w, "%H:%M").time())
+            while at - timedelta(seconds=lead) <= now:
+                at += timedelta(days=1)
+        else:
+            at = datetime.strptime(w, "%Y-%m-%dT%H:%M")
+        start = at - timedelta(seconds=lead)
+        if start > now:
+            starts.append(start)
+    return min(starts, default=None)
+
+
+def schedule(top: int = TOP_N, share: float = SHARE, interval: float = INTERVAL,
+             lead: float = LEAD, windows: List[str] = None,
+             stop: threading.Event = None) -> None:
+    """Warm now, then every `interval` seconds and ahead of each hot window, until `stop`."""
+    windows = parse_windows(HOT_WINDOWS) if windows is None else windows
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            counts = warm(top, share)
+            print(f"prewarm: {counts} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        except Exception as e:
+            print(f"prewarm: failed: {e}", file=sys.stderr)
+        wait = interval
+        upcoming = next_window(windows, lead)
+        if upcoming is not None:
+            wait = min(wait, (upcoming - datetime.now()).total_seconds())
+        stop.wait(max(wait, 1.0))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prewarm lookup caches for the most looked-up courses.")
+    parser.add_argument("command", choices=["warm", "schedule", "top"])
+    parser.add_argument("--top", type=int, default=TOP_N)
+    parser.add_argument("--share", type=float, default=SHARE,
+                        help="fraction of the timetable rate limit to use")
+    parser.add_argument("--interval", type=float, default=INTERVAL, help="seconds between warms")
+    parser.add_argument("--lead", type=float, default=LEAD, help="seconds to warm ahead of a window")
+    parser.add_argument("--windows", default=HOT_WINDOWS,
+                        help='hot windows, e.g. "2026-11-02T07:00,07:30"')
+    args = parser.parse_args()
+
+    if not CACHE_DIR and args.command != "top":
+        parser.error("TIMETABLE_CACHE_DIR is not set; there is no shared cache to warm.")
+    if args.command == "top":
+        year, semester = _get_next_semester()
+        print("\n".join(prewarm_courses(term_code(year, parse_semester(semester)), semester, args.top)))
+    elif args.command == "warm":
+        print(warm(args.top, args.share))
+    else:
+        try:
+            schedule(args.top, args.share, args.interval, args.lead, parse_windows(args.windows))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,196 @@
+"""
+Opt-in profiling for bridge calls and seed runs.
+
+Off by default. When it is off, `profile_section()` hands back a shared no-op
+context manager and `profiled()` returns the function unchanged. When it is
+on, each profiled section records:
+
+    - wall and CPU time, the process's max RSS, and (with "mem") the
+      section's peak traced memory, appended as one NDJSON line to
+      <dir>/samples.ndjson;
+    - with "cpu": a cProfile dump, <dir>/<request id>/<section>.pstats
+      (open with `python -m pstats` or snakeviz);
+    - with "mem": the top allocation sites from tracemalloc,
+      <dir>/<request id>/<section>.alloc.txt.
+
+Configuration:
+    TIMETABLE_PROFILE      "", "1"/"all" (= cpu,mem), "cpu", "mem" or "time"
+                           (samples only); comma-separated values combine.
+    TIMETABLE_PROFILE_DIR  report directory (default ./profiles)
+    TIMETABLE_PROFILE_TOP  allocation sites per report (default 25)
+    TIMETABLE_REQUEST_ID   groups the reports of one request; the Node bridge
+                           sets it per call, otherwise one id per process.
+
+Nested sections are timed individually. Only the outermost one runs cProfile
+and tracemalloc, since neither can be stacked.
+
+Example:
+    TIMETABLE_PROFILE=all python configSeed.py
+    python -m pstats profiles/<id>/seed.lookups.pstats
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Optional, Set
+
+_enabled: Set[str] = set()
+_directory = "profiles"
+_request_id = ""
+_top_n = 25
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def _parse_modes(value: str) -> Set[str]:
+    modes = {m.strip().lower() for m in value.split(",") if m.strip()}
+    modes -= {"0", "off", "false", "no"}
+    if modes & {"1", "all", "true", "yes"}:
+        modes |= {"cpu", "mem"}
+    return (modes & {"cpu", "mem", "time"}) | ({"time"} if modes else set())
+
+
+def enable(modes: str = "all", directory: str = None, request_id: str = None) -> None:
+    """Turn profiling on at runtime (e.g. from a --profile flag)."""
+    global _enabled, _directory, _request_id
+    _enabled = _parse_modes(modes)
+    _directory = directory or _directory
+    _request_id = request_id or _request_id or uuid.uuid4().hex[:12]
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = set()
+
+
+def is_enabled() -> bool:
+    return bool(_enabled)
+
+
+def request_id() -> str:
+    return _request_id
+
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+
+
+class _Section:
+    """One profiled section; see the module docstring for what it writes."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self):
+        depth = getattr(_local, "depth", 0)
+        _local.depth = depth + 1
+        self._outer = depth == 0
+        self._profiler = None
+        self._tracing = False
+        if self._outer and "mem" in _enabled:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self._tracing = True
+        if self._outer and "cpu" in _enabled:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _local.depth -= 1
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        sample = {
+            "requestId": _request_id,
+            "section": self.name,
+            "pid": os.getpid(),
+            "ts": round(time.time(), 3),
+            "wallMs": round(wall * 1000, 3),
+            "cpuMs": round(cpu * 1000, 3),
+            "peakKiB": None,  # tracemalloc peak, outermost "mem" sections only
+            "maxRssKiB": _max_rss_kib(),
+            "error": exc_type.__name__ if exc_type else None,
+        }
+        try:
+            report_dir = os.path.join(_directory, _safe(_request_id))
+            if self._profiler is not None or self._tracing:
+                os.makedirs(report_dir, exist_ok=True)
+            if self._tracing:
+                import tracemalloc
+                snapshot = tracemalloc.take_snapshot()
+                sample["peakKiB"] = tracemalloc.get_traced_memory()[1] // 1024
+                tracemalloc.stop()
+                self._write_allocations(snapshot, os.path.join(report_dir, f"{_safe(self.name)}.alloc.txt"))
+            if self._profiler is not None:
+                self._profiler.dump_stats(os.path.join(report_dir, f"{_safe(self.name)}.pstats"))
+            os.makedirs(_directory, exist_ok=True)
+            with _write_lock, open(os.path.join(_directory, "samples.ndjson"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(sample) + "\n")
+        except OSError:
+            pass  # profiling must never break the call it wraps
+        return False
+
+    def _write_allocations(self, snapshot, path: str) -> None:
+        import tracemalloc
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        stats = snapshot.statistics("lineno")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {self.name} ({_request_id}): top {_top_n} allocation sites still live at exit\n")
+            for stat in stats[:_top_n]:
+                frame = stat.traceback[0]
+                f.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  "
+                        f"{frame.filename}:{frame.lineno}\n")
+
+
+def _max_rss_kib() -> Optional[int]:
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    except (ImportError, OSError):
+        return None
+
+
+_NULL = contextlib.nullcontext()
+
+
+def profile_section(name: str):
+    """Context manager profiling the enclosed block as `name` (no-op when off)."""
+    return _Section(name) if _enabled else _NULL
+
+
+def profiled(name: str = None):
+    """
+    Decorator form of `profile_section`. Decided when the function is
+    decorated, so a disabled process pays nothing per call.
+    """
+    def decorator(func):
+        if not _enabled:
+            return func
+        import functools
+        section = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Section(section):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+if os.environ.get("TIMETABLE_PROFILE"):
+    _top_n = int(os.environ.get("TIMETABLE_PROFILE_TOP", "25"))
+    enable(os.environ["TIMETABLE_PROFILE"],
+           os.environ.get("TIMETABLE_PROFILE_DIR"),
+           os.environ.get("TIMETABLE_REQUEST_ID"))
@@ -0,0 +1,171 @@
+"""
+Cross-process token-bucket rate limiting for VT upstream hosts.
+
+Bridge workers, seed runs, watchers and harvests all call the same VT hosts
+from separate processes. Every upstream request first takes a token from its
+host's bucket. The bucket lives in a small state file under RATE_LIMIT_DIR
+and is updated under an exclusive flock, so all processes on the machine
+share one budget per host.
+
+A caller that finds the bucket empty reserves the next token (the balance
+goes negative) and sleeps until that token's time comes. Waiting callers are
+spaced exactly 1/rate apart, so throughput holds at the configured rate
+instead of stampeding when tokens come back.
+
+Limits are (requests per second, burst). Override them with
+UPSTREAM_RATE_LIMITS, e.g. "apps.es.vt.edu=4:8,catalog.vt.edu=1:2", or set it
+to "off" to disable limiting. Hosts not listed are not limited. Where fcntl is
+unavailable (Windows), the buckets are per process.
+
+`rate_limit_stats()` reports this process's waits. Each state file also keeps
+machine-wide totals (acquisitions, waits, seconds waited), which
+`shared_stats()` reads.
+"""
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "apps.es.vt.edu": (2.0, 5.0),              # timetable
+    "selfservice.banner.vt.edu": (4.0, 8.0),   # Banner comments
+    "catalog.vt.edu": (1.0, 2.0),              # course catalog
+}
+RATE_LIMIT_DIR = os.environ.get("RATE_LIMIT_DIR", "")  # default: <tmp>/vt-upstream-ratelimit
+
+# tokens, last refill (epoch s), acquisitions, waits, seconds waited
+_STATE = struct.Struct("<ddQQd")
+
+
+def _parse_limits(value: str) -> Optional[Dict[str, Tuple[float, float]]]:
+    if value.strip().lower() in ("off", "0", "none"):
+        return None
+    limits = dict(DEFAULT_LIMITS)
+    for item in filter(None, (p.strip() for p in value.split(","))):
+        host, _, spec = item.partition("=")
+        rate, _, burst = spec.partition(":")
+        limits[host.strip().lower()] = (float(rate), float(burst or rate))
+    return limits
+
+
+class TokenBucket:
+    """One host's bucket, stored in `path` and shared through flock."""
+
+    def __init__(self, host: str, rate: float, burst: float, path: str) -> None:
+        self.host = host
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.path = path
+        self._thread_lock = threading.Lock()  # stands in for flock where unavailable
+        self._local_state = None
+        self.stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "max_wait": 0.0}
+
+    def _update(self, take) -> Tuple[float, tuple]:
+        """Run `take(state) -> (wait, new_state)` atomically across processes."""
+        if fcntl is None:
+            with self._thread_lock:
+                state = self._local_state or (self.burst, time.time(), 0, 0, 0.0)
+                wait, self._local_state = take(state)
+                return wait, self._local_state
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, _STATE.size, 0)
+            state = _STATE.unpack(raw) if len(raw) == _STATE.size else (self.burst, time.time(), 0, 0, 0.0)
+            wait, state = take(state)
+            os.pwrite(fd, _STATE.pack(*state), 0)
+            return wait, state
+        finally:
+            os.close(fd)  # also releases the lock
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if the bucket is empty. Returns seconds waited."""
+        def take(state):
+            tokens, last, acquired, waits, waited = state
+            now = time.time()
+            tokens = min(self.burst, tokens + max(0.0, now - last) * self.rate) - 1.0
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+            return wait, (tokens, now, acquired + 1, waits + (wait > 0), waited + wait)
+
+        wait, _ = self._update(take)
+        if wait > 0:
+            time.sleep(wait)
+        with self._thread_lock:
+            self.stats["acquired"] += 1
+            if wait > 0:
+                self.stats["waited"] += 1
+                self.stats["wait_seconds"] += wait
+                self.stats["max_wait"] = max(self.stats["max_wait"], wait)
+        return wait
+
+    def shared_stats(self) -> dict:
+        _, (tokens, last, acquired, waits, waited) = self._update(lambda s: (0.0, s))
+        tokens = min(self.burst, tokens + max(0.0, time.time() - last) * self.rate)
+        return {"tokens": round(tokens, 3), "acquired": acquired, "waited": waits,
+                "wait_seconds": round(waited, 3)}
+
+
+_limits = _parse_limits(os.environ.get("UPSTREAM_RATE_LIMITS", ""))
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(host: str) -> Optional[TokenBucket]:
+    host = host.lower()
+    if _limits is None or host not in _limits:
+        return None
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            directory = RATE_LIMIT_DIR
+            if not directory:
+                import tempfile
+                directory = os.path.join(tempfile.gettempdir(), "vt-upstream-ratelimit")
+            os.makedirs(directory, exist_ok=True)
+            rate, burst = _limits[host]
+            bucket = _buckets[host] = TokenBucket(
+                host, rate, burst, os.path.join(directory, f"{host}.bucket"))
+        return bucket
+
+
+def host_of(url: str) -> str:
+    return url.split("://", 1)[-1].split("/", 1)[0].rsplit("@", 1)[-1].split(":", 1)[0]
+
+
+def throttle(url: str) -> float:
+    """Wait for a token for `url`'s host. Returns the seconds waited (0 if unlimited)."""
+    bucket = bucket_for(host_of(url))
+    return bucket.acquire() if bucket else 0.0
+
+
+def rate_limit_stats() -> Dict[str, dict]:
+    """This process's acquisitions and waits per host."""
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+    out = {}
+    for b in buckets:
+        with b._thread_lock:
+            out[b.host] = dict(b.stats, wait_seconds=round(b.stats["wait_seconds"], 3),
+                               max_wait=round(b.stats["max_wait"], 3))
+    return out
+
+
+def shared_stats() -> Dict[str, dict]:
+    """Machine-wide counters per limited host, from the shared state files."""
+    return {host: bucket_for(host).shared_stats() for host in (_limits or {})}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Show shared upstream rate-limit counters.")
+    parser.parse_args()
+    print(json.dumps(shared_stats(), indent=2))
@@ -0,0 +1,206 @@
+"""
+Room and building occupancy timeline for one term.
+
+Aggregates the location of every meeting in a term (from a TermIndex built off
+a full timetable pull) into per-room, per-day interval arrays sorted by start
+time. From those, free slots, double bookings and utilization for every room
+are single linear sweeps, which keeps whole-term reports well under a second.
+
+Locations look like 'MCB 100' or 'TORG 1040'; meetings that are online, TBA or
+arranged have no room and are skipped.
+
+Usage (from backend/):
+    python pythonTimetables/roomOccupancy.py 2026 Spring conflicts --format csv
+    python pythonTimetables/roomOccupancy.py 2026 Spring free --building MCB --day Monday
+"""
+import bisect
+import csv
+import json
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+try:
+    from pythonTimetables.termIndex import TermIndex, get_term_index
+except ModuleNotFoundError:
+    from termIndex import TermIndex, get_term_index
+
+DAY_START = 8 * 60
+DAY_END = 22 * 60
+_NO_ROOM = re.compile(r'^(ONLINE|TBA|ARR|\(ARR\)|NONE|NAN)?$', re.IGNORECASE)
+
+Room = Tuple[str, str]  # (building, room)
+
+
+def parse_location(location) -> Optional[Room]:
+    """'MCB 100' -> ('MCB', '100'); None for online/TBA/empty locations."""
+    if not isinstance(location, str):
+        return None
+    text = " ".join(location.split())
+    if _NO_ROOM.match(text):
+        return None
+    building, _, room = text.rpartition(" ")
+    return (building, room) if building else (text, "")
+
+
+class RoomOccupancy:
+    """Per-room, per-day meeting intervals for a term."""
+
+    def __init__(self) -> None:
+        # (building, room) -> day -> parallel arrays sorted by start
+        self._starts: Dict[Room, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._ends: Dict[Room, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._crns: Dict[Room, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+
+    @classmethod
+    def from_term_index(cls, index: TermIndex) -> "RoomOccupancy":
+        occ = cls()
+        for section in index.sections:
+            for m in section["meetings"]:
+                room = parse_location(m["location"])
+                if room:
+                    occ.add(room, m["day"], m["start"], m["end"], section["crn"])
+        return occ
+
+    def add(self, room: Room, day: str, start: int, end: int, crn: str) -> None:
+        starts = self._starts[room][day]
+        i = bisect.bisect_right(starts, start)
+        starts.insert(i, start)
+        self._ends[room][day].insert(i, end)
+        self._crns[room][day].insert(i, crn)
+
+    # ---------- queries ----------
+
+    def rooms(self, building: str = None) -> List[Room]:
+        return sorted(r for r in self._starts if building is None or r[0] == building.upper())
+
+    def buildings(self) -> List[str]:
+        return sorted({b for b, _ in self._starts})
+
+    def bookings(self, room: Room, day: str) -> List[Tuple[int, int, str]]:
+        return list(zip(self._starts[room][day], self._ends[room][day], self._crns[room][day]))
+
+    def free_slots(self, room: Room, day: str, day_start: int = DAY_START,
+                   day_end: int = DAY_END, min_length: int = 0) -> List[Tuple[int, int]]:
+        """Gaps of at least `min_length` minutes between bookings within [day_start, day_end]."""
+        free = []
+        cursor = day_start
+        for start, end, _ in self.bookings(room, day):
+            if start > cursor and min(start, day_end) - cursor >= max(min_length, 1):
+                free.append((cursor, min(start, day_end)))
+            cursor = max(cursor, end)
+            if cursor >= day_end:
+                break
+        if day_end - cursor >= max(min_length, 1):
+            free.append((cursor, day_end))
+        return free
+
+    def double_bookings(self, room: Room, day: str) -> List[dict]:
+        """
+        Overlapping bookings in a room on a day. Identical time blocks are
+        flagged as `sameBlock`; these are usually cross-listed sections
+        meeting together rather than real conflicts.
+        """
+        out = []
+        # Bookings still running, in start order. Ends are unordered, so the
+        # whole list is filtered at each start; every survivor overlaps.
+        active: List[Tuple[int, int, str]] = []
+        for start, end, crn in self.bookings(room, day):
+            active = [a for a in active if a[1] > start]
+            for a_start, a_end, a_crn in active:
+                out.append({
+                    "building": room[0], "room": room[1], "day": day,
+                    "crns": [a_crn, crn],
+                    "start": max(a_start, start), "end": min(a_end, end),
+                    "sameBlock": (a_start, a_end) == (start, end),
+                })
+            active.append((start, end, crn))
+        return out
+
+    def all_double_bookings(self, include_same_block: bool = True) -> List[dict]:
+        out = []
+        for room in self.rooms():
+            for day in sorted(self._starts[room]):
+                out.extend(b for b in self.double_bookings(room, day)
+                           if include_same_block or not b["sameBlock"])
+        return out
+
+    def utilization(self, day_start: int = DAY_START, day_end: int = DAY_END) -> List[dict]:
+        """Booked minutes (overlaps counted once) per room and day."""
+        out = []
+        for room in self.rooms():
+            for day in sorted(self._starts[room]):
+                booked, cursor = 0, day_start
+                for start, end, _ in self.bookings(room, day):
+                    s, e = max(start, cursor), min(end, day_end)
+                    if e > s:
+                        booked += e - s
+                        cursor = e
+                out.append({"building": room[0], "room": room[1], "day": day,
+                            "bookedMinutes": booked,
+                            "utilization": round(booked / (day_end - day_start), 4)})
+        return out
+
+    def all_free_slots(self, building: str = None, day: str = None, min_length: int = 0) -> List[dict]:
+        out = []
+        for room in self.rooms(building):
+            for d in ([day] if day else sorted(self._starts[room])):
+                for start, end in self.free_slots(room, d, min_length=min_length):
+                    out.append({"building": room[0], "room": room[1], "day": d,
+                                "start": start, "end": end})
+        return out
+
+
+def fmt_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def export_rows(rows: Iterable[dict], out: TextIO, fmt: str = "ndjson") -> None:
+    """Write report rows as NDJSON or CSV ('start'/'end' rendered as HH:MM in CSV)."""
+    rows = list(rows)
+    if fmt == "ndjson":
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+    if not rows:
+        return
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    for row in rows:
+        row = dict(row)
+        for k in ("start", "end"):
+            if isinstance(row.get(k), int):
+                row[k] = fmt_minutes(row[k])
+        if isinstance(row.get("crns"), list):
+            row["crns"] = " ".join(row["crns"])
+        writer.writerow(row)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Room occupancy reports for a term.")
+    parser.add_argument("year")
+    parser.add_argument("semester")
+    parser.add_argument("report", choices=["conflicts", "free", "utilization"])
+    parser.add_argument("--subjects", nargs="*", help="default: the whole term")
+    parser.add_argument("--building")
+    parser.add_argument("--day", help="e.g. Monday (free report only)")
+    parser.add_argument("--min-length", type=int, default=0, help="minimum free slot, minutes")
+    parser.add_argument("--no-same-block", action="store_true",
+                        help="drop identical time blocks (likely cross-listings)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+
+    occupancy = RoomOccupancy.from_term_index(
+        get_term_index(args.year, args.semester, args.subjects, with_pathways=False))
+    if args.report == "conflicts":
+        rows = occupancy.all_double_bookings(include_same_block=not args.no_same_block)
+    elif args.report == "free":
+        rows = occupancy.all_free_slots(args.building, args.day, args.min_length)
+    else:
+        rows = occupancy.utilization()
+    if args.building and args.report != "free":
+        rows = [r for r in rows if r["building"] == args.building.upper()]
+    export_rows(rows, sys.stdout, args.format)
@@ -1,6 +1,10 @@
-import requests
 from bs4 import BeautifulSoup
 
+try:
+    from pythonTimetables.transport import get_transport
+except ModuleNotFoundError:
+    from transport import get_transport
+
 def getAllCSVTCourses():
     """
     Scrape the VT CS catalog and return a list of courses.
@@ -11,7 +15,7 @@ def getAllCSVTCourses():
     }
     """
     url = "https://catalog.vt.edu/undergraduate/course-descriptions/cs/"
-    resp = requests.get(url, timeout=15)
+    resp = get_transport().get(url, timeout=15)
     if resp.status_code != 200:
         raise ConnectionError(f"Failed to fetch catalog page, status code {resp.status_code}")
 
@@ -0,0 +1,241 @@
+"""
+Seat-availability watcher.
+
+Polls the timetable for a set of watched CRNs and reports only what changed.
+Instead of one `Course.has_open_spots` search per CRN, watched CRNs are grouped
+by (year, semester, subject) and each group is polled with a single
+`open_only` timetable query: a CRN in the result is open, a watched CRN missing
+from it is full. Watching 5,000 CRNs therefore costs one request per distinct
+subject per cycle. CRNs listed without a subject are resolved up front from a
+single term-wide pull.
+
+Groups that keep changing are polled at `min_interval`; quiet groups back off
+geometrically up to `max_interval`.
+
+Events are dicts, delivered to a callback or written as NDJSON:
+    {"event": "opened" | "closed" | "capacity_changed",
+     "year": "2026", "semester": "Spring", "subject": "CS", "crn": "13390",
+     "previous": {"open": false, "capacity": null},
+     "current": {"open": true, "capacity": 45},
+     "ts": 1760000000.0}
+
+CLI (from backend/):
+    python pythonTimetables/seatWatcher.py 2026 Spring crns.txt
+where crns.txt has one "CRN" or "CRN SUBJECT" per line.
+"""
+import heapq
+import json
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from pythonTimetables.timeTablesVTT import (
+        Status, clean_int, iter_timetable, parse_semester, searchcrn,
+    )
+except ModuleNotFoundError:
+    from timeTablesVTT import (
+        Status, clean_int, iter_timetable, parse_semester, searchcrn,
+    )
+
+GroupKey = Tuple[str, str, str]  # (year, semester, subject)
+
+
+class SeatWatcher:
+    """
+    Watch CRNs for open/closed and capacity changes.
+
+    Args:
+        on_event: called with each change event dict.
+        min_interval: seconds between polls of a group that just changed.
+        max_interval: upper bound on the poll interval for quiet groups.
+        backoff: factor applied to a group's interval after a quiet poll.
+    """
+
+    def __init__(self, on_event: Callable[[dict], None],
+                 min_interval: float = 30.0, max_interval: float = 600.0,
+                 backoff: float = 1.5) -> None:
+        self._on_event = on_event
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+
+        self._groups: Dict[GroupKey, set] = {}
+        self._intervals: Dict[GroupKey, float] = {}
+        self._snapshot: Dict[Tuple[str, str, str], dict] = {}  # (year, semester, crn) -> state
+        self._schedule: List[Tuple[float, GroupKey]] = []
+        self.requests_made = 0
+
+    def watch(self, year: str, semester: str, crn: str, subject: str = None) -> None:
+        """
+        Add a CRN to the watch list. When `subject` is not given it is
+        resolved once with a CRN search.
+        """
+        semester = parse_semester(semester).name.title()
+        crn = str(crn).strip()
+        if not subject:
+            course = searchcrn(year, semester, crn)
+            self.requests_made += 1
+            if course is None:
+                raise ValueError(f"CRN {crn} not found in {semester} {year}")
+            subject = course.get_subject()
+        key = (str(year), semester, subject.upper())
+
+        if key not in self._groups:
+            self._groups[key] = set()
+            self._intervals[key] = self._min_interval
+            heapq.heappush(self._schedule, (0.0, key))
+        self._groups[key].add(crn)
+
+    def watch_many(self, year: str, semester: str,
+                   entries: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Add (crn, subject-or-None) pairs for one term. Missing subjects are
+        resolved together from one term-wide timetable pull, not one CRN
+        search each.
+        """
+        entries = [(str(crn).strip(), subject) for crn, subject in entries]
+        unresolved = {crn for crn, subject in entries if not subject}
+        if unresolved:
+            subjects = self._resolve_subjects(year, semester, unresolved)
+            missing = sorted(unresolved - subjects.keys())
+            if missing:
+                raise ValueError(f"CRNs not found in {parse_semester(semester).name.title()} "
+                                 f"{year}: {', '.join(missing)}")
+            entries = [(crn, subject or subjects[crn]) for crn, subject in entries]
+        for crn, subject in entries:
+            self.watch(year, semester, crn, subject)
+
+    def _resolve_subjects(self, year: str, semester: str, crns: set) -> Dict[str, str]:
+        """CRN -> subject for `crns`, read from one subject='%' pull."""
+        subjects = {}
+        self.requests_made += 1
+        for course in iter_timetable(year, parse_semester(semester), subject="%"):
+            if course.get_crn() in crns:
+                subjects[course.get_crn()] = course.get_subject()
+                if len(subjects) == len(crns):
+                    break
+        return subjects
+
+    def unwatch(self, year: str, semester: str, crn: str) -> None:
+        semester = parse_semester(semester).name.title()
+        for key, crns in self._groups.items():
+            if key[0] == str(year) and key[1] == semester:
+                crns.discard(str(crn))
+        self._snapshot.pop((str(year), semester, str(crn)), None)
+
+    def poll_group(self, key: GroupKey) -> List[dict]:
+        """Poll one (year, semester, subject) group and emit its change events."""
+        year, semester, subject = key
+        watched = self._groups.get(key)
+        if not watched:
+            return []
+
+        open_sections = iter_timetable(year, parse_semester(semester),
+                                       subject=subject, status=Status.OPEN)
+        self.requests_made += 1
+        open_now = {c.get_crn(): clean_int(c.get_capacity())
+                    for c in open_sections if c.get_crn() in watched}
+
+        now = time.time()
+        events = []
+        for crn in sorted(watched):
+            snap_key = (year, semester, crn)
+            previous = self._snapshot.get(snap_key)
+            is_open = crn in open_now
+            # Full sections drop out of open_only results; keep the last
+            # capacity we saw for them.
+            capacity = open_now[crn] if is_open else (previous or {}).get("capacity")
+            current = {"open": is_open, "capacity": capacity}
+            self._snapshot[snap_key] = current
+
+            if previous is None or previous == current:
+                continue
+            if previous["open"] != is_open:
+                kind = "opened" if is_open else "closed"
+            else:
+                kind = "capacity_changed"
+            events.append({
+                "event": kind,
+                "year": year,
+                "semester": semester,
+                "subject": subject,
+                "crn": crn,
+                "previous": previous,
+                "current": current,
+                "ts": now,
+            })
+
+        if events:
+            self._intervals[key] = self._min_interval
+        else:
+            self._intervals[key] = min(self._intervals[key] * self._backoff,
+                                       self._max_interval)
+        for event in events:
+            self._on_event(event)
+        return events
+
+    def poll_once(self) -> List[dict]:
+        """Poll every group once, ignoring the schedule."""
+        events = []
+        for key in list(self._groups):
+            events.extend(self.poll_group(key))
+        return events
+
+    def run(self, stop: Callable[[], bool] = lambda: False) -> None:
+        """
+        Poll groups as they come due until `stop()` returns True. Upstream
+        errors for one group are reported as "error" events and the group is
+        retried after its current interval.
+        """
+        while self._schedule and not stop():
+            due, key = heapq.heappop(self._schedule)
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            if key not in self._groups:
+                continue
+            try:
+                self.poll_group(key)
+            except Exception as e:
+                self._on_event({"event": "error", "year": key[0], "semester": key[1],
+                                "subject": key[2], "error": str(e), "ts": time.time()})
+            heapq.heappush(self._schedule, (time.time() + self._intervals[key], key))
+
+
+def ndjson_writer(stream=sys.stdout) -> Callable[[dict], None]:
+    """Return an on_event callback that writes one JSON object per line."""
+    def write(event: dict) -> None:
+        stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+        stream.flush()
+    return write
+
+
+def _read_watch_file(path: str) -> List[Tuple[str, Optional[str]]]:
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            entries.append((parts[0], parts[1] if len(parts) > 1 else None))
+    return entries
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Watch CRNs and print seat changes as NDJSON.")
+    parser.add_argument("year")
+    parser.add_argument("semester")
+    parser.add_argument("crn_file", help='lines of "CRN" or "CRN SUBJECT"')
+    parser.add_argument("--min-interval", type=float, default=30.0)
+    parser.add_argument("--max-interval", type=float, default=600.0)
+    args = parser.parse_args()
+
+    watcher = SeatWatcher(ndjson_writer(), args.min_interval, args.max_interval)
+    watcher.watch_many(args.year, args.semester, _read_watch_file(args.crn_file))
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,272 @@
+"""
+In-memory query index over one term's sections.
+
+Answers compound questions such as "3000-level CS sections meeting TR between
+11:00 and 14:00" or "online async options for pathway G02" without another
+timetable search or client-side parsing of `get_schedule()` tuples.
+
+Meeting times are normalized to minutes after midnight and stored per day in
+arrays sorted by start time, so a time-window lookup is two bisects plus a
+scan of the matching slice. Level, subject, modality, section type and
+pathway each have a secondary index (value -> set of section ids), and
+compound filters intersect the smallest sets first.
+
+Example:
+    idx = build_term_index("2026", "Spring", subjects=["CS"])
+    idx.query(subject="CS", level=3000, days="TR", start="11:00", end="14:00")
+    idx.query(modality="ONLINE_ASYNC", pathway="G02")
+"""
+import bisect
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from pythonTimetables.timeTablesVTT import (
+        Course, Day, clean_int, iter_timetable, parse_semester,
+    )
+    from pythonTimetables.parallelParse import search_timetable_parallel
+    from pythonTimetables.pathwayIndex import get_pathway_index
+except ModuleNotFoundError:
+    from timeTablesVTT import (
+        Course, Day, clean_int, iter_timetable, parse_semester,
+    )
+    from parallelParse import search_timetable_parallel
+    from pathwayIndex import get_pathway_index
+
+_DAY_LETTERS = {'M': Day.MONDAY, 'T': Day.TUESDAY, 'W': Day.WEDNESDAY,
+                'R': Day.THURSDAY, 'F': Day.FRIDAY, 'S': Day.SATURDAY, 'U': Day.SUNDAY}
+_TIME_RE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*([AaPp][Mm])?\s*$')
+
+
+def to_minutes(value) -> Optional[int]:
+    """
+    '9:05AM' -> 545, '14:00' -> 840, 840 -> 840. Returns None for
+    unscheduled values such as '(ARR)' or 'TBA'.
+    """
+    if isinstance(value, int):
+        return value
+    m = _TIME_RE.match(str(value))
+    if not m:
+        return None
+    hour, minute, ampm = int(m.group(1)), int(m.group(2)), (m.group(3) or '').upper()
+    if ampm == 'PM' and hour != 12:
+        hour += 12
+    elif ampm == 'AM' and hour == 12:
+        hour = 0
+    return hour * 60 + minute
+
+
+def parse_days(days) -> List[Day]:
+    """'TR' -> [TUESDAY, THURSDAY]; also accepts a list of Day or day names."""
+    if isinstance(days, str):
+        return [_DAY_LETTERS[d] for d in days.upper() if d in _DAY_LETTERS]
+    return [d if isinstance(d, Day) else Day(str(d).title()) for d in days]
+
+
+class TermIndex:
+    """Sections of one term with per-day time arrays and attribute indexes."""
+
+    def __init__(self, year: str, semester: str) -> None:
+        self.year = str(year)
+        self.semester = parse_semester(semester).name.title()
+        self.built_at = time.time()
+        self.sections: List[dict] = []
+        self._by_crn: Dict[str, int] = {}
+        # day -> parallel arrays sorted by start: starts, ends, section ids
+        self._starts: Dict[Day, List[int]] = defaultdict(list)
+        self._ends: Dict[Day, List[int]] = defaultdict(list)
+        self._ids: Dict[Day, List[int]] = defaultdict(list)
+        self._max_len: Dict[Day, int] = defaultdict(int)
+        self._attrs: Dict[str, Dict[object, Set[int]]] = {
+            name: defaultdict(set)
+            for name in ('subject', 'level', 'modality', 'type', 'pathway', 'courseId')
+        }
+        self._pending: List[Tuple[Day, int, int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    # ---------- building ----------
+
+    def add_course(self, course: Course) -> None:
+        """Index one section. Call `finalize()` after the last one."""
+        crn = course.get_crn()
+        if crn in self._by_crn:
+            return
+        meetings = []
+        for day, slots in course.get_schedule().items():
+            for start, end, location in slots:
+                s, e = to_minutes(start), to_minutes(end)
+                if s is not None and e is not None:
+                    meetings.append({"day": day.value, "start": s, "end": e, "location": location})
+        meetings.sort(key=lambda m: (list(Day).index(Day(m["day"])), m["start"]))
+
+        code = course.get_code()
+        record = {
+            "crn": crn,
+            "courseId": f"{course.get_subject()}{code}",
+            "subject": course.get_subject(),
+            "code": code,
+            "name": course.get_name(),
+            "level": (int(code[0]) * 1000) if code[:1].isdigit() else None,
+            "type": course.get_type().name if course.get_type() else None,
+            "modality": course.get_modality().name if course.get_modality() else None,
+            "creditHours": str(course.get_credit_hours()),
+            "capacity": clean_int(course.get_capacity()),
+            "instructor": course.get_professor() if isinstance(course.get_professor(), str) else None,
+            "pathways": [],
+            "meetings": meetings,
+        }
+        sid = len(self.sections)
+        self.sections.append(record)
+        self._by_crn[crn] = sid
+        for attr in ('subject', 'level', 'modality', 'type', 'courseId'):
+            self._attrs[attr][record[attr]].add(sid)
+        for m in meetings:
+            self._pending.append((Day(m["day"]), m["start"], m["end"], sid))
+
+    def tag_pathway(self, pathway: str, crns: Iterable[str]) -> None:
+        """Mark the given CRNs as satisfying `pathway` (e.g. 'G02')."""
+        for crn in crns:
+            sid = self._by_crn.get(crn)
+            if sid is not None and pathway not in self.sections[sid]["pathways"]:
+                self.sections[sid]["pathways"].append(pathway)
+                self._attrs['pathway'][pathway].add(sid)
+
+    def finalize(self) -> "TermIndex":
+        """Merge pending meetings into the sorted per-day arrays."""
+        if self._pending:
+            for day in {p[0] for p in self._pending}:
+                rows = [(s, e, sid) for d, s, e, sid in self._pending if d == day]
+                rows += list(zip(self._starts[day], self._ends[day], self._ids[day]))
+                rows.sort()
+                self._starts[day] = [r[0] for r in rows]
+                self._ends[day] = [r[1] for r in rows]
+                self._ids[day] = [r[2] for r in rows]
+                self._max_len[day] = max(e - s for s, e, _ in rows)
+            self._pending = []
+        self.built_at = time.time()
+        return self
+
+    # ---------- querying ----------
+
+    def _in_window(self, day: Day, start: int, end: int, overlap: bool) -> Set[int]:
+        """Section ids with a meeting on `day` inside (or overlapping) [start, end]."""
+        starts, ends, ids = self._starts[day], self._ends[day], self._ids[day]
+        if overlap:
+            lo = bisect.bisect_left(starts, start - self._max_len[day])
+            hi = bisect.bisect_left(starts, end)
+            return {ids[i] for i in range(lo, hi) if ends[i] > start}
+        lo = bisect.bisect_left(starts, start)
+        hi = bisect.bisect_right(starts, end)
+        return {ids[i] for i in range(lo, hi) if ends[i] <= end}
+
+    def query(self, subject: str = None, level: int = None, course_id: str = None,
+              modality: str = None, section_type: str = None, pathway: str = None,
+              days=None, start=None, end=None, overlap: bool = False,
+              exact_days: bool = False, limit: int = None) -> List[dict]:
+        """
+        Return sections matching every given filter, ordered by course and CRN.
+
+        Args:
+            subject, level, course_id: e.g. 'CS', 3000, 'CS3114'.
+            modality, section_type: enum names, e.g. 'ONLINE_ASYNC', 'LECTURE'.
+            pathway: pathway code, e.g. 'G02' (needs tag_pathway data).
+            days: e.g. 'TR'; the section must meet on each of them within the
+                window (or at any time, if no window is given).
+            start, end: window bounds ('11:00', '2:00PM' or minutes).
+            overlap: match meetings that overlap the window instead of
+                lying entirely inside it.
+            exact_days: require the section to meet on exactly `days`.
+        """
+        candidates: List[Set[int]] = []
+        for attr, value in (('subject', subject and subject.upper()), ('level', level),
+                            ('courseId', course_id and course_id.upper()),
+                            ('modality', modality), ('type', section_type),
+                            ('pathway', pathway)):
+            if value is not None:
+                candidates.append(self._attrs[attr].get(value, set()))
+
+        wanted_days = parse_days(days) if days else []
+        if start is not None or end is not None:
+            lo = to_minutes(start) if start is not None else 0
+            hi = to_minutes(end) if end is not None else 24 * 60
+            for day in (wanted_days or list(Day)):
+                candidates.append(self._in_window(day, lo, hi, overlap))
+            if not wanted_days:
+                # any day: union rather than intersection
+                candidates[-len(Day):] = [set().union(*candidates[-len(Day):])]
+        elif wanted_days:
+            for day in wanted_days:
+                candidates.append(set(self._ids[day]))
+
+        if candidates:
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for other in candidates[1:]:
+                result &= other
+                if not result:
+                    break
+        else:
+            result = set(range(len(self.sections)))
+
+        if exact_days and wanted_days:
+            names = {d.value for d in wanted_days}
+            result = {sid for sid in result
+                      if {m["day"] for m in self.sections[sid]["meetings"]} == names}
+
+        rows = sorted((self.sections[sid] for sid in result),
+                      key=lambda r: (r["courseId"], r["crn"]))
+        return rows[:limit] if limit else rows
+
+    def get(self, crn: str) -> Optional[dict]:
+        sid = self._by_crn.get(str(crn))
+        return self.sections[sid] if sid is not None else None
+
+
+def build_term_index(year: str, semester: str, subjects: List[str] = None,
+                     sections: Iterable[Course] = None, with_pathways: bool = True) -> TermIndex:
+    """
+    Build a TermIndex from a timetable pull: one query per subject, or one
+    term-wide query (parsed on the process pool) when `subjects` is None.
+    Pass `sections` to index already-fetched Course objects instead. With
+    `with_pathways`, sections are tagged from the term's pathway index
+    (one term-wide query per pathway code, shared with course lookups).
+    """
+    sem = parse_semester(semester)
+    index = TermIndex(year, semester)
+    if sections is None and not subjects:
+        sections = search_timetable_parallel(year, sem)
+    if sections is None:
+        for subject in subjects:
+            for course in iter_timetable(year, sem, subject=subject):
+                index.add_course(course)
+    else:
+        for course in sections:
+            index.add_course(course)
+    index.finalize()
+
+    if with_pathways:
+        for code, crns in get_pathway_index(year, semester).crns.items():
+            index.tag_pathway(code, crns)
+    return index
+
+
+_indexes: Dict[Tuple[str, str, tuple, bool], TermIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_term_index(year: str, semester: str, subjects: List[str] = None,
+                   max_age: float = 900.0, with_pathways: bool = True) -> TermIndex:
+    """Return a cached TermIndex for the term, rebuilding it after `max_age` seconds."""
+    key = (str(year), parse_semester(semester).name, tuple(sorted(subjects or [])), with_pathways)
+    with _indexes_lock:
+        index = _indexes.get(key)
+    if index is None or time.time() - index.built_at > max_age:
+        index = build_term_index(year, semester, subjects, with_pathways=with_pathways)
+        with _indexes_lock:
+            _indexes[key] = index
+    return index
@@ -0,0 +1,71 @@
+"""
+Shared fixtures for the pythonTimetables tests.
+
+Run from backend/:
+    python -m pytest -q pythonTimetables/tests
+
+No test touches the network: upstream calls go to a FakeTransport (the
+default transport is an empty replay archive, so an unfaked request fails
+with ReplayMiss), and the seed files (known courses, subjects,
+cross-listings, pathway index) point at paths that don't exist.
+"""
+import os
+import sys
+
+import pytest
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
+
+# Read at import time by the modules under test, so set before they load.
+_SANDBOX = os.path.join(_BACKEND_DIR, "pythonTimetables", "tests", ".missing")
+os.environ["TIMETABLE_CACHE_DIR"] = ""
+os.environ["TIMETABLE_KNOWN_COURSES"] = os.path.join(_SANDBOX, "known_courses.json")
+os.environ["TIMETABLE_SUBJECTS"] = os.path.join(_SANDBOX, "subjects.json")
+os.environ["TIMETABLE_CROSS_LISTINGS"] = os.path.join(_SANDBOX, "cross_listings.json")
+os.environ["TIMETABLE_PATHWAY_INDEX_DIR"] = os.path.join(_SANDBOX, "pathway_index")
+os.environ["TIMETABLE_TRANSPORT"] = "replay:" + os.path.join(_SANDBOX, "archive.json")
+
+from pythonTimetables import timeTablesVTT  # noqa: E402
+from pythonTimetables.transport import Response, Transport, use_transport  # noqa: E402
+
+
+class FakeTransport(Transport):
+    """
+    Answers timetable POSTs from `pages` (keyed by subj_code) and records
+    every request. `handler`, when given, is called first and may block,
+    raise or return the page text itself.
+    """
+
+    def __init__(self, pages: dict = None, handler=None) -> None:
+        self.pages = dict(pages or {})
+        self.handler = handler
+        self.calls = []
+
+    def request(self, method, url, data=None, timeout=None):
+        self.calls.append((method, dict(data or {})))
+        if self.handler is not None:
+            text = self.handler(method, url, data)
+            if text is not None:
+                return Response(200, text, url)
+        if method == "POST":
+            return Response(200, self.pages.get(data.get("subj_code"), ""), url)
+        return Response(200, "", url)
+
+
+@pytest.fixture
+def fake_transport():
+    """A FakeTransport installed process-wide for the test."""
+    with use_transport(FakeTransport()) as transport:
+        yield transport
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Start each test with empty lookup caches."""
+    for cache in timeTablesVTT._swr_caches.values():
+        cache.clear()
+    yield
+    for cache in timeTablesVTT._swr_caches.values():
+        cache.clear()
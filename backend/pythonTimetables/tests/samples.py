@@ -0,0 +1,43 @@
+"""Small timetable samples: section rows and the results page that holds them."""
+from html import escape
+
+from pythonTimetables.timeTablesVTT import Course, Semester
+
+NAN = float("nan")
+HEADER = ["CRN", "Course", "Title", "Schedule Type", "Modality", "Cr Hrs", "Capacity",
+          "Instructor", "Days", "Begin", "End", "Location", "Exam"]
+
+
+def section(crn, course_id, days="M W F", begin="9:05AM", end="9:55AM",
+            location="MCB 100", name=None, instructor="Smith", capacity="40",
+            section_type="L", modality="Face-to-Face Instruction"):
+    """One section row, as `_iter_timetable_rows` yields it."""
+    subject, code = course_id[:-4], course_id[-4:]
+    return [crn, f"{subject}-{code}", name or f"Course {course_id}", section_type,
+            modality, "3", capacity, instructor, days, begin, end, location, "13T"]
+
+
+def additional_times(days, begin, end, location):
+    """The continuation row Banner prints under a section with a second meeting."""
+    return [NAN, NAN, NAN, NAN, "* Additional Times *", NAN, NAN, NAN,
+            days, begin, end, location, NAN]
+
+
+def course(crn, course_id, *, extra=None, **kwargs):
+    return Course("2026", Semester.SPRING, section(crn, course_id, **kwargs), extra)
+
+
+def _cell(value):
+    return "<td></td>" if value != value else f"<td>{escape(value)}</td>"
+
+
+def timetable_page(rows):
+    """
+    A results page laid out like the real one: four layout tables, then the
+    results table with a <th> header and a label row that the parsers skip.
+    """
+    layout = "".join(f"<table><tr><td>layout {i}</td></tr></table>" for i in range(4))
+    header = "<tr>" + "".join(f"<th>{h}</th>" for h in HEADER) + "</tr>"
+    label = '<tr><td colspan="13">Sections</td></tr>'
+    body = "".join("<tr>" + "".join(_cell(v) for v in row) + "</tr>\n" for row in rows)
+    return f"<html><body>{layout}<table>{header}{label}{body}</table></body></html>"
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from pythonTimetables import courseJson as cj
+from pythonTimetables import crossListings
+from pythonTimetables import timeTablesVTT as t
+from pythonTimetables.crossListings import CrossListings, save_cross_listings
+
+from samples import section, timetable_page
+
+CS_PAGE = timetable_page([
+    section("13390", "CS2114", name="Software Design"),
+    section("13391", "CS2114", name="Software Design", days="T R"),
+    section("13392", "CS3114", name="Data Structures"),
+    section("13393", "CS3414", name="Numerical Methods"),
+])
+BANNER_PAGE = (
+    '<table><tr><td class="pllabel">Prerequisites:</td>'
+    '<td class="pldefault">CS 1114 (MIN grade of C)</td></tr></table>'
+)
+
+
+@pytest.fixture
+def upstream(fake_transport, monkeypatch):
+    """Timetable pages for CS, a Banner page for every GET; counts both."""
+    fake_transport.pages["CS"] = CS_PAGE
+    fake_transport.handler = lambda method, url, data: BANNER_PAGE if method == "GET" else None
+    # The pandas parser is checked against this one in test_timetable_rows.
+    monkeypatch.setattr(t, "_parse_timetable",
+                        lambda html, year, semester: list(t._iter_courses(html, year, semester)))
+    monkeypatch.setattr(cj, "_cache", cj.EncodedCache(directory=""))
+    return fake_transport
+
+
+def _counts(transport):
+    posts = [data["subj_code"] for method, data in transport.calls if method == "POST"]
+    return posts, sum(method == "GET" for method, _ in transport.calls)
+
+
+def test_spellings_of_one_course_are_looked_up_once(upstream):
+    ids = ["CS2114", "cs-2114", "CS 2114", "CS3114", "bogus"]
+
+    results = t.searchIDDataBatch(ids)
+
+    assert list(results) == ids
+    assert _counts(upstream) == (["CS"], 2)  # one page, one Banner fetch per course
+    assert [results[i]["courseId"] for i in ids[:4]] == ids[:4]
+    assert {results[i]["name"] for i in ids[:3]} == {"Software Design"}
+    assert results["cs-2114"]["prerequisites"] == [["CS1114"]]
+    assert results["CS3114"]["name"] == "Data Structures"
+    assert "error" in results["bogus"]
+
+
+def test_cross_listings_share_one_lookup(upstream, tmp_path, monkeypatch):
+    year, semester = t._get_next_semester()
+    path = str(tmp_path / "cross_listings.json")
+    save_cross_listings(CrossListings([["CS3414", "MATH3414"]],
+                                      term=t.term_code(year, t.parse_semester(semester))), path)
+    monkeypatch.setattr(crossListings, "CROSS_LISTINGS_PATH", path)
+    monkeypatch.setattr(crossListings, "_loaded", None)
+
+    results = t.searchIDDataBatch(["MATH3414", "CS3414"])
+
+    assert _counts(upstream) == (["CS"], 1)
+    math, cs = results["MATH3414"], results["CS3414"]
+    assert (math["subject"], math["code"], math["crossListed"]) == ("MATH", "MATH3414", ["CS3414"])
+    assert (cs["subject"], cs["code"], cs["crossListed"]) == ("CS", "CS3414", ["MATH3414"])
+    assert math["name"] == cs["name"] == "Numerical Methods"
+
+
+def test_name_and_credits_need_no_banner(upstream):
+    results = t.searchIDDataBatch(["CS2114", "CS3114"], fields=["name", "creditHours"])
+
+    assert _counts(upstream) == (["CS"], 0)
+    assert set(results["CS2114"]) == {"year", "semester", "courseId", "subject", "code",
+                                      "name", "creditHours", "freshness"}
+
+
+def _states(data):
+    return {k: v.get("cache", {}).get("state") for k, v in json.loads(data).items()}
+
+
+def test_batch_and_single_lookups_share_the_encoded_cache(upstream):
+    assert _states(cj.searchIDDataBatchJSON(["CS2114", "CS9999"])) == \
+        {"CS2114": "miss", "CS9999": "miss"}
+    # An unoffered course is stored as a negative entry.
+    assert cj._cache.lookup(cj._id_data_key("CS9999"))[2] is True
+
+    calls = len(upstream.calls)
+    assert json.loads(cj.searchIDDataJSON("cs-2114"))["cache"]["state"] == "fresh"
+    assert len(upstream.calls) == calls
+    assert json.loads(cj.searchIDDataJSON("CS3114"))["cache"]["state"] == "miss"
+
+    # Without the timetable and Banner caches, only the encoded entries can
+    # keep the batch from going upstream.
+    for cache in t._swr_caches.values():
+        cache.clear()
+    calls = len(upstream.calls)
+    assert _states(cj.searchIDDataBatchJSON(["CS3114", "CS2114", "CS9999"])) == \
+        {"CS3114": "fresh", "CS2114": "fresh", "CS9999": "fresh"}
+    assert len(upstream.calls) == calls
+
+
+def test_invalid_ids_are_reported_not_cached(upstream):
+    out = json.loads(cj.searchIDDataBatchJSON(["CS2114", "not a course"]))
+
+    assert "error" in out["not a course"] and "cache" not in out["not a course"]
+    assert out["CS2114"]["cache"]["state"] == "miss"
@@ -0,0 +1,141 @@
+import json
+import time
+
+import pytest
+
+from pythonTimetables import courseJson as cj
+from pythonTimetables.timeTablesVTT import Day, EmptyResult, Modality
+
+RESULT = {
+    "courseId": "CS2114",
+    "name": "Software Design & Data Structures — Ä",
+    "capacity": float("nan"),
+    "modality": Modality.HYBRID,
+    "pathways": {"G01"},
+    "crossListed": ("ECE2574",),
+    "schedule": [
+        {"day": Day.WEDNESDAY, "start": "2:30PM", "end": "3:20PM", "location": "MCB 200"},
+        {"day": Day.MONDAY, "start": "9:05AM", "end": "9:55AM", "location": "MCB 100"},
+        {"day": Day.MONDAY, "start": "11:15AM", "end": "12:05PM", "location": "MCB 100"},
+    ],
+}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = cj.EncodedCache(maxsize=8, ttl=10, stale_ttl=100, directory="", negative_ttl=50)
+    monkeypatch.setattr(cj, "_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cj, "time", clock)
+    return clock
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_canonical_encoding():
+    data = cj.encode(RESULT)
+
+    assert data == (
+        '{"courseId":"CS2114","name":"Software Design & Data Structures — Ä",'
+        '"capacity":null,"modality":"HYBRID","pathways":["G01"],"crossListed":["ECE2574"],'
+        '"schedule":[{"day":"Monday","start":"11:15AM","end":"12:05PM","location":"MCB 100"},'
+        '{"day":"Monday","start":"9:05AM","end":"9:55AM","location":"MCB 100"},'
+        '{"day":"Wednesday","start":"2:30PM","end":"3:20PM","location":"MCB 200"}]}'
+    ).encode("utf-8")
+    shuffled = dict(RESULT, schedule=list(reversed(RESULT["schedule"])))
+    assert cj.encode(shuffled) == data
+
+
+def test_numpy_scalars_become_numbers():
+    np = pytest.importorskip("numpy")
+
+    assert cj.encode({"capacity": np.int64(40), "credits": np.float64(3.0)}) == \
+        b'{"capacity":40,"credits":3.0}'
+
+
+def test_cache_state_is_spliced_in():
+    assert json.loads(cj._with_cache_state(b'{"a":1}', "fresh", 12.3456)) == \
+        {"a": 1, "cache": {"state": "fresh", "storedAt": 12.346}}
+    assert cj._with_cache_state(b"{}", "miss", None) == b'{"cache":{"state":"miss","storedAt":null}}'
+
+
+def _state(data):
+    return json.loads(data)["cache"]["state"]
+
+
+def test_fresh_stale_and_fallback(cache, clock):
+    key = ("202601", "id-CS2114-1")
+    values = iter([{"v": 1}, {"v": 2}])
+
+    assert _state(cj._cached(key, lambda: next(values))) == "miss"
+    clock.now += 5
+    assert _state(cj._cached(key, lambda: pytest.fail("served from cache"))) == "fresh"
+
+    clock.now += 10
+    stale = cj._cached(key, lambda: next(values))
+    assert (_state(stale), json.loads(stale)["v"]) == ("stale", 1)
+    _wait_for(lambda: cache.stats["refreshes"] == 1)
+    assert json.loads(cj._cached(key, lambda: pytest.fail("served from cache")))["v"] == 2
+
+    clock.now += 500
+
+    def down():
+        raise ConnectionError("down")
+
+    fallback = cj._cached(key, down)
+    assert (_state(fallback), json.loads(fallback)["v"]) == ("fallback", 2)
+
+
+def test_results_with_upstream_errors_are_not_stored(cache, clock):
+    key = ("202601", "id-CS2114-1")
+    failed = {"v": 1, "freshness": {"banner": {"state": "error", "fetchedAt": None}}}
+
+    cj._cached(key, lambda: failed)
+
+    assert cache.lookup(key) is None
+
+
+def test_empty_results_use_the_negative_ttl(cache, clock):
+    found, missing = ("202601", "id-CS2114-1"), ("202601", "id-CS9999-1")
+    cj._cached(found, lambda: {"courseId": "CS2114", "sections": ["13390"]})
+    cj._cached(missing, lambda: EmptyResult(courseId="CS9999"))
+    clock.now += 30
+
+    assert _state(cj._cached(found, lambda: {"courseId": "CS2114"})) == "stale"
+    assert _state(cj._cached(missing, lambda: pytest.fail("served from cache"))) == "fresh"
+    assert cache.stats["negative_hits"] == 1
+    # A non-empty result that merely looks empty is not negative.
+    assert cache.lookup(found)[2] is False and cache.lookup(missing)[2] is True
+
+
+def test_disk_entries_keep_the_empty_flag(tmp_path):
+    key = ("202601", "id-CS9999-1")
+    writer = cj.EncodedCache(directory=str(tmp_path), ttl=10, negative_ttl=50)
+    writer.put(key, b'{"courseId":"CS9999"}', empty=True)
+
+    # A new process: nothing in memory, the file is read back.
+    reader = cj.EncodedCache(directory=str(tmp_path), ttl=10, negative_ttl=50)
+    data, _, empty = reader.lookup(key)
+
+    assert (data, empty) == (b'{"courseId":"CS9999"}', True)
+    assert reader.stats["disk_hits"] == 1
+    with pytest.raises(ValueError):
+        reader.lookup(("../etc", "passwd"))
@@ -0,0 +1,69 @@
+from pythonTimetables import crossListings
+from pythonTimetables.crossListings import (
+    CrossListings, canonical_course_id, detect_cross_listings, save_cross_listings,
+)
+
+from samples import course
+
+TR_NOON = dict(days="T R", begin="12:30PM", end="1:45PM", location="MCB 113", instructor="Lee")
+
+
+def test_same_meetings_and_number_under_two_subjects():
+    groups = detect_cross_listings([
+        course("10001", "CS3414", **TR_NOON),
+        course("10002", "MATH3414", **TR_NOON),
+        course("10003", "CS3114", days="M W F", instructor="Lee"),
+    ])
+
+    assert groups == [["CS3414", "MATH3414"]]
+
+
+def test_stacked_courses_are_not_joined():
+    # CS4824 / CS5824 share the room and time, but are different courses.
+    assert detect_cross_listings([
+        course("20001", "CS4824", **TR_NOON),
+        course("20002", "CS5824", **TR_NOON),
+    ]) == []
+
+
+def test_unplaced_sections_have_no_signature():
+    online = dict(days="(ARR)", begin="-----", end="-----", location="ONLINE", instructor="Staff")
+    assert detect_cross_listings([
+        course("30001", "CS4984", **online),
+        course("30002", "ECE4984", **online),
+    ]) == []
+
+
+def test_groups_are_transitive():
+    # CS3304 ~ ECE3304 by a shared CRN, ECE3304 ~ MATH3304 by their meetings.
+    groups = detect_cross_listings([
+        course("40001", "CS3304", days="M W", begin="8:00AM", end="9:15AM", location="A"),
+        course("40001", "ECE3304", **TR_NOON),
+        course("40003", "MATH3304", **TR_NOON),
+        course("40004", "STAT3304", days="T R", begin="8:00AM", end="9:15AM", location="B"),
+    ])
+
+    assert groups == [["CS3304", "ECE3304", "MATH3304"]]
+
+
+def test_canonical_ids_and_aliases():
+    listings = CrossListings([["MATH3414", "CS3414"]], term="202601")
+
+    assert listings.canonical("math 3414") == "CS3414"
+    assert listings.canonical("CS3114") == "CS3114"
+    assert listings.aliases("MATH3414") == ["CS3414"]
+    assert listings.aliases("CS3114") == []
+    assert listings.same("CS-3414", "MATH3414")
+
+
+def test_stored_map_is_used_only_for_its_term(tmp_path, monkeypatch):
+    path = str(tmp_path / "cross_listings.json")
+    monkeypatch.setattr(crossListings, "CROSS_LISTINGS_PATH", path)
+    monkeypatch.setattr(crossListings, "_loaded", None)
+
+    assert canonical_course_id("MATH3414", "202601") == "MATH3414"
+    save_cross_listings(CrossListings([["CS3414", "MATH3414"]], term="202601"), path)
+
+    assert canonical_course_id("MATH3414", "202601") == "CS3414"
+    assert canonical_course_id("MATH3414", "202609") == "MATH3414"
+    assert crossListings.cross_listings().groups == [["CS3414", "MATH3414"]]
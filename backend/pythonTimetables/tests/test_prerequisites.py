@@ -0,0 +1,97 @@
+import itertools
+
+import pytest
+
+from pythonTimetables.timeTablesVTT import (
+    _MAX_CNF_CLAUSES, _parse_prerequisites, parse_prerequisite_expression,
+)
+
+# Banner prerequisite strings -> (parsed tree, CNF from _parse_prerequisites)
+CASES = [
+    ("CS 1944 (MIN grade of P), (CS 2114 (MIN grade of C) or ECE 3514) (MIN grade of C), "
+     "(COMM 2004 or COMM 2014)",
+     "(CS1944[>=P] and (CS2114[>=C] or ECE3514)[>=C] and (COMM2004 or COMM2014))",
+     [["CS1944"], ["CS2114", "ECE3514"], ["COMM2004", "COMM2014"]]),
+    ("(CS 2114 (MIN grade of C) or ECE 3514) and MATH 2534",
+     "((CS2114[>=C] or ECE3514) and MATH2534)",
+     [["CS2114", "ECE3514"], ["MATH2534"]]),
+    ("MATH 1225, MATH 1226, or MATH 2204",
+     "(MATH1225 or MATH1226 or MATH2204)",
+     [["MATH1225", "MATH1226", "MATH2204"]]),
+    ("((CS 1114 and CS 1944) or ECE 1574) and MATH 1226",
+     "(((CS1114 and CS1944) or ECE1574) and MATH1226)",
+     [["CS1114", "ECE1574"], ["CS1944", "ECE1574"], ["MATH1226"]]),
+    ("CS 3114 and (MATH 2534 or MATH 3034) and Junior standing",
+     "(CS3114 and (MATH2534 or MATH3034) and Junior standing)",
+     [["CS3114"], ["MATH2534", "MATH3034"]]),
+    ("AP Calculus AB 4 or MATH 1225", "(AB4 or MATH1225)", [["AB4", "MATH1225"]]),
+    ("CS 3214 (may be taken concurrently)", "CS3214[co]", [["CS3214"]]),
+    ("CS 3114 Prerequisites Enforced: Yes", "CS3114", [["CS3114"]]),
+    ("CS 2505 or (CS 2506", "(CS2505 or CS2506)", [["CS2505", "CS2506"]]),
+    ("Junior standing", "Junior standing", []),
+]
+
+
+@pytest.mark.parametrize("text, tree, cnf", CASES)
+def test_parse(text, tree, cnf):
+    assert repr(parse_prerequisite_expression(text)) == tree
+    assert _parse_prerequisites(text) == cnf
+
+
+@pytest.mark.parametrize("text", ["", None, "  "])
+def test_no_requirement(text):
+    assert parse_prerequisite_expression(text) is None
+    assert _parse_prerequisites(text) == []
+
+
+def _satisfies(node, done):
+    if node.kind in ("course", "test"):
+        return node.code in done
+    if node.kind == "text":
+        return True
+    results = [_satisfies(c, done) for c in node.children]
+    return all(results) if node.kind == "and" else any(results)
+
+
+@pytest.mark.parametrize("text", [case[0] for case in CASES])
+def test_cnf_agrees_with_the_tree(text):
+    """Every set of completed courses satisfies the CNF iff it satisfies the tree."""
+    tree = parse_prerequisite_expression(text)
+    cnf = _parse_prerequisites(text)
+    codes = tree.codes()
+    for n in range(len(codes) + 1):
+        for done in map(set, itertools.combinations(codes, n)):
+            assert _satisfies(tree, done) == all(any(c in done for c in g) for g in cnf), done
+
+
+def test_annotations():
+    tree = parse_prerequisite_expression("CS 2114 (MIN grade of C) and MATH 2114 (may be taken concurrently)")
+
+    assert tree.to_dict() == {"type": "and", "children": [
+        {"type": "course", "code": "CS2114", "minGrade": "C"},
+        {"type": "course", "code": "MATH2114", "concurrent": True},
+    ]}
+
+
+def test_cnf_expansion_is_capped():
+    # Seven 2-way ANDs under an OR expand to 2**7 clauses; past the cap the
+    # requirement falls back to one OR of every code.
+    pairs = [f"(CS {1000 + i} and MATH {1000 + i})" for i in range(7)]
+    text = " or ".join(pairs)
+    assert 2 ** 7 > _MAX_CNF_CLAUSES
+
+    cnf = _parse_prerequisites(text)
+
+    assert cnf == [parse_prerequisite_expression(text).codes()]
+    assert len(cnf[0]) == 14
+
+
+def test_results_are_not_shared_between_calls():
+    text = "(CS 2114 or ECE 3514) and MATH 2534"
+
+    tree = parse_prerequisite_expression(text)
+    tree.children[0].min_grade = "A"
+    _parse_prerequisites(text)[0].append("CS9999")
+
+    assert repr(parse_prerequisite_expression(text)) == "((CS2114 or ECE3514) and MATH2534)"
+    assert _parse_prerequisites(text) == [["CS2114", "ECE3514"], ["MATH2534"]]
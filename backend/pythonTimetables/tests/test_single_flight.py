@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+
+from pythonTimetables import timeTablesVTT as t
+
+PAGE = "<html>CS sections</html>"
+REQUEST = {"CAMPUS": t.Campus.BLACKSBURG, "TERMYEAR": "202601", "subj_code": "CS"}
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.001)
+
+
+def _run_concurrently(n, target):
+    results, errors = [None] * n, [None] * n
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def _gate(fake_transport):
+    """Make the fake block every request until the returned event is set."""
+    release = threading.Event()
+
+    def handler(method, url, data):
+        release.wait(5)
+        return None
+
+    fake_transport.pages["CS"] = PAGE
+    fake_transport.handler = handler
+    return release
+
+
+def test_concurrent_identical_requests_share_one_upstream_call(fake_transport):
+    release = _gate(fake_transport)
+    flight = t._make_request.single_flight
+    before = dict(flight.stats)
+
+    threads, results, errors = _run_concurrently(8, lambda: t._make_request("POST", REQUEST))
+    _wait_for(lambda: flight.stats["collapsed"] - before["collapsed"] == 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [None] * 8
+    assert results == [PAGE] * 8
+    assert len(fake_transport.calls) == 1
+    assert flight.stats["executions"] - before["executions"] == 1
+
+
+def test_enum_and_raw_values_are_the_same_request(fake_transport):
+    release = _gate(fake_transport)
+    raw = dict(REQUEST, CAMPUS=t.Campus.BLACKSBURG.value)
+    flight = t._make_request.single_flight
+    collapsed = flight.stats["collapsed"]
+
+    threads, results, _ = _run_concurrently(1, lambda: t._make_request("POST", REQUEST))
+    _wait_for(lambda: len(fake_transport.calls) == 1)
+    more, more_results, _ = _run_concurrently(1, lambda: t._make_request("POST", raw))
+    _wait_for(lambda: flight.stats["collapsed"] == collapsed + 1)
+    release.set()
+    for thread in threads + more:
+        thread.join()
+
+    assert results + more_results == [PAGE, PAGE]
+    assert len(fake_transport.calls) == 1
+
+
+def test_different_requests_are_not_coalesced(fake_transport):
+    fake_transport.pages.update({"CS": PAGE, "MATH": "<html>MATH</html>"})
+
+    assert t._make_request("POST", REQUEST) == PAGE
+    assert t._make_request("POST", dict(REQUEST, subj_code="MATH")) == "<html>MATH</html>"
+    assert len(fake_transport.calls) == 2
+
+
+def test_error_is_shared_and_not_remembered(fake_transport):
+    release = threading.Event()
+    failing = [True]
+
+    def handler(method, url, data):
+        release.wait(5)
+        if failing[0]:
+            raise ConnectionError("upstream down")
+        return PAGE
+
+    fake_transport.handler = handler
+    flight = t._make_request.single_flight
+    collapsed = flight.stats["collapsed"]
+
+    threads, results, errors = _run_concurrently(4, lambda: t._make_request("POST", REQUEST))
+    _wait_for(lambda: flight.stats["collapsed"] - collapsed == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(e, ConnectionError) for e in errors)
+    assert len(fake_transport.calls) == 1
+
+    # Completed calls leave nothing behind: the next caller goes upstream.
+    failing[0] = False
+    assert t._make_request("POST", REQUEST) == PAGE
+    assert len(fake_transport.calls) == 2
+
+
+def test_followers_get_their_own_copy():
+    flight = t._SingleFlight("test")
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        return {"sections": [1, 2]}
+
+    threads, results, _ = _run_concurrently(3, lambda: flight.do(("key",), fetch))
+    _wait_for(lambda: flight.stats["collapsed"] == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    results[0]["sections"].append(3)
+    assert [r["sections"] for r in results[1:]] == [[1, 2], [1, 2]]
+    assert flight.stats == {"calls": 3, "executions": 1, "collapsed": 2}
+
+
+def test_async_callers_coalesce_with_each_other():
+    flight = t._SingleFlight("test-async")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return ["page"]
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async(("key",), fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == [["page"]] * 5
+    assert len(calls) == 1
@@ -0,0 +1,189 @@
+import threading
+import time
+
+import pytest
+
+from pythonTimetables import timeTablesVTT as t
+
+
+class Clock:
+    """Stands in for the `time` module inside timeTablesVTT."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class Upstream:
+    def __init__(self, *values) -> None:
+        self.values = list(values)
+        self.calls = 0
+        self.gate = None
+
+    def __call__(self, key):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(t, "time", clock)
+    return clock
+
+
+def _cache(**kwargs):
+    return t._SWRCache("test", soft_ttl=10, stale_ttl=100, maxsize=8, **kwargs)
+
+
+def _get(cache, upstream, key="k"):
+    with t.collect_freshness() as freshness:
+        value = cache.get((key,), upstream, key)
+    return value, freshness.get("test", {}).get("state")
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_fresh_stale_expired(clock):
+    cache = _cache()
+    upstream = Upstream(["v1"], ["v2"], ["v3"])
+
+    assert _get(cache, upstream) == (["v1"], "fresh")
+    clock.now += 5
+    assert _get(cache, upstream) == (["v1"], "fresh")
+    assert upstream.calls == 1
+
+    # Past the soft TTL: the old value now, a background refresh for later.
+    clock.now += 10
+    assert _get(cache, upstream) == (["v1"], "stale")
+    _wait_for(lambda: cache.stats["refreshes"] == 1)
+    assert _get(cache, upstream) == (["v2"], "fresh")
+    assert upstream.calls == 2
+
+    # Past the stale window: fetched inline.
+    clock.now += 150
+    assert _get(cache, upstream) == (["v3"], "fresh")
+    assert upstream.calls == 3
+    assert cache.stats["misses"] == 2
+
+
+def test_one_refresh_per_stale_key(clock):
+    cache = _cache()
+    upstream = Upstream(["v1"], ["v2"])
+    _get(cache, upstream)
+    clock.now += 20
+    upstream.gate = threading.Event()
+
+    assert [_get(cache, upstream) for _ in range(3)] == [(["v1"], "stale")] * 3
+    upstream.gate.set()
+    _wait_for(lambda: cache.stats["refreshes"] == 1)
+    assert upstream.calls == 2
+
+
+def test_failed_refresh_keeps_serving_the_stale_value(clock):
+    cache = _cache()
+    upstream = Upstream(["v1"], ConnectionError("down"))
+    _get(cache, upstream)
+    clock.now += 20
+
+    assert _get(cache, upstream) == (["v1"], "stale")
+    _wait_for(lambda: cache.stats["refresh_errors"] == 1)
+    assert _get(cache, upstream) == (["v1"], "stale")
+
+
+def test_expired_value_is_the_fallback_for_an_upstream_error(clock):
+    cache = _cache()
+    upstream = Upstream(["v1"], ConnectionError("down"), ["v2"])
+    _get(cache, upstream)
+    clock.now += 500
+
+    assert _get(cache, upstream) == (["v1"], "fallback")
+    # The failure wasn't stored: the next call goes upstream again.
+    assert _get(cache, upstream) == (["v2"], "fresh")
+    assert upstream.calls == 3
+
+
+def test_error_without_a_fallback(clock):
+    cache = _cache()
+    upstream = Upstream(ConnectionError("down"), ["v1"])
+
+    with t.collect_freshness() as freshness:
+        with pytest.raises(ConnectionError):
+            cache.get(("k",), upstream, "k")
+    assert freshness["test"]["state"] == "error"
+    assert _get(cache, upstream) == (["v1"], "fresh")
+
+
+def test_bad_requests_are_never_masked(clock):
+    cache = _cache()
+    upstream = Upstream(["v1"], t.InvalidSearchException("no such subject"))
+    _get(cache, upstream)
+    clock.now += 500
+
+    with pytest.raises(t.InvalidSearchException):
+        cache.get(("k",), upstream, "k")
+
+
+def test_negative_ttl_for_empty_values(clock):
+    cache = _cache(negative_ttl=60)
+    upstream = Upstream("", ["v1"], "")
+    other = Upstream(["x1"], ["x2"])
+
+    assert _get(cache, upstream) == ("", "fresh")
+    assert _get(cache, other, "other") == (["x1"], "fresh")
+    clock.now += 30
+    # An empty answer is still fresh; a non-empty one is stale.
+    assert _get(cache, upstream) == ("", "fresh")
+    assert _get(cache, other, "other") == (["x1"], "stale")
+    assert cache.stats["negative"] == 1
+    assert upstream.calls == 1
+
+
+def test_callers_get_copies(clock):
+    cache = _cache()
+    upstream = Upstream({"sections": [1]})
+
+    first, _ = _get(cache, upstream)
+    first["sections"].append(2)
+
+    assert _get(cache, upstream) == ({"sections": [1]}, "fresh")
+
+
+def test_lru_bound(clock):
+    cache = t._SWRCache("test", soft_ttl=10, stale_ttl=100, maxsize=2)
+    upstream = Upstream(*[[i] for i in range(5)])
+    for key in "abc":
+        _get(cache, upstream, key)
+
+    assert _get(cache, upstream, "a") == ([3], "fresh")
+    assert upstream.calls == 4
+
+
+def test_timetable_lookups_go_through_the_cache(clock, fake_transport):
+    fake_transport.pages["CS"] = "<html>CS</html>"
+    request = {"TERMYEAR": "202601", "subj_code": "CS"}
+
+    with t.collect_freshness() as freshness:
+        pages = [t._make_request_cached("POST", request) for _ in range(3)]
+
+    assert pages == ["<html>CS</html>"] * 3
+    assert len(fake_transport.calls) == 1
+    assert freshness["timetable"]["state"] == "fresh"
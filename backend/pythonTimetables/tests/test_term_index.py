@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from pythonTimetables.termIndex import TermIndex, parse_days, to_minutes
+from pythonTimetables.timeTablesVTT import Modality
+
+from samples import additional_times, course
+
+
+def _index(*courses):
+    index = TermIndex("2026", "Spring")
+    for c in courses:
+        index.add_course(c)
+    return index.finalize()
+
+
+def _crns(rows):
+    return sorted(r["crn"] for r in rows)
+
+
+@pytest.mark.parametrize("value, minutes", [
+    ("9:05AM", 545), ("12:00PM", 720), ("12:30AM", 30), ("2:00PM", 840),
+    ("14:00", 840), (" 8:00 am ", 480), (840, 840), ("(ARR)", None), ("TBA", None),
+])
+def test_to_minutes(value, minutes):
+    assert to_minutes(value) == minutes
+
+
+def test_window_contains_or_overlaps():
+    index = _index(
+        course("10001", "CS3114", days="T R", begin="11:00AM", end="12:15PM"),
+        course("10002", "CS3214", days="T R", begin="10:10AM", end="11:25AM"),
+        course("10003", "CS1114", days="M W F", begin="9:05AM", end="9:55AM"),
+        course("10004", "CS4114", days="T", begin="8:00AM", end="12:00PM"),
+        course("10005", "CS2114", days="T R", begin="9:30AM", end="11:00AM"),
+    )
+
+    inside = index.query(days="TR", start="11:00", end="14:00")
+    assert _crns(inside) == ["10001"]
+    # A long meeting starting well before the window is still found.
+    overlapping = index.query(days="T", start="11:00", end="14:00", overlap=True)
+    assert _crns(overlapping) == ["10001", "10002", "10004"]
+    # Any day: a union over days, not an intersection.
+    assert _crns(index.query(start="9:00AM", end="10:00AM")) == ["10003"]
+
+
+def test_additional_times_are_indexed():
+    lab = course("20001", "CHEM1035", days="M W", begin="9:05AM", end="9:55AM",
+                 extra=additional_times("F", "2:30PM", "5:15PM", "DAV 250"))
+    index = _index(lab)
+
+    assert _crns(index.query(days="F", start="2:00PM", end="6:00PM")) == ["20001"]
+    assert [m["day"] for m in index.get("20001")["meetings"]] == ["Monday", "Wednesday", "Friday"]
+
+
+def test_exact_days_and_unscheduled_sections():
+    index = _index(
+        course("30001", "CS3114", days="T R", begin="11:00AM", end="12:15PM"),
+        course("30002", "CS3214", days="T R F", begin="11:00AM", end="12:15PM"),
+        course("30003", "CS4984", days="(ARR)", begin="-----", end="-----", location="ONLINE"),
+    )
+
+    assert _crns(index.query(days="TR")) == ["30001", "30002"]
+    assert _crns(index.query(days="TR", exact_days=True)) == ["30001"]
+    assert index.get("30003")["meetings"] == []
+    assert _crns(index.query(subject="cs", level=4000)) == ["30003"]
+
+
+def test_attribute_filters_intersect():
+    index = _index(
+        course("40001", "CS3114"),
+        course("40002", "CS3114", modality="Online: Asynchronous"),
+        course("40003", "MATH3114", modality="Online: Asynchronous"),
+    )
+    index.tag_pathway("G05", ["40002", "40003"])
+
+    assert _crns(index.query(course_id="CS3114")) == ["40001", "40002"]
+    assert _crns(index.query(modality=Modality.ONLINE_ASYNC.name, subject="CS")) == ["40002"]
+    assert _crns(index.query(pathway="G05", level=3000)) == ["40002", "40003"]
+    assert index.query(pathway="G01") == []
+
+
+def test_bisect_lookup_matches_a_linear_scan():
+    rng = random.Random(7)
+    courses = []
+    for i in range(300):
+        start = rng.randrange(7 * 60, 20 * 60, 5)
+        length = rng.choice([50, 75, 110, 165, 240])
+        days = " ".join(rng.sample("MTWRF", rng.randint(1, 3)))
+        courses.append(course(str(50000 + i), f"CS{1000 + i}", days=days,
+                              begin=f"{start // 60}:{start % 60:02d}",
+                              end=f"{(start + length) // 60}:{(start + length) % 60:02d}"))
+    index = _index(*courses)
+
+    for _ in range(200):
+        lo = rng.randrange(6 * 60, 22 * 60, 5)
+        hi = lo + rng.randrange(0, 300, 5)
+        day = rng.choice("MTWRF")
+        for overlap in (False, True):
+            expected = sorted(
+                r["crn"] for r in index.sections
+                if any(m["day"] == parse_days(day)[0].value and
+                       ((m["start"] < hi and m["end"] > lo) if overlap
+                        else (lo <= m["start"] and m["end"] <= hi))
+                       for m in r["meetings"]))
+            assert _crns(index.query(days=day, start=lo, end=hi, overlap=overlap)) == expected
+
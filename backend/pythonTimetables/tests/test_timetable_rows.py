@@ -0,0 +1,100 @@
+import pytest
+
+from pythonTimetables.timeTablesVTT import (
+    Day, Semester, _iter_courses, _iter_timetable_rows, _parse_timetable, clean_int,
+    iter_timetable,
+)
+
+from samples import additional_times, section, timetable_page
+
+ROWS = [
+    section("13390", "CS1114", name="Intro to Software Design"),
+    section("13391", "CS2114", days="T R", begin="11:00AM", end="12:15PM",
+            name="Software Design & Data Structures"),
+    additional_times("W", "2:30PM", "3:20PM", "MCB 200"),
+    section("13392", "CS4984", days="(ARR)", begin="-----", end="-----", location="ONLINE",
+            section_type="ONLINE COURSE", modality="Online: Asynchronous", instructor="Staff"),
+]
+
+
+def _plain(row):
+    return [None if v != v else v for v in row]
+
+
+def test_rows_of_the_results_table():
+    rows = list(_iter_timetable_rows(timetable_page(ROWS)))
+
+    assert [_plain(r) for r in rows] == [_plain(r) for r in ROWS]
+
+
+def test_markup_variations():
+    page = (
+        "<table></table>" * 4 +
+        "<table><tr><th>CRN<th>Course</table>"  # header only; a different table
+    )
+    assert list(_iter_timetable_rows(page)) == []
+
+    page = ("<table></table>" * 4 + '<TABLE class="dataentrytable">'
+            "<tr><th>CRN</th><th>Course</th></tr>"
+            "<tr><td>label</td></tr>"
+            "<tr><td><b>13390</b><td>CS-1114<td colspan=2>A &amp; B\nC"  # no </td>, </tr>
+            "<tr><td><table><tr><td>nested</td></tr></table>13391</td><td></td></tr>"
+            "</TABLE>")
+    rows = [_plain(r) for r in _iter_timetable_rows(page)]
+
+    assert rows == [
+        ["13390", "CS-1114", "A & B C", "A & B C"] + [None] * 9,
+        ["nested13391", None] + [None] * 11,
+    ]
+
+
+def test_skip_header_and_table_index():
+    page = "<table><tr><td>a</td></tr><tr><td>b</td></tr></table>" + timetable_page(ROWS[:1])
+
+    assert [r[0] for r in _iter_timetable_rows(page, table_index=0, skip_header=False)] == ["a", "b"]
+    assert [r[0] for r in _iter_timetable_rows(page, table_index=5)] == ["13390"]
+
+
+def test_courses_pair_additional_times():
+    courses = list(_iter_courses(timetable_page(ROWS), "2026", Semester.SPRING))
+
+    assert [c.get_crn() for c in courses] == ["13390", "13391", "13392"]
+    assert courses[1].get_name() == "Software Design & Data Structures"
+    assert courses[1].get_schedule() == {
+        Day.TUESDAY: {("11:00AM", "12:15PM", "MCB 100")},
+        Day.THURSDAY: {("11:00AM", "12:15PM", "MCB 100")},
+        Day.WEDNESDAY: {("2:30PM", "3:20PM", "MCB 200")},
+    }
+    assert courses[2].get_schedule() == {}
+
+
+def test_iter_timetable_streams_the_page(fake_transport):
+    fake_transport.pages["CS"] = timetable_page(ROWS)
+    fake_transport.pages["ZZZ"] = ("There was a problem with your request "
+                                   "NO SECTIONS FOUND FOR THIS INQUIRY")
+
+    assert [c.get_crn() for c in iter_timetable("2026", Semester.SPRING, subject="CS")] == \
+        ["13390", "13391", "13392"]
+    assert list(iter_timetable("2026", Semester.SPRING, subject="ZZZ")) == []
+    assert fake_transport.calls[0][1]["TERMYEAR"] == "202601"
+
+
+def _comparable(course):
+    data = dict(course._course_data)
+    # pandas infers numbers; the streaming parser keeps the page text
+    data["capacity"] = clean_int(data["capacity"])
+    data["credit_hours"] = str(data["credit_hours"])
+    return data
+
+
+def test_matches_the_pandas_parser():
+    pytest.importorskip("pandas")
+    pytest.importorskip("lxml")
+    page = timetable_page(ROWS)
+
+    expected = [_comparable(c) for c in _parse_timetable(page, "2026", Semester.SPRING)]
+    streamed = [_comparable(c) for c in _iter_courses(page, "2026", Semester.SPRING)]
+
+    assert streamed == expected
+    assert len(expected) == 3
+
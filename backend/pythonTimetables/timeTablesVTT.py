@@ -1,16 +1,29 @@
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from enum import Enum
 import re
-from typing import Dict, List, Set, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
 from io import StringIO
 
-from pandas import read_html
-import pandas.core.series
-import requests
-
+import contextlib
+import contextvars
+import copy
 import functools
+import math
+import os
+import threading
 import time
 
+# pandas and requests dominate interpreter startup, and most bridge calls only
+# touch one of them (or neither, on a cache hit).  They are imported on the
+# code paths that need them instead of at module load; see checkImportTime.py.
+if TYPE_CHECKING:
+    import pandas.core.series
+
+try:
+    from pythonTimetables.transport import get_transport
+except ModuleNotFoundError:
+    from transport import get_transport
+
 '''
 
 
@@ -59,9 +72,9 @@ class Pathway(Enum):
     PATH_1F = 'G01F'
     PATH_2 = 'G02'
     PATH_3 = 'G03'
-    PATH_4 = 'G02'
-    PATH_5A = 'G02'
-    PATH_5F = 'G02'
+    PATH_4 = 'G04'
+    PATH_5A = 'G05A'
+    PATH_5F = 'G05F'
     PATH_6A = 'G06A'
     PATH_6D = 'G06D'
     PATH_7 = 'G07'
@@ -111,8 +124,8 @@ class Course:
     }
 
     def __init__(self, year: str, semester: Semester,
-                 timetable_data: pandas.core.series.Series,
-                 extra_class_data: pandas.core.series.Series) -> None:
+                 timetable_data: 'pandas.core.series.Series',
+                 extra_class_data: 'pandas.core.series.Series') -> None:
         subject, code = re.match(r'(.+)-(.+)', timetable_data[1]).group(1, 2)
 
         if semester == Semester.SUMMER:
@@ -157,11 +170,10 @@ class Course:
             'schedule': dict(class_dct),
         }
 
-        # Cache Banner request result once
-        self._banner_info = make_banner_request(
-            self.get_crn(), self.get_year(), self.get_semester(),
-            self.get_subject(), self.get_code()
-        )
+        # Banner request result, fetched on first use and cached once.
+        # Search results can hold hundreds of sections, most of which never
+        # have their prerequisites or comments read.
+        self._banner_info = None
 
     def __str__(self):
         return ''.join(f'{d}: {self._course_data[d]}, ' for d in self._course_data)[:-2]
@@ -207,14 +219,22 @@ class Course:
                                         crn=self.get_crn(),
                                         status=Status.OPEN) else False
 
+    def _get_banner_info(self) -> Dict[str, str]:
+        if self._banner_info is None:
+            self._banner_info = make_banner_request(
+                self.get_crn(), self.get_year(), self.get_semester(),
+                self.get_subject(), self.get_code()
+            )
+        return self._banner_info
+
     def get_prerequisites(self) -> str:
-        return self._banner_info["prerequisites"]
+        return self._get_banner_info()["prerequisites"]
 
     def get_catalog_description(self) -> str:
-        return self._banner_info["catalog_description"]
+        return self._get_banner_info()["catalog_description"]
 
     def get_comments(self) -> str:
-        return self._banner_info["comments"]
+        return self._get_banner_info()["comments"]
 
 
 class InvalidRequestException(Exception):
@@ -225,6 +245,404 @@ class InvalidSearchException(Exception):
     pass
 
 
+class _InFlight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _SingleFlight:
+    """
+    Collapse concurrent identical calls into one upstream call.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait for it and share its result or
+    exception. Followers get a deep copy so a caller mutating its result
+    can't affect the others. Nothing is cached once the call completes.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._in_flight: Dict[tuple, _InFlight] = {}
+        self._async_in_flight: Dict[tuple, object] = {}  # (loop id, key) -> asyncio.Future
+        self.stats = {"calls": 0, "executions": 0, "collapsed": 0}
+
+    def do(self, key: tuple, func, *args, **kwargs):
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _InFlight()
+                self.stats["executions"] += 1
+            else:
+                self.stats["collapsed"] += 1
+
+        if leader:
+            try:
+                call.result = func(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result if leader else copy.deepcopy(call.result)
+
+    async def do_async(self, key: tuple, func, *args, **kwargs):
+        """
+        asyncio variant: coroutines on the same loop share one in-flight
+        future, and the leader runs `func` in a worker thread through `do`,
+        so it also coalesces with threaded callers.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        pending = self._async_in_flight.get(loop_key)
+        if pending is not None:
+            with self._lock:
+                self.stats["calls"] += 1
+                self.stats["collapsed"] += 1
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        pending = self._async_in_flight[loop_key] = loop.create_future()
+        # Retrieve the exception so a leader-only failure isn't logged as unhandled.
+        pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            result = await asyncio.to_thread(self.do, key, func, *args, **kwargs)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(result)
+            return result
+        finally:
+            del self._async_in_flight[loop_key]
+
+
+_single_flights: Dict[str, _SingleFlight] = {}
+
+
+def _single_flight(key_func, name: str = None):
+    """
+    Decorator: coalesce concurrent calls whose `key_func(*args, **kwargs)`
+    match. The wrapped function gains `.run_async(...)` for asyncio callers.
+    Passing the name of an existing group shares it between functions.
+    """
+    def decorator(func):
+        group = name or func.__name__
+        flight = _single_flights.setdefault(group, _SingleFlight(group))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return flight.do(key_func(*args, **kwargs), func, *args, **kwargs)
+
+        async def run_async(*args, **kwargs):
+            return await flight.do_async(key_func(*args, **kwargs), func, *args, **kwargs)
+
+        wrapper.run_async = run_async
+        wrapper.single_flight = flight
+        return wrapper
+    return decorator
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Per-function coalescing counters: calls, upstream executions, and calls
+    collapsed onto an in-flight execution.
+    """
+    out = {}
+    for name, flight in _single_flights.items():
+        with flight._lock:
+            out[name] = dict(flight.stats)
+    return out
+
+
+def _normalize_course_id(course_id: str) -> str:
+    m = re.fullmatch(r'([A-Za-z]+)\s*[-:]?\s*(\d{4})', str(course_id).strip())
+    return f"{m.group(1).upper()}{m.group(2)}" if m else str(course_id).strip()
+
+
+def _normalize_semester(semester) -> str:
+    try:
+        return parse_semester(semester).name
+    except (TypeError, ValueError):
+        return str(semester)
+
+
+def _request_key(request_type: str, request_data: Dict[str, str] = None) -> tuple:
+    items = tuple(sorted(
+        (k, v.value if isinstance(v, Enum) else v) for k, v in (request_data or {}).items()
+    ))
+    return (request_type, items)
+
+
+# Stale-while-revalidate caching of upstream responses.  Within the soft TTL a
+# cached response is served as is; between the soft TTL and STALE_TTL it is
+# served immediately while one background thread refetches it; past that the
+# fetch is inline.  A failed fetch falls back to the last good response of any
+# age, and failures themselves are never stored.
+TIMETABLE_SOFT_TTL = float(os.environ.get("TIMETABLE_SOFT_TTL", "120"))
+# "No sections found" answers change rarely; they are kept this long instead.
+TIMETABLE_NEGATIVE_TTL = float(os.environ.get("TIMETABLE_NEGATIVE_TTL", "1800"))
+BANNER_SOFT_TTL = float(os.environ.get("BANNER_SOFT_TTL", "3600"))
+STALE_TTL = float(os.environ.get("TIMETABLE_STALE_TTL", "86400"))
+FANOUT_WORKERS = int(os.environ.get("TIMETABLE_FANOUT_WORKERS", "8"))
+
+# Deterministic answers to a bad request; a cached value for the same key
+# would not be a better answer, so these are raised rather than masked.
+_NO_FALLBACK = (InvalidRequestException, InvalidSearchException, ValueError)
+
+_FRESHNESS_ORDER = {"fresh": 0, "stale": 1, "fallback": 2, "error": 3}
+_freshness: "contextvars.ContextVar[Optional[dict]]" = contextvars.ContextVar(
+    "freshness", default=None)
+
+
+def _record_freshness(name: str, state: str, fetched_at: Optional[float]) -> None:
+    """Note how fresh the `name` data used by the current lookup is (worst state wins)."""
+    parts = _freshness.get()
+    if parts is None:
+        return
+    prev = parts.get(name)
+    if prev is not None:
+        if _FRESHNESS_ORDER[prev["state"]] > _FRESHNESS_ORDER[state]:
+            state = prev["state"]
+        if prev["fetchedAt"] is not None:
+            fetched_at = prev["fetchedAt"] if fetched_at is None else min(fetched_at, prev["fetchedAt"])
+    parts[name] = {"state": state,
+                   "fetchedAt": round(fetched_at, 3) if fetched_at is not None else None}
+
+
+@contextlib.contextmanager
+def collect_freshness():
+    """
+    Collect, for the upstream calls made inside the block, a dict
+    {source: {"state", "fetchedAt"}} where state is 'fresh', 'stale'
+    (served while a refresh runs), 'fallback' (last good value after an
+    upstream error) or 'error' (nothing to fall back to).
+    """
+    token = _freshness.set({})
+    try:
+        yield _freshness.get()
+    finally:
+        _freshness.reset(token)
+
+
+def _reports_freshness(func):
+    """Decorator: add the collected freshness dict to a lookup's result."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with collect_freshness() as freshness:
+            result = func(*args, **kwargs)
+        if isinstance(result, dict):
+            result["freshness"] = freshness
+        return result
+    return wrapper
+
+
+class _Budget:
+    """
+    A lookup's latency budget in seconds (None: no limit). With a limit,
+    `submit` starts a sub-fetch on its own thread and `get` waits for it at
+    most until the deadline. A fetch that misses the deadline is left on a
+    daemon thread: in a long-lived process it still fills the caches for
+    the next lookup, and a one-shot bridge process exits without waiting for
+    it. Its part of the result is left empty and flagged in `complete`.
+    Without a limit `submit` runs the fetch inline, as the lookups always
+    did.
+    """
+
+    def __init__(self, seconds: Optional[float]) -> None:
+        self.at = None if seconds is None else time.monotonic() + max(0.0, float(seconds))
+        self.complete: Dict[str, bool] = {}
+
+    def submit(self, func, *args, **kwargs):
+        from concurrent.futures import Future
+
+        future = Future()
+        if self.at is None:
+            try:
+                future.set_result((func(*args, **kwargs), None))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        def run():
+            # Own freshness dict: a fetch finishing after the lookup returned
+            # must not change the result it was reported in.
+            with collect_freshness() as parts:
+                try:
+                    value = func(*args, **kwargs)
+                except Exception as e:
+                    future.set_exception(e)
+                    return
+            future.set_result((value, parts))
+
+        threading.Thread(target=contextvars.copy_context().run, args=(run,),
+                         name="lookup-part", daemon=True).start()
+        return future
+
+    def get(self, part: str, future, default=None):
+        """`future`'s value, or `default` if it misses the deadline."""
+        from concurrent.futures import TimeoutError as FutureTimeout
+
+        timeout = None if self.at is None else max(0.0, self.at - time.monotonic())
+        try:
+            value, parts = future.result(timeout)
+        except FutureTimeout:
+            self.complete[part] = False
+            return default
+        for name, info in (parts or {}).items():
+            _record_freshness(name, info["state"], info["fetchedAt"])
+        self.complete[part] = True
+        return value
+
+    def report(self, result: dict) -> dict:
+        """Add the "completeness" flags to `result` when there is a limit."""
+        if self.at is not None:
+            result["completeness"] = self.complete
+        return result
+
+
+class _SWRCache:
+    """
+    Stale-while-revalidate cache for one upstream source (see above). Empty
+    values (no results) use `negative_ttl`, when given, as their soft TTL.
+    """
+
+    def __init__(self, name: str, soft_ttl: float, stale_ttl: float, maxsize: int,
+                 negative_ttl: float = None) -> None:
+        self.name = name
+        self.soft_ttl = soft_ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = max(stale_ttl, soft_ttl, negative_ttl or 0)
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Tuple[object, float]]" = OrderedDict()
+        self._refreshing: Set[tuple] = set()
+        self.stats = {"fresh": 0, "stale": 0, "negative": 0, "misses": 0, "fallbacks": 0,
+                      "refreshes": 0, "refresh_errors": 0}
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _store(self, key: tuple, value) -> float:
+        fetched_at = time.time()
+        with self._lock:
+            self._entries[key] = (value, fetched_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return fetched_at
+
+    def get(self, key: tuple, func, *args, **kwargs):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            negative = self.negative_ttl is not None and not value
+            if age < self.stale_ttl:
+                state = "fresh" if age < (self.negative_ttl if negative else self.soft_ttl) else "stale"
+                self._count(state)
+                if negative:
+                    self._count("negative")
+                if state == "stale":
+                    self._refresh(key, func, args, kwargs)
+                _record_freshness(self.name, state, fetched_at)
+                return copy.deepcopy(value)
+
+        self._count("misses")
+        try:
+            value = func(*args, **kwargs)
+        except _NO_FALLBACK:
+            raise
+        except Exception:
+            if entry is None:
+                _record_freshness(self.name, "error", None)
+                raise
+            self._count("fallbacks")
+            _record_freshness(self.name, "fallback", entry[1])
+            return copy.deepcopy(entry[0])
+        _record_freshness(self.name, "fresh", self._store(key, value))
+        return copy.deepcopy(value)
+
+    def _refresh(self, key: tuple, func, args: tuple, kwargs: dict) -> None:
+        """Refetch `key` on a background thread, unless one is already doing so."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        args, kwargs = copy.deepcopy((args, kwargs))
+
+        def run():
+            try:
+                self._store(key, func(*args, **kwargs))
+                self._count("refreshes")
+            except Exception:
+                self._count("refresh_errors")  # keep serving the stale value
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"swr-{self.name}", daemon=True).start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_swr_caches: Dict[str, _SWRCache] = {}
+
+
+def _stale_while_revalidate(key_func, name: str, soft_ttl: float,
+                            stale_ttl: float = STALE_TTL, maxsize: int = 512,
+                            negative_ttl: float = None):
+    """
+    Decorator: serve `func` through a stale-while-revalidate cache keyed by
+    `key_func(*args, **kwargs)`. The wrapped function must raise on upstream
+    errors rather than return an error value, so errors are never cached.
+    """
+    def decorator(func):
+        cache = _swr_caches.setdefault(
+            name, _SWRCache(name, soft_ttl, stale_ttl, maxsize, negative_ttl))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache.get(key_func(*args, **kwargs), func, *args, **kwargs)
+
+        wrapper.swr_cache = cache
+        return wrapper
+    return decorator
+
+
+def swr_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Per-source counters: fresh and stale hits (and how many of those were
+    cached empty results), misses, fallbacks to the last good value, and
+    background refreshes (and their failures).
+    """
+    out = {}
+    for name, cache in _swr_caches.items():
+        with cache._lock:
+            out[name] = dict(cache.stats, entries=len(cache._entries))
+    return out
+
+
 def parse_semester(sem_str: str) -> Semester:
     """
     Convert a human string like 'Spring', 'summer', 'FALL', 'Winter' to Semester enum.
@@ -245,6 +663,17 @@ def parse_semester(sem_str: str) -> Semester:
         raise ValueError(f"Unknown semester: {sem_str!r}. Expected one of Spring/Summer/Fall/Winter.")
 
 
+def parse_year(year) -> str:
+    """
+    Validate a four-digit year ('2026'). Years reach cache keys and file
+    paths, so anything else is rejected rather than cleaned up.
+    """
+    year = str(year).strip()
+    if not re.fullmatch(r'\d{4}', year):
+        raise ValueError(f"Invalid year: {year!r}. Expected four digits, e.g. '2026'.")
+    return year
+
+
 def make_banner_request(crn: str, year: str, semester: Semester,
                         subject: str, code: str) -> Dict[str, str]:
     """
@@ -257,7 +686,7 @@ def make_banner_request(crn: str, year: str, semester: Semester,
             f"CRN={crn}&TERM={semester.value}&YEAR={year}"
             f"&SUBJ={subject}&CRSE={code}&history=N"
         )
-        response = requests.get(url, timeout=10)
+        response = get_transport().get(url, timeout=10)
         response.raise_for_status()
         html = response.text
 
@@ -295,19 +724,36 @@ def searchcrn(year: str, semester: str, crn: str) -> Course:
     crn_search = search_timetable(year, parse_semester(semester), crn=crn)
     return crn_search[0] if crn_search else None
 
-def searchCRNData(year: str, semester: str, crn: str) -> dict:
+@_single_flight(lambda year, semester, crn, deadline=None, fields=None: (
+    str(year), _normalize_semester(semester), str(crn).strip(), deadline,
+    _fields_key(fields, _CRN_FIELDS)))
+@_reports_freshness
+def searchCRNData(year: str, semester: str, crn: str, deadline: float = None,
+                  fields=None) -> dict:
     """
     Return a JSON-serializable dict with all data about the class for a given CRN.
-    Shape harmonizes with searchID where reasonable.
+    Shape harmonizes with searchID where reasonable. With a `deadline` in
+    seconds, Banner and pathways are fetched concurrently once the section
+    is found, and whatever is done by then is returned. A `fields`
+    projection (see searchIDData) skips Banner and pathways when they are
+    not asked for.
 
     Keys:
       year, semester, courseId, subject, code, name, creditHours,
-      prerequisites, catalogDescription, comments, pathways, sections[]
+      prerequisites, catalogDescription, comments, pathways, sections[],
+      freshness (see `collect_freshness`), and with a deadline completeness
+      {sections, pathways, banner: bool}
     """
     sem = parse_semester(semester)
-    course = searchcrn(year, semester, crn)
+    fields = parse_fields(fields, _CRN_FIELDS)
+
+    budget = _Budget(deadline)
+    crn_search = budget.get("sections", budget.submit(
+        lambda: _parse_timetable(_timetable_html(year, sem, crn=str(crn).strip(), cached=True),
+                                 year, sem)), [])
+    course = crn_search[0] if crn_search else None
     if course is None:
-        return {
+        return budget.report(_project(EmptyResult({
             "year": year,
             "semester": semester,
             "courseId": None,
@@ -320,7 +766,7 @@ def searchCRNData(year: str, semester: str, crn: str) -> dict:
             "comments": None,
             "pathways": [],
             "sections": [],
-        }
+        }), fields))
 
     # Build schedule list as in searchID
     sched_list = []
@@ -334,18 +780,22 @@ def searchCRNData(year: str, semester: str, crn: str) -> dict:
             })
 
     # Banner data (cached)
-    banner = _banner_comments_cached(
+    banner_part = budget.submit(
+        _banner_comments_cached,
         course.get_crn(),
         course.get_year(),
         course.get_semester().value if hasattr(course.get_semester(), "value") else str(course.get_semester()),
         course.get_subject(),
         course.get_code()
-    )
+    ) if _wants(fields, _BANNER_FIELDS) else None
 
     # Optional: pathways via subject+code for this single course
-    pathways = _get_pathways_for_course(year, sem, course.get_subject(), course.get_code())
+    pathways = budget.get("pathways", budget.submit(
+        _get_pathways_for_course, year, sem, course.get_subject(), course.get_code()),
+        []) if _wants(fields, ("pathways",)) else []
+    banner = budget.get("banner", banner_part, {}) if banner_part else {}
 
-    return {
+    return budget.report(_project({
         "year": course.get_year(),
         "semester": semester,
         "courseId": f"{course.get_subject()}{course.get_code()}",
@@ -363,7 +813,30 @@ def searchCRNData(year: str, semester: str, crn: str) -> dict:
         "capacity": course.get_capacity(),
         "instructor": course.get_professor(),
         "schedule": sched_list,
-    }
+    }, fields))
+
+def term_code(year: str, semester: Semester) -> str:
+    """
+    Return the timetable's TERMYEAR code for a term, e.g. ('2026', FALL) -> '202609'.
+    Winter terms are filed under the previous calendar year.
+    """
+    return ((str(int(year) - 1) if semester == Semester.WINTER else str(year))
+            + semester.value)
+
+
+def clean_int(value) -> Optional[int]:
+    """
+    Coerce a timetable cell (str, int, or pandas float/NaN) to int, or None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return None if math.isnan(value) else int(value)
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
 
 def get_semesters() -> Set[Tuple[str, str]]:
     semester_dct = {'Spring': Semester.SPRING, 'Summer': Semester.SUMMER,
@@ -386,23 +859,138 @@ def search_timetable(year: str, semester: Semester,
                      code: str = '', crn: str = '',
                      status: Status = Status.ALL,
                      modality: Modality = Modality.ALL) -> List[Course]:
-    term_year = ((str(int(year) - 1) if semester == Semester.WINTER else year)
-                 + semester.value)
-    subject = '%' if subject == '' else subject
-    request = _make_request(request_type='POST',
-                            request_data={'CAMPUS': campus,
-                                          'TERMYEAR': term_year,
-                                          'CORE_CODE': pathway,
-                                          'subj_code': subject,
-                                          'SCHDTYPE': section_type,
-                                          'CRSE_NUMBER': code,
-                                          'crn': crn,
-                                          'open_only': status,
-                                          'sess_code': modality})
-    if request == '':
+    request = _timetable_html(year, semester, campus, pathway, subject,
+                              section_type, code, crn, status, modality)
+    return _parse_timetable(request, year, semester)
+
+
+def parse_enum_values(enum_cls, values) -> Tuple[Enum, ...]:
+    """
+    Members of `enum_cls` from names or values, e.g. 'blacksburg,virtual' or
+    ['IN_PERSON', 'H'] -> (Modality.IN_PERSON, Modality.HYBRID). A comma
+    separated string, a single value and members are accepted too.
+    """
+    if values is None:
+        return ()
+    if isinstance(values, (str, Enum)):
+        values = values.split(',') if isinstance(values, str) else [values]
+    members = []
+    for value in values:
+        if isinstance(value, enum_cls):
+            members.append(value)
+            continue
+        text = str(value).strip()
+        if not text:
+            continue
+        member = enum_cls.__members__.get(text.upper().replace('-', '_').replace(' ', '_'))
+        if member is None:
+            member = next((m for m in enum_cls if m.value == text), None)
+        if member is None:
+            raise ValueError(f"Unknown {enum_cls.__name__}: {text!r}. "
+                             f"Expected one of {', '.join(enum_cls.__members__)}.")
+        members.append(member)
+    return tuple(dict.fromkeys(members))
+
+
+def _fanout_queries(campuses, modalities, section_types) -> List[Tuple[Campus, Modality, SectionType]]:
+    """
+    The (campus, modality, section type) queries a fan-out needs. An ALL
+    modality or section type already covers the others, so it replaces them.
+    """
+    campuses = parse_enum_values(Campus, campuses) or (Campus.BLACKSBURG,)
+    modalities = parse_enum_values(Modality, modalities) or (Modality.ALL,)
+    section_types = parse_enum_values(SectionType, section_types) or (SectionType.ALL,)
+    if Modality.ALL in modalities:
+        modalities = (Modality.ALL,)
+    if SectionType.ALL in section_types:
+        section_types = (SectionType.ALL,)
+    return [(c, m, t) for c in campuses for m in modalities for t in section_types]
+
+
+def search_timetable_fanout(year: str, semester: Semester,
+                            campuses=(Campus.BLACKSBURG,),
+                            modalities=(Modality.ALL,),
+                            section_types=(SectionType.ALL,),
+                            pathway: Pathway = Pathway.ALL, subject: str = '',
+                            code: str = '', crn: str = '',
+                            status: Status = Status.ALL,
+                            cached: bool = False, limit: int = None) -> List[Course]:
+    """
+    `search_timetable` over every combination of `campuses`, `modalities`
+    and `section_types` (members, names or values), with the queries run
+    concurrently on up to TIMETABLE_FANOUT_WORKERS threads. Sections are
+    merged in query order and de-duplicated by CRN, so a section matched by
+    several queries is listed once.
+
+    With `limit`, each page is parsed lazily and only up to its first
+    `limit` sections (cells as page text, as in `iter_timetable`), for
+    callers that only read the first section.
+
+    Latency is about that of the slowest query, not the sum, as long as the
+    per-host rate limit (rateLimit.py) lets the queries through together.
+    The first failing query's exception is raised.
+    """
+    queries = _fanout_queries(campuses, modalities, section_types)
+
+    def run(campus, modality, section_type):
+        html = _timetable_html(year, semester, campus, pathway, subject, section_type,
+                               code, crn, status, modality, cached=cached)
+        if limit is not None:
+            import itertools
+            return list(itertools.islice(_iter_courses(html, year, semester), limit)) if html else []
+        return _parse_timetable(html, year, semester)
+
+    if len(queries) == 1:
+        results = [run(*queries[0])]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Each query runs in a copy of the caller's context, so freshness
+        # records from the workers still reach the caller's report.
+        with ThreadPoolExecutor(max_workers=min(FANOUT_WORKERS, len(queries)),
+                                thread_name_prefix="timetable-fanout") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, run, *q) for q in queries]
+            results = [f.result() for f in futures]
+
+    merged: Dict[str, Course] = {}
+    for courses in results:
+        for course in courses:
+            merged.setdefault(course.get_crn(), course)
+    return list(merged.values())
+
+
+def _timetable_html(year: str, semester: Semester,
+                    campus: Campus = Campus.BLACKSBURG,
+                    pathway: Pathway = Pathway.ALL, subject: str = '',
+                    section_type: SectionType = SectionType.ALL,
+                    code: str = '', crn: str = '',
+                    status: Status = Status.ALL,
+                    modality: Modality = Modality.ALL, cached: bool = False) -> str:
+    """
+    Run a timetable search and return the results page ('' means no sections).
+    `cached` serves it through the lookups' stale-while-revalidate cache.
+    """
+    request = _make_request_cached if cached else _make_request
+    return request(request_type='POST',
+                   request_data={'CAMPUS': campus,
+                                 'TERMYEAR': term_code(year, semester),
+                                 'CORE_CODE': pathway,
+                                 'subj_code': '%' if subject == '' else subject,
+                                 'SCHDTYPE': section_type,
+                                 'CRSE_NUMBER': code,
+                                 'crn': crn,
+                                 'open_only': status,
+                                 'sess_code': modality})
+
+
+def _parse_timetable(html: str, year: str, semester: Semester) -> List[Course]:
+    """Parse a timetable results page into Course objects ('' means no sections)."""
+    if html == '':
         return []
 
-    request_data = read_html(StringIO(request))[4]
+    from pandas import read_html
+
+    request_data = read_html(StringIO(html))[4]
     course_list = []
     for i in range(1, request_data.shape[0]):
         if isinstance(request_data.iloc[i][0], str):
@@ -412,37 +1000,214 @@ def search_timetable(year: str, semester: Semester,
     return course_list
 
 
+def iter_timetable(year: str, semester: Semester,
+                   campus: Campus = Campus.BLACKSBURG,
+                   pathway: Pathway = Pathway.ALL, subject: str = '',
+                   section_type: SectionType = SectionType.ALL,
+                   code: str = '', crn: str = '',
+                   status: Status = Status.ALL,
+                   modality: Modality = Modality.ALL) -> Iterator[Course]:
+    """
+    Streaming form of `search_timetable`: same arguments, but yields each
+    `Course` as soon as its rows are parsed instead of building a DataFrame
+    and a full list first. Apart from the response text, memory stays
+    constant, so a subject='%' pull can be piped into a store or stopped
+    early.
+
+    The upstream request is made (and its errors raised) when this is
+    called, not on the first `next()`.
+
+    Cells are the page text as-is, so e.g. capacity is '40' where the
+    pandas path may give 40; use `clean_int` when comparing.
+    """
+    html = _timetable_html(year, semester, campus, pathway, subject,
+                           section_type, code, crn, status, modality)
+    return _iter_courses(html, year, semester)
+
+
+def _iter_courses(html: str, year: str, semester: Semester) -> Iterator[Course]:
+    """Yield Course objects from a timetable page, pairing continuation rows."""
+    pending = None
+    for row in _iter_timetable_rows(html):
+        if pending is not None:
+            yield Course(year, semester, pending, row)
+            pending = None
+        if isinstance(row[0], str):
+            pending = row
+    if pending is not None:
+        yield Course(year, semester, pending, None)
+
+
+_TIMETABLE_TABLE = 4      # same table `read_html(...)[4]` picks
+_TIMETABLE_COLUMNS = 13   # CRN .. Exam; short rows are padded like pandas does
+_TABLE_TAG = re.compile(r'<(/?)(table|tr|td|th)\b([^>]*)>', re.IGNORECASE)
+_COLSPAN = re.compile(r'colspan\s*=\s*["\']?(\d+)', re.IGNORECASE)
+_ANY_TAG = re.compile(r'<[^>]*>')
+_CELL_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def _iter_timetable_rows(html: str, table_index: int = _TIMETABLE_TABLE,
+                         skip_header: bool = True) -> Iterator[list]:
+    """
+    Yield the data rows of the timetable results table as lists of cell text
+    (NaN for empty cells), mirroring what `read_html` would put in the
+    DataFrame: leading all-<th> rows are the header, and the first row after
+    them is skipped as `_parse_timetable` does. Table tags are scanned lazily,
+    so each row is yielded as soon as it closes. Omitted </td> and </tr> are
+    closed implicitly, as browsers do.
+
+    `table_index` picks the table in document order; `skip_header=False`
+    yields every row (for a slice of rows from the middle of the table).
+    """
+    from html import unescape
+
+    tables_seen = depth = 0
+    row, all_th = None, True
+    cell_start, colspan = None, 1
+    in_header, skipped_first = skip_header, not skip_header
+
+    def close_cell(end):
+        nonlocal cell_start
+        if cell_start is not None:
+            text = unescape(_ANY_TAG.sub('', html[cell_start:end]))
+            text = _CELL_WHITESPACE.sub(' ', text.strip())
+            row.extend([text if text else float('nan')] * colspan)
+            cell_start = None
+
+    def close_row(end):
+        nonlocal row
+        finished = None
+        if row is not None:
+            close_cell(end)
+            if row:
+                row.extend([float('nan')] * (_TIMETABLE_COLUMNS - len(row)))
+                finished = row
+            row = None
+        return finished
+
+    for m in _TABLE_TAG.finditer(html):
+        closing, tag = m.group(1), m.group(2).lower()
+        if tag == 'table':
+            if closing:
+                if depth:
+                    depth -= 1
+                    if depth:
+                        continue
+                    finished, header = close_row(m.start()), all_th
+                else:
+                    continue
+            else:
+                if depth:
+                    depth += 1
+                elif tables_seen == table_index:
+                    depth = 1
+                tables_seen += 1
+                continue
+        elif depth != 1:
+            continue
+        elif tag == 'tr':
+            header = all_th
+            finished = close_row(m.start())
+            if not closing:
+                row, all_th = [], True
+        else:
+            if row is None:
+                continue
+            close_cell(m.start())
+            if not closing:
+                cell_start = m.end()
+                all_th = all_th and tag == 'th'
+                span = _COLSPAN.search(m.group(3))
+                colspan = max(1, int(span.group(1))) if span else 1
+            continue
+
+        if finished is None:
+            continue
+        if in_header and header:
+            continue
+        in_header = False
+        if not skipped_first:
+            skipped_first = True
+            continue
+        yield finished
+        if tag == 'table':
+            return
+
+
+@_single_flight(_request_key, name="_make_request")
 def _make_request(request_type: str, request_data: Dict[str, str] = None) -> str:
     url = 'https://apps.es.vt.edu/ssb/HZSKVTSC.P_ProcRequest'
+    transport = get_transport()  # live, record or replay; see transport.py
 
     if request_type == 'POST':
-        for r in request_data:
-            request_data[r] = (request_data[r].value if
-                               issubclass(type(request_data[r]), Enum)
-                               else request_data[r])
-        request = requests.post(url, request_data)
+        request_data = {k: (v.value if isinstance(v, Enum) else v)
+                        for k, v in request_data.items()}
+        resp = transport.post(url, data=request_data, timeout=15)
+        # An HTTPError (5xx, maintenance page) is not in _NO_FALLBACK, so the
+        # SWR cache serves the last good page instead of storing this one.
+        resp.raise_for_status()
+        text = resp.text
 
-        if 'THERE IS AN ERROR WITH YOUR REQUEST' in request.text:
+        if 'THERE IS AN ERROR WITH YOUR REQUEST' in text:
             raise InvalidRequestException('Invalid search parameters provided.')
-        if 'There was a problem with your request' in request.text:
-            if 'NO SECTIONS FOUND FOR THIS INQUIRY' in request.text:
+        if 'There was a problem with your request' in text:
+            if 'NO SECTIONS FOUND FOR THIS INQUIRY' in text:
                 return ''
             else:
-                msg = re.search(r'<b class=red_msg><li>(.+)</b>', request.text).group(1)
-                raise InvalidSearchException(msg)
-        return request.text
+                m = re.search(r'<b class=red_msg><li>(.+)</b>', text)
+                raise InvalidSearchException(m.group(1) if m else 'Unknown error')
+        return text
 
     elif request_type == 'GET':
-        response = requests.get(url)
-        return response.text
+        resp = transport.get(url, timeout=15)
+        resp.raise_for_status()
+        return resp.text
 
     else:
         raise ValueError('Invalid request type')
 
 
-def get_crns_for_course_id(year: str, semester: str, course_id: str) -> List[str]:
+# Lookups (searchID, searchIDData, searchCRNData, pathways) read the timetable
+# through the stale-while-revalidate cache; plain searches always go upstream.
+_make_request_cached = _stale_while_revalidate(
+    _request_key, name="timetable", soft_ttl=TIMETABLE_SOFT_TTL,
+    negative_ttl=TIMETABLE_NEGATIVE_TTL)(_make_request)
+
+
+def _canonical_listing(subject: str, code: str, term: str) -> Tuple[str, str, List[str]]:
+    """
+    (subject, code) to look a course up under in `term`, and its other
+    listings. For a cross-listed course that is the canonical listing (see
+    crossListings.py), so all listings share one timetable and Banner fetch.
+    A map built for another term is not used.
+    """
+    try:
+        from pythonTimetables.crossListings import cross_listings
+    except ModuleNotFoundError:
+        from crossListings import cross_listings
+    listings = cross_listings(term)
+    if listings is None:
+        return subject, code, []
+    canonical = listings.canonical(f"{subject}{code}")
+    return canonical[:-4], canonical[-4:], listings.aliases(f"{subject}{code}")
+
+
+def _rejected_course(subject: str, code: str) -> bool:
+    """True if pre-validation shows the course can't have sections (see knownCourses.py)."""
+    try:
+        from pythonTimetables.knownCourses import rejection
+    except ModuleNotFoundError:
+        from knownCourses import rejection
+    return rejection(subject, code) is not None
+
+
+def get_crns_for_course_id(year: str, semester: str, course_id: str,
+                           campuses=(Campus.BLACKSBURG,), modalities=(Modality.ALL,),
+                           section_types=(SectionType.ALL,)) -> List[str]:
     """
     Given a course_id like 'CS2114', return all CRNs for that course in the given term.
+    Several campuses, modalities or section types are searched concurrently
+    (see `search_timetable_fanout`).
     """
     m = re.fullmatch(r'([A-Za-z]+)\s*[-:]?\s*(\d{4})', course_id.strip())
     if not m:
@@ -450,21 +1215,18 @@ def get_crns_for_course_id(year: str, semester: str, course_id: str) -> List[str
     subject = m.group(1).upper()
     code = m.group(2)
 
-    courses = search_timetable(
+    courses = search_timetable_fanout(
         year=year,
         semester=parse_semester(semester),
         subject=subject,
         code=code,
-        campus=Campus.BLACKSBURG,      # adjust if you want to include Virtual campus
+        campuses=campuses,
         status=Status.ALL,             # or Status.OPEN to only get open sections
-        modality=Modality.ALL,         # filter if needed
-        section_type=SectionType.ALL,  # filter if needed
+        modalities=modalities,
+        section_types=section_types,
     )
     return [c.get_crn() for c in courses]
 
-# Reuse one session for connection pooling (TLS + TCP reuse)
-_session = requests.Session()  # safe for single-process, single-thread typical use
-
 # Optional: short-lived cache to avoid repeated identical term queries during a run
 def _lru_ttl_cache(ttl_seconds=120, maxsize=256):
     def decorator(func):
@@ -485,76 +1247,73 @@ def _lru_ttl_cache(ttl_seconds=120, maxsize=256):
     return decorator
 
 
-# Narrow helper to call timetable with connection reuse
-def _make_request_with_session(request_type: str, request_data: Dict[str, str] = None) -> str:
-    url = 'https://apps.es.vt.edu/ssb/HZSKVTSC.P_ProcRequest'
-    if request_type == 'POST':
-        # Coerce Enum values early (mirrors original)
-        for r in list(request_data.keys()):
-            v = request_data[r]
-            request_data[r] = (v.value if hasattr(v, "value") else v)
-        resp = _session.post(url, data=request_data, timeout=15)  # reuse socket
-        text = resp.text
-        if 'THERE IS AN ERROR WITH YOUR REQUEST' in text:
-            raise InvalidRequestException('Invalid search parameters provided.')
-        if 'There was a problem with your request' in text:
-            if 'NO SECTIONS FOUND FOR THIS INQUIRY' in text:
-                return ''
-            else:
-                m = re.search(r'<b class=red_msg><li>(.+)</b>', text)
-                raise InvalidSearchException(m.group(1) if m else 'Unknown error')
-        return text
-    elif request_type == 'GET':
-        return _session.get(url, timeout=15).text
-    else:
-        raise ValueError('Invalid request type')
-
-
 # Lightweight Banner comments fetch with session reuse and cache
-@functools.lru_cache(maxsize=512)  # cache by (crn, year, sem, subj, code)
 def _banner_comments_cached(crn: str, year: str, semester_value: str, subject: str, code: str) -> Dict[str, str]:
+    """
+    Banner prerequisites, catalog description and comments for a section,
+    cached per (crn, year, sem, subj, code). On an upstream error with nothing
+    cached, every field is the error message; that result is not cached.
+    """
+    try:
+        return _fetch_banner_comments(crn, year, semester_value, subject, code)
+    except Exception as e:
+        err = f"Error retrieving data: {e}"
+        return {"prerequisites": err, "catalogDescription": err, "comments": err}
+
+
+@_stale_while_revalidate(lambda *args: args, name="banner", soft_ttl=BANNER_SOFT_TTL)
+def _fetch_banner_comments(crn: str, year: str, semester_value: str, subject: str, code: str) -> Dict[str, str]:
     url = (
         f"https://selfservice.banner.vt.edu/ssb/HZSKVTSC.P_ProcComments?"
         f"CRN={crn}&TERM={semester_value}&YEAR={year}&SUBJ={subject}&CRSE={code}&history=N"
     )
-    try:
-        r = _session.get(url, timeout=10)  # pooled
-        r.raise_for_status()
-        html = r.text
+    r = get_transport().get(url, timeout=10)  # pooled
+    r.raise_for_status()
+    html = r.text
+
+    def extract_field(label_pattern):
+        m = re.search(
+            rf'<td[^>]*>{label_pattern}</td>\s*<td[^>]*class="pldefault"[^>]*>(.*?)</td>',
+            html,
+            re.DOTALL | re.IGNORECASE
+        )
+        if not m:
+            return None
+        text = re.sub(r'<.*?>', '', m.group(1))
+        text = re.sub(r'\s+', ' ', text).strip()
+        return text
 
-        def extract_field(label_pattern):
-            m = re.search(
-                rf'<td[^>]*>{label_pattern}</td>\s*<td[^>]*class="pldefault"[^>]*>(.*?)</td>',
-                html,
-                re.DOTALL | re.IGNORECASE
-            )
-            if not m:
-                return None
-            text = re.sub(r'<.*?>', '', m.group(1))
-            text = re.sub(r'\s+', ' ', text).strip()
-            return text
+    prerequisites = extract_field(r'Prerequisites:?')
+    catalog_description = extract_field(r'Catalog Description:?')
+    comments = extract_field(r'Comments:?')
 
-        prerequisites = extract_field(r'Prerequisites:?')
-        catalog_description = extract_field(r'Catalog Description:?')
-        comments = extract_field(r'Comments:?')
+    return {
+        "prerequisites": prerequisites or "No prerequisites found.",
+        "catalogDescription": catalog_description or "No catalog description found.",
+        "comments": comments or "No comments found."
+    }
 
-        return {
-            "prerequisites": prerequisites or "No prerequisites found.",
-            "catalogDescription": catalog_description or "No catalog description found.",
-            "comments": comments or "No comments found."
-        }
-    except Exception as e:
-        err = f"Error retrieving data: {e}"
-        return {"prerequisites": err, "catalogDescription": err, "comments": err}
+
+def _indexed_pathways(year: str, semester: Semester, course_id: str) -> Optional[List[str]]:
+    """A course's pathway codes from the term's pathway index, or None if none is built."""
+    try:
+        from pythonTimetables.pathwayIndex import lookup_pathways
+    except ModuleNotFoundError:
+        from pathwayIndex import lookup_pathways
+    return lookup_pathways(year, semester.name, course_id)
 
 
 def _get_pathways_for_course(year: str, semester: Semester, subject: str, code: str) -> List[str]:
     """
-    Fetch pathway information for a course by parsing the timetable HTML.
+    Fetch pathway information for a course: from the term's pathway index
+    when one is built (see pathwayIndex.py), else by parsing the timetable HTML.
     Returns a list of pathway codes (e.g., ['AR01', 'G02', 'G06A']).
     """
-    term_year = ((str(int(year) - 1) if semester == Semester.WINTER else year)
-                 + semester.value)
+    indexed = _indexed_pathways(year, semester, f"{subject}{code}")
+    if indexed is not None:
+        return indexed
+
+    term_year = term_code(year, semester)
 
     try:
         # Make request to get the raw HTML for this subject+code
@@ -569,7 +1328,7 @@ def _get_pathways_for_course(year: str, semester: Semester, subject: str, code:
             'open_only': Status.ALL.value,
             'sess_code': Modality.ALL.value
         }
-        html = _make_request(request_type='POST', request_data=request_data)
+        html = _make_request_cached(request_type='POST', request_data=request_data)
         if not html:
             return []
 
@@ -590,19 +1349,92 @@ def _get_pathways_for_course(year: str, semester: Semester, subject: str, code:
         return []
 
 
+# Field projection: what each lookup field costs upstream. Identity fields
+# are always returned and cost nothing beyond what the lookup already does.
+_IDENTITY_FIELDS = ("year", "semester", "courseId", "subject", "code")
+_BANNER_FIELDS = frozenset({"prerequisites", "catalogDescription", "comments"})
+_FIRST_SECTION_FIELDS = frozenset({"name", "creditHours"})
+_ID_DATA_FIELDS = frozenset(_IDENTITY_FIELDS) | _FIRST_SECTION_FIELDS | _BANNER_FIELDS | {
+    "pathways", "crossListed"}
+_SECTION_FIELDS = _ID_DATA_FIELDS - {"crossListed"} | {"sections"}
+_CRN_FIELDS = _SECTION_FIELDS - {"sections"} | {
+    "crn", "type", "modality", "capacity", "instructor", "schedule"}
+
+
+def parse_fields(fields, allowed: frozenset) -> Optional[frozenset]:
+    """
+    A lookup's `fields` projection (names or a comma separated string) as a
+    set, or None for every field. Unknown names raise ValueError.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    fields = frozenset(f.strip() for f in fields if f and f.strip())
+    unknown = fields - allowed
+    if unknown:
+        raise ValueError(f"Unknown field(s) {', '.join(sorted(unknown))}; "
+                         f"expected some of {', '.join(sorted(allowed))}.")
+    return fields
+
+
+def _fields_key(fields, allowed: frozenset) -> Optional[tuple]:
+    parsed = parse_fields(fields, allowed)
+    return None if parsed is None else tuple(sorted(parsed))
+
+
+def _wants(fields: Optional[frozenset], names) -> bool:
+    """True if the projection `fields` (None: all) includes any of `names`."""
+    return fields is None or not fields.isdisjoint(names)
+
+
+class EmptyResult(dict):
+    """
+    A lookup result for a course or CRN that has no sections, projected or
+    not. courseJson caches these for the negative TTL.
+    """
+
+
+def _project(result: dict, fields: Optional[frozenset]) -> dict:
+    """`result` cut down to the identity keys and `fields` (None keeps all)."""
+    if fields is None:
+        return result
+    keep = fields.union(_IDENTITY_FIELDS)
+    return type(result)((k, v) for k, v in result.items() if k in keep)
+
+
 # Optimized searchID with pathways
-def searchID(year: str, semester_str: str, course_id: str, fetch_banner: bool = True) -> dict:
+@_single_flight(lambda year, semester_str, course_id, fetch_banner=True, campuses=None,
+                modalities=None, section_types=None, deadline=None, fields=None: (
+    str(year), _normalize_semester(semester_str), _normalize_course_id(course_id), bool(fetch_banner),
+    tuple(_fanout_queries(campuses, modalities, section_types)), deadline,
+    _fields_key(fields, _SECTION_FIELDS)))
+@_reports_freshness
+def searchID(year: str, semester_str: str, course_id: str, fetch_banner: bool = True,
+             campuses=None, modalities=None, section_types=None,
+             deadline: float = None, fields=None) -> dict:
     """
     Optimized:
       - Reuses a persistent requests.Session.
       - Avoids repeated parsing work via minimal changes.
       - Caches Banner comments per course/CRN.
       - Optional fetch_banner to skip Banner call when not needed.
+      - Concurrent identical calls share one upstream call (single-flight).
+      - Serves cached upstream data stale-while-revalidate; `freshness`
+        reports the state and fetch time of each source used.
+      - Optional campuses / modalities / section_types (default Blacksburg,
+        all, all) are searched concurrently and merged by CRN.
+      - Optional deadline (seconds): sections, pathways and Banner are
+        fetched concurrently and whatever is done by then is returned.
+      - Optional fields projection (see searchIDData); without "sections"
+        only the first section's row is parsed.
 
     Returns:
       dict with keys:
         year, semester, courseId, subject, code, name, creditHours,
-        prerequisites, catalogDescription, comments, pathways, sections[]
+        prerequisites, catalogDescription, comments, pathways, sections[],
+        freshness, and with a deadline completeness {sections, pathways,
+        banner: bool}
     """
     sem = parse_semester(semester_str)
     m = re.fullmatch(r'([A-Za-z]+)\s*[-:]?\s*(\d{4})', course_id.strip())
@@ -610,23 +1442,38 @@ def searchID(year: str, semester_str: str, course_id: str, fetch_banner: bool =
         raise ValueError(f"Invalid course_id: {course_id!r}. Expected like 'CS3414' or 'CS-3414'.")
     subject, code = m.group(1).upper(), m.group(2)
 
-    # Ensure timetable requests use the pooled session-backed request helper
-    global _make_request
-    _make_request = _make_request_with_session
-
-    sections = search_timetable(
-        year=year,
-        semester=sem,
-        subject=subject,
-        code=code,
-        campus=Campus.BLACKSBURG,
-        status=Status.ALL,
-        modality=Modality.ALL,
-        section_type=SectionType.ALL,
-    )
+    fields = parse_fields(fields, _SECTION_FIELDS)
+    fetch_banner = fetch_banner and _wants(fields, _BANNER_FIELDS)
+    want_entries = _wants(fields, ("sections",))
+    want_sections = fetch_banner or want_entries or _wants(fields, _FIRST_SECTION_FIELDS)
+    want_pathways = _wants(fields, ("pathways",))
+
+    budget = _Budget(deadline)
+    sections, pathways_part = [], None
+    rejected = _rejected_course(subject, code)
+    if not rejected:
+        sections_part = budget.submit(
+            search_timetable_fanout,
+            year=year,
+            semester=sem,
+            subject=subject,
+            code=code,
+            campuses=campuses,
+            status=Status.ALL,
+            modalities=modalities,
+            section_types=section_types,
+            cached=True,
+            limit=None if want_entries else 1,
+        ) if want_sections else None
+        if want_pathways and (budget.at is not None or not want_sections):
+            pathways_part = budget.submit(_get_pathways_for_course, year, sem, subject, code)
+        if sections_part is not None:
+            sections = budget.get("sections", sections_part, [])
 
     if not sections:
-        return {
+        pathways = (budget.get("pathways", pathways_part, [])
+                    if pathways_part is not None and not want_sections else [])
+        summary = {
             "year": year,
             "semester": semester_str,
             "courseId": course_id,
@@ -637,21 +1484,31 @@ def searchID(year: str, semester_str: str, course_id: str, fetch_banner: bool =
             "prerequisites": None if fetch_banner else None,
             "catalogDescription": None if fetch_banner else None,
             "comments": None if fetch_banner else None,
-            "pathways": [],
+            "pathways": pathways,
             "sections": [],
         }
+        if rejected or want_sections:  # else sections weren't looked for
+            summary = EmptyResult(summary)
+        return budget.report(_project(summary, fields))
 
     first = sections[0]
 
     # Conditionally fetch Banner metadata once (cached)
-    if fetch_banner:
-        bc = _banner_comments_cached(
-            first.get_crn(),
-            first.get_year(),
-            first.get_semester().value,
-            first.get_subject(),
-            first.get_code()
-        )
+    banner_part = budget.submit(
+        _banner_comments_cached,
+        first.get_crn(),
+        first.get_year(),
+        first.get_semester().value,
+        first.get_subject(),
+        first.get_code()
+    ) if fetch_banner else None
+
+    # Pathways for this course (across its listings)
+    pathways = budget.get("pathways", pathways_part or budget.submit(
+        _get_pathways_for_course, year, sem, subject, code), []) if want_pathways else []
+
+    bc = budget.get("banner", banner_part) if banner_part else None
+    if bc is not None:
         prereqs = bc["prerequisites"]
         catalog_desc = bc["catalogDescription"]
         comments = bc["comments"]
@@ -660,11 +1517,8 @@ def searchID(year: str, semester_str: str, course_id: str, fetch_banner: bool =
         catalog_desc = None
         comments = None
 
-    # Pathways for this course (across its listings)
-    pathways = _get_pathways_for_course(year, sem, subject, code)
-
     section_entries: List[Dict] = []
-    for c in sections:
+    for c in sections if want_entries else ():
         sched_list = []
         for day, meetings in c.get_schedule().items():
             for start, end, location in meetings:
@@ -683,7 +1537,7 @@ def searchID(year: str, semester_str: str, course_id: str, fetch_banner: bool =
             "schedule": sched_list,
         })
 
-    return {
+    return budget.report(_project({
         "year": year,
         "semester": semester_str,
         "courseId": course_id,
@@ -696,7 +1550,7 @@ def searchID(year: str, semester_str: str, course_id: str, fetch_banner: bool =
         "comments": comments,
         "pathways": pathways,
         "sections": section_entries,
-    }
+    }, fields))
 
 
 from datetime import datetime
@@ -723,24 +1577,45 @@ def _get_next_semester() -> tuple[str, str]:
         return str(current_year), "Fall"
 
 
-def searchIDData(course_id: str, fetch_banner: bool = True) -> dict:
+@_single_flight(lambda course_id, fetch_banner=True, campuses=None, modalities=None,
+                section_types=None, deadline=None, fields=None: (
+    _normalize_course_id(course_id), bool(fetch_banner),
+    tuple(_fanout_queries(campuses, modalities, section_types)), deadline,
+    _fields_key(fields, _ID_DATA_FIELDS)))
+@_reports_freshness
+def searchIDData(course_id: str, fetch_banner: bool = True,
+                 campuses=None, modalities=None, section_types=None,
+                 deadline: float = None, fields=None) -> dict:
     """
     Optimized:
       - Reuses a persistent requests.Session.
       - Avoids repeated parsing work via minimal changes.
       - Caches Banner comments per course/CRN.
       - Optional fetch_banner to skip Banner call when not needed.
+      - Concurrent identical calls share one upstream call (single-flight).
+      - Serves cached upstream data stale-while-revalidate; `freshness`
+        reports the state and fetch time of each source used.
       - Returns only core course metadata without section details.
       - Automatically determines next semester based on current date.
 
     Args:
         course_id: Course identifier (e.g., 'CS3414' or 'CS-3414')
         fetch_banner: Whether to fetch detailed metadata from Banner
+        campuses, modalities, section_types: Where to look for sections
+            (default Blacksburg, all, all); several are searched concurrently
+        deadline: Seconds to wait for upstream data (default: no limit).
+            Sections, pathways and Banner are fetched concurrently, and the
+            parts done by then are returned (see `_Budget`)
+        fields: Keys to return (default all). Only the upstream work they
+            need is done: Banner for prerequisites / catalogDescription /
+            comments, the pathways lookup for pathways, and the first
+            section's row only for name / creditHours
 
     Returns:
       dict with keys:
         year, semester, courseId, subject, code, name, creditHours,
-        prerequisites, catalogDescription, comments, pathways
+        prerequisites, catalogDescription, comments, pathways, freshness,
+        and with a deadline completeness {sections, pathways, banner: bool}
     """
     # Automatically determine next semester
     year, semester_str = _get_next_semester()
@@ -750,24 +1625,60 @@ def searchIDData(course_id: str, fetch_banner: bool = True) -> dict:
     if not m:
         raise ValueError(f"Invalid course_id: {course_id!r}. Expected like 'CS3414' or 'CS-3414'.")
     subject, code = m.group(1).upper(), m.group(2)
-
-    # Ensure timetable requests use the pooled session-backed request helper
-    global _make_request
-    _make_request = _make_request_with_session
-
-    sections = search_timetable(
-        year=year,
-        semester=sem,
-        subject=subject,
-        code=code,
-        campus=Campus.BLACKSBURG,
-        status=Status.ALL,
-        modality=Modality.ALL,
-        section_type=SectionType.ALL,
-    )
-
+    lookup_subject, lookup_code, cross_listed = _canonical_listing(subject, code,
+                                                                   term_code(year, sem))
+
+    fields = parse_fields(fields, _ID_DATA_FIELDS)
+    fetch_banner = fetch_banner and _wants(fields, _BANNER_FIELDS)
+    want_sections = fetch_banner or _wants(fields, _FIRST_SECTION_FIELDS)
+    want_pathways = _wants(fields, ("pathways",))
+
+    budget = _Budget(deadline)
+    sections, pathways = [], []
+    rejected = _rejected_course(lookup_subject, lookup_code)
+    if not rejected:
+        sections_part = budget.submit(
+            search_timetable_fanout,
+            year=year,
+            semester=sem,
+            subject=lookup_subject,
+            code=lookup_code,
+            campuses=campuses,
+            status=Status.ALL,
+            modalities=modalities,
+            section_types=section_types,
+            cached=True,
+            limit=None if fields is None else 1,  # a projection reads only the first
+        ) if want_sections else None
+        # Pathways for this course (across its listings); with a deadline,
+        # fetched alongside the sections instead of after them
+        pathways_part = (budget.submit(_get_pathways_for_course, year, sem, lookup_subject, lookup_code)
+                         if want_pathways and (budget.at is not None or not want_sections) else None)
+        if sections_part is not None:
+            sections = budget.get("sections", sections_part, [])
+        if want_pathways and (sections or not want_sections):
+            pathways = budget.get("pathways", pathways_part or budget.submit(
+                _get_pathways_for_course, year, sem, lookup_subject, lookup_code), [])
+
+    summary = _course_summary(year, semester_str, course_id, subject, code, sections, pathways,
+                              fetch_banner, cross_listed, budget)
+    if not (rejected or want_sections):
+        summary = dict(summary)  # sections weren't looked for, so none found says nothing
+    return budget.report(_project(summary, fields))
+
+
+def _course_summary(year: str, semester_str: str, course_id: str, subject: str, code: str,
+                    sections: List[Course], pathways: List[str], fetch_banner: bool,
+                    cross_listed: List[str] = (), budget: "_Budget" = None) -> dict:
+    """
+    Build the searchIDData result dict for one course from its sections.
+    Banner metadata comes from the first section (cached), within `budget`
+    when given. For a cross-listed course the sections may be another
+    listing's; the result is still labelled with the requested subject and
+    code.
+    """
     if not sections:
-        return {
+        return EmptyResult({
             "year": year,
             "semester": semester_str,
             "courseId": course_id,
@@ -778,20 +1689,23 @@ def searchIDData(course_id: str, fetch_banner: bool = True) -> dict:
             "prerequisites": None if fetch_banner else None,
             "catalogDescription": None if fetch_banner else None,
             "comments": None if fetch_banner else None,
-            "pathways": [],
-        }
+            "pathways": list(pathways),
+            "crossListed": list(cross_listed),
+        })
 
     first = sections[0]
 
     # Conditionally fetch Banner metadata once (cached)
-    if fetch_banner:
-        bc = _banner_comments_cached(
-            first.get_crn(),
-            first.get_year(),
-            first.get_semester().value,
-            first.get_subject(),
-            first.get_code()
-        )
+    budget = budget or _Budget(None)
+    bc = budget.get("banner", budget.submit(
+        _banner_comments_cached,
+        first.get_crn(),
+        first.get_year(),
+        first.get_semester().value,
+        first.get_subject(),
+        first.get_code()
+    )) if fetch_banner else None
+    if bc is not None:
         prereqs = _parse_prerequisites(bc["prerequisites"])
         catalog_desc = bc["catalogDescription"]
         comments = bc["comments"]
@@ -800,25 +1714,381 @@ def searchIDData(course_id: str, fetch_banner: bool = True) -> dict:
         catalog_desc = None
         comments = None
 
-    # Pathways for this course (across its listings)
-    pathways = _get_pathways_for_course(year, sem, subject, code)
-
     return {
         "year": year,
         "semester": semester_str,
         "courseId": course_id,
         "subject": subject,
-        "code": f"{first.get_subject()}{first.get_code()}",
+        "code": f"{subject}{code}",
         "name": first.get_name(),
         "creditHours": first.get_credit_hours(),
         "prerequisites": prereqs,
         "catalogDescription": catalog_desc,
         "comments": comments,
         "pathways": pathways,
+        "crossListed": list(cross_listed),
     }
 
-import re
-from typing import List
+
+def _pathways_by_course(html: str) -> Dict[str, List[str]]:
+    """
+    Split a subject-wide timetable page into per-course pathway codes.
+    Rows are attributed to the last 'SUBJ-CODE' seen, so continuation rows
+    ("* Additional Times *") count toward their section's course.
+    """
+    out: Dict[str, List[str]] = {}
+    current = None
+    for row in re.split(r'<tr[^>]*>', html, flags=re.IGNORECASE)[1:]:
+        m = re.search(r'>\s*([A-Z]{2,5})-(\d{4})\s*<', row)
+        if m:
+            current = f"{m.group(1)}{m.group(2)}"
+            out.setdefault(current, [])
+        if current is None:
+            continue
+        for p in re.findall(r'\b(AR\d{2}|G\d{2}[A-Z]?)\b', row):
+            if p not in out[current]:
+                out[current].append(p)
+    return out
+
+
+def searchIDDataBatch(course_ids: List[str], fetch_banner: bool = True,
+                      fields=None) -> Dict[str, dict]:
+    """
+    searchIDData for many courses at once, for loading whole plans.
+
+    IDs are grouped by subject and each subject is fetched with a single
+    subject-wide timetable query (empty course number). The parsed sections
+    are split per course, pathways come from the pathway index or else each
+    course's rows of the same page. Ids are first reduced to canonical
+    courses: spellings of one id ('CS-2114', 'cs2114') and the listings of a
+    cross-listed offering are looked up once, Banner included, and the
+    result is relabelled for each requested id.
+    A 40-course plan costs one request per subject plus one Banner request
+    per course instead of three requests per course. Each result carries
+    the freshness of its subject's page and its own Banner fetch.
+
+    Args:
+        course_ids: Course identifiers (e.g., ['CS2114', 'CS-3114', 'MATH1226'])
+        fetch_banner: Whether to fetch detailed metadata from Banner
+        fields: Keys to return per course (see searchIDData); a plan grid
+            asking for name and creditHours costs no Banner requests
+
+    Returns:
+      dict mapping each requested course_id to its searchIDData-shaped dict,
+      or to {"error": ...} for IDs that are not valid course identifiers.
+    """
+    year, semester_str = _get_next_semester()
+    sem = parse_semester(semester_str)
+    term = term_code(year, sem)
+    fields = parse_fields(fields, _ID_DATA_FIELDS)
+    fetch_banner = fetch_banner and _wants(fields, _BANNER_FIELDS)
+    want_sections = fetch_banner or _wants(fields, _FIRST_SECTION_FIELDS)
+    want_pathways = _wants(fields, ("pathways",))
+
+    # lookup subject -> lookup code -> [(course_id, subject, code, other listings)]
+    by_subject: Dict[str, Dict[str, List[tuple]]] = defaultdict(lambda: defaultdict(list))
+    results: Dict[str, dict] = {}
+    for course_id in course_ids:
+        m = re.fullmatch(r'([A-Za-z]+)\s*[-:]?\s*(\d{4})', str(course_id).strip())
+        if not m:
+            results[course_id] = {"error": f"Invalid course_id: {course_id!r}. Expected like 'CS3414' or 'CS-3414'."}
+            continue
+        subject, code = m.group(1).upper(), m.group(2)
+        lookup_subject, lookup_code, cross_listed = _canonical_listing(subject, code, term)
+        by_subject[lookup_subject][lookup_code].append((course_id, subject, code, cross_listed))
+
+    for subject, courses in by_subject.items():
+        rejected = {lookup_code: _rejected_course(subject, lookup_code) for lookup_code in courses}
+        with collect_freshness() as page_freshness:
+            if not (want_sections or want_pathways):
+                html = ''  # nothing asked for needs the timetable
+            elif all(rejected.values()):
+                html = ''  # no upstream call for ids that can't have sections
+            else:
+                html = _make_request_cached(request_type='POST',
+                                     request_data={'CAMPUS': Campus.BLACKSBURG,
+                                                   'TERMYEAR': term_code(year, sem),
+                                                   'CORE_CODE': Pathway.ALL,
+                                                   'subj_code': subject,
+                                                   'SCHDTYPE': SectionType.ALL,
+                                                   'CRSE_NUMBER': '',
+                                                   'crn': '',
+                                                   'open_only': Status.ALL,
+                                                   'sess_code': Modality.ALL})
+        sections_by_code: Dict[str, List[Course]] = defaultdict(list)
+        for c in _parse_timetable(html, year, sem) if want_sections else ():
+            sections_by_code[c.get_code()].append(c)
+        scanned = _pathways_by_course(html) if html and want_pathways else {}
+
+        for lookup_code, entries in courses.items():
+            with collect_freshness() as freshness:
+                pathways = _indexed_pathways(year, sem, f"{subject}{lookup_code}") if want_pathways else []
+                if pathways is None:
+                    pathways = scanned.get(f"{subject}{lookup_code}", [])
+                course_id, requested_subject, code, cross_listed = entries[0]
+                summary = _course_summary(year, semester_str, course_id, requested_subject, code,
+                                          sections_by_code.get(lookup_code, []), pathways,
+                                          fetch_banner, cross_listed)
+            if not (rejected[lookup_code] or want_sections):
+                summary = dict(summary)  # sections weren't looked for
+            freshness = {**page_freshness, **freshness}
+            for course_id, requested_subject, code, cross_listed in entries:
+                result = _project(summary, fields)
+                if course_id != entries[0][0]:
+                    result = type(result)(result, courseId=course_id, subject=requested_subject,
+                                          code=f"{requested_subject}{code}")
+                    if "crossListed" in result:
+                        result["crossListed"] = list(cross_listed)
+                result["freshness"] = dict(freshness)
+                results[course_id] = result
+    return {course_id: results[course_id] for course_id in course_ids}
+
+
+class PrereqNode:
+    """
+    Node of a parsed prerequisite expression.
+
+    kind is one of:
+      'and', 'or'   -- children hold the operands
+      'course'      -- code like 'CS2114'
+      'test'        -- placement/AP score like 'AB4' (kept for compatibility)
+      'text'        -- free text the parser couldn't interpret ('Junior standing')
+    min_grade and concurrent come from '(MIN grade of C)' and
+    '(may be taken concurrently)' annotations and apply to the whole node.
+    """
+    __slots__ = ("kind", "children", "code", "min_grade", "concurrent")
+
+    def __init__(self, kind: str, children: Tuple["PrereqNode", ...] = (), code: str = None,
+                 min_grade: str = None, concurrent: bool = False) -> None:
+        self.kind = kind
+        self.children = children
+        self.code = code
+        self.min_grade = min_grade
+        self.concurrent = concurrent
+
+    def __repr__(self) -> str:
+        if self.kind in ("and", "or"):
+            inner = f" {self.kind} ".join(map(repr, self.children))
+            body = f"({inner})"
+        else:
+            body = self.code
+        if self.min_grade:
+            body += f"[>={self.min_grade}]"
+        if self.concurrent:
+            body += "[co]"
+        return body
+
+    def to_dict(self) -> dict:
+        out = {"type": self.kind}
+        if self.kind in ("and", "or"):
+            out["children"] = [c.to_dict() for c in self.children]
+        else:
+            out["code"] = self.code
+        if self.min_grade:
+            out["minGrade"] = self.min_grade
+        if self.concurrent:
+            out["concurrent"] = True
+        return out
+
+    def codes(self) -> List[str]:
+        """Course and test codes in this subtree, in order, without duplicates."""
+        if self.kind in ("course", "test"):
+            return [self.code]
+        out = []
+        for child in self.children:
+            out.extend(c for c in child.codes() if c not in out)
+        return out
+
+
+_PREREQ_TOKEN = re.compile(
+    r"(?P<course>\b[A-Z]{2,5}\s?\d{4}[A-Z]?\b)"
+    r"|(?P<test>\b[A-Z]{2,5}\s\d{1,3}\b)"
+    r"|(?P<lp>\()|(?P<rp>\))|(?P<sep>[,;])"
+    r"|(?P<and>\band\b)|(?P<or>\bor\b)"
+    r"|(?P<word>[^\s(),;]+)",
+    re.IGNORECASE,
+)
+_MIN_GRADE = re.compile(r"^MIN\s+grade\s+of\s+([A-Z][+-]?)$", re.IGNORECASE)
+_MAX_CNF_CLAUSES = 64
+
+
+def _tokenize_prerequisites(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    for m in _PREREQ_TOKEN.finditer(text):
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind in ("course", "test") and not value[:1].isupper():
+            kind = "word"  # 'or 4' etc. are case-insensitive matches, not codes
+        tokens.append((kind, value))
+    return tokens
+
+
+class _PrereqParser:
+    """
+    Recursive-descent parser for Banner prerequisite strings.
+
+        seq     := item (conn? item)*      -- no connective means 'and'
+        conn    := ',' | ';' | 'and' | 'or' | ', and' | ', or'
+        item    := atom annotation*
+        atom    := '(' seq ')' | WORD* COURSE | WORD* TEST | WORD+
+        annotation := '(' WORD+ ')'     -- MIN grade / concurrently / notes
+
+    Separators bind as in English lists: 'or' is tighter than 'and', and a
+    comma list whose last connective is 'or' ('A, B, or C') is an OR list.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self, offset: int = 0) -> Optional[str]:
+        i = self.pos + offset
+        return self.tokens[i][0] if i < len(self.tokens) else None
+
+    def parse(self) -> Optional[PrereqNode]:
+        node = self._seq()
+        while self.pos < len(self.tokens):  # stray ')' -- skip and keep going
+            self.pos += 1
+            rest = self._seq()
+            if rest is not None:
+                node = rest if node is None else PrereqNode("and", (node, rest))
+        return node
+
+    def _seq(self) -> Optional[PrereqNode]:
+        items = []
+        conns = []
+        item = self._item()
+        if item is not None:
+            items.append(item)
+        while self._peek() in ("sep", "and", "or", "course", "test", "lp", "word"):
+            kind = self.tokens[self.pos][0]
+            if kind in ("course", "test", "lp", "word"):
+                kind = "and"  # juxtaposed requirements, e.g. 'Junior standing CS 2114'
+            else:
+                self.pos += 1
+            if kind == "sep" and self._peek() in ("and", "or"):
+                kind = self.tokens[self.pos][0]
+                self.pos += 1
+            item = self._item()
+            if item is None:
+                continue
+            if items:
+                conns.append(kind)
+            items.append(item)
+        if not items:
+            return None
+
+        comma_means = "or" if conns and conns[-1] == "or" and "and" not in conns else "and"
+        conns = [comma_means if c == "sep" else c for c in conns]
+        # 'or' binds tighter: split on 'and' into OR-chunks.
+        chunks = [[items[0]]]
+        for conn, item in zip(conns, items[1:]):
+            if conn == "and":
+                chunks.append([item])
+            else:
+                chunks[-1].append(item)
+        terms = [c[0] if len(c) == 1 else PrereqNode("or", tuple(c)) for c in chunks]
+        return terms[0] if len(terms) == 1 else PrereqNode("and", tuple(terms))
+
+    def _item(self) -> Optional[PrereqNode]:
+        node = self._atom()
+        while node is not None and self._peek() == "lp" and self._annotation_ahead():
+            self.pos += 1
+            words = []
+            while self._peek() == "word":
+                words.append(self.tokens[self.pos][1])
+                self.pos += 1
+            self.pos += 1  # ')'
+            note = " ".join(words)
+            m = _MIN_GRADE.match(note)
+            if m:
+                node.min_grade = m.group(1).upper()
+            elif "concurrent" in note.lower() or "corequisite" in note.lower():
+                node.concurrent = True
+        return node
+
+    def _annotation_ahead(self) -> bool:
+        i = 1
+        while self._peek(i) == "word":
+            i += 1
+        return i > 1 and self._peek(i) == "rp"
+
+    def _atom(self) -> Optional[PrereqNode]:
+        kind = self._peek()
+        if kind == "lp":
+            self.pos += 1
+            node = self._seq()
+            if self._peek() == "rp":
+                self.pos += 1
+            return node
+        if kind in ("course", "test"):
+            value = "".join(self.tokens[self.pos][1].split()).upper()
+            self.pos += 1
+            return PrereqNode(kind, code=value)
+        if kind == "word":
+            words = []
+            while self._peek() == "word":
+                words.append(self.tokens[self.pos][1])
+                self.pos += 1
+            if self._peek() in ("course", "test"):
+                return self._atom()  # description of the code, e.g. 'AP Calculus AB 4'
+            text = " ".join(words)
+            concurrent = "concurrent" in text.lower() or "corequisite" in text.lower()
+            return PrereqNode("text", code=text, concurrent=concurrent)
+        return None
+
+
+def _to_cnf(node: Optional[PrereqNode]) -> List[List[str]]:
+    """
+    AND-of-ORs over course/test codes. Text nodes impose nothing. An AND
+    nested inside an OR is distributed, falling back to a flat OR if the
+    expansion would exceed _MAX_CNF_CLAUSES.
+    """
+    if node is None or node.kind == "text":
+        return []
+    if node.kind in ("course", "test"):
+        return [[node.code]]
+    if node.kind == "and":
+        out = []
+        for child in node.children:
+            for clause in _to_cnf(child):
+                if clause not in out:
+                    out.append(clause)
+        return out
+    # or: cross product of the children's clauses
+    clauses: List[List[str]] = [[]]
+    for child in node.children:
+        child_cnf = _to_cnf(child)
+        if not child_cnf:
+            # an alternative with no course requirement (free text) -- keep
+            # the course alternatives, as the comma splitter used to
+            continue
+        clauses = [c + [x for x in d if x not in c] for c in clauses for d in child_cnf]
+        if len(clauses) > _MAX_CNF_CLAUSES:
+            return [node.codes()]
+    return [c for c in clauses if c]
+
+
+def parse_prerequisite_expression(prereq_string: str) -> Optional[PrereqNode]:
+    """
+    Parse a Banner prerequisite string into a PrereqNode tree. Returns None
+    when it names no requirement. Each call returns a fresh tree, since the
+    nodes are mutable; the memo is on the immutable CNF tuple
+    (_nested_prerequisites) that lookups use.
+
+    Example:
+        "(CS 2114 (MIN grade of C) or ECE 3514) and MATH 2534"
+        -> ((CS2114[>=C] or ECE3514) and MATH2534)
+    """
+    text = re.sub(r"\s*Prerequisites Enforced:.*$", "", prereq_string or "", flags=re.DOTALL)
+    return _PrereqParser(_tokenize_prerequisites(text)).parse()
+
+
+@functools.lru_cache(maxsize=4096)
+def _nested_prerequisites(prereq_string: str) -> Tuple[Tuple[str, ...], ...]:
+    """CNF of `prereq_string` as nested tuples, memoized on the raw string."""
+    return tuple(tuple(g) for g in _to_cnf(parse_prerequisite_expression(prereq_string)))
+
 
 def _parse_prerequisites(prereq_string: str) -> List[List[str]]:
     """
@@ -832,28 +2102,9 @@ def _parse_prerequisites(prereq_string: str) -> List[List[str]]:
         A list of lists, where each inner list contains alternative course codes.
         Single courses are returned as single-item lists.
         Example: [['CS1944'], ['CS2114', 'ECE3514'], ['COMM2004', 'COMM2014']]
+
+    Built on parse_prerequisite_expression, so nesting, 'A, B, or C' lists
+    and annotations are handled; use that function for grades and
+    corequisite flags.
     """
-    # Remove the "Prerequisites Enforced" suffix if present
-    prereq_string = re.sub(r'\s*Prerequisites Enforced:.*$', '', prereq_string)
-    
-    # Split by comma to get individual prerequisite groups
-    groups = prereq_string.split(',')
-    
-    result = []
-    
-    for group in groups:
-        group = group.strip()
-        if not group:
-            continue
-            
-        # Extract all course codes (subject + number) from the group
-        course_pattern = r'([A-Z]+)\s+(\d+)'
-        courses = re.findall(course_pattern, group)
-        
-        # Combine subject and number, removing spaces
-        course_list = [f"{subject}{number}" for subject, number in courses]
-        
-        if course_list:
-            result.append(course_list)
-    
-    return result
+    return [list(g) for g in _nested_prerequisites(prereq_string)]
@@ -0,0 +1,250 @@
+"""
+HTTP transport used for every upstream call in timeTablesVTT and scrapeVTCourses.
+
+Three implementations:
+
+    LiveTransport    pooled requests.Session, behind the shared per-host rate
+                     limit (rateLimit.py).
+    RecordTransport  live, and also appends each response to a gzip archive.
+    ReplayTransport  serves responses from such an archive and never touches
+                     the network. Requests missing from the archive raise
+                     ReplayMiss.
+
+The active transport is process-wide. Pick it with TIMETABLE_TRANSPORT,
+"live" (default), "record:<archive>" or "replay:<archive>", or in code:
+
+    with use_transport(ReplayTransport("fixtures/spring2026.jsonl.gz")):
+        searchIDData("CS3114")
+
+TIMETABLE_UPSTREAM_OVERRIDE="http://127.0.0.1:8081" sends every live request to
+that origin instead, with the path and query kept and the real host in
+X-Forwarded-Host. Rate limits still apply per real host. The load-test
+harness (backend/loadTest.py) uses this to run against its stand-in server.
+
+Archives are gzip'd JSON lines, {key, method, url, data, status, text}, keyed
+by a hash of (method, url, sorted form data). Replayed runs see byte-identical
+upstream data and run at CPU speed. That makes them suitable for perf
+experiments, seed dry runs and parser changes.
+
+    python pythonTimetables/transport.py info fixtures/spring2026.jsonl.gz
+"""
+import abc
+import atexit
+import contextlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+try:
+    from pythonTimetables.rateLimit import throttle
+except ModuleNotFoundError:
+    from rateLimit import throttle
+
+
+UPSTREAM_OVERRIDE = os.environ.get("TIMETABLE_UPSTREAM_OVERRIDE", "").rstrip("/")
+
+
+class HTTPError(IOError):
+    pass
+
+
+class ReplayMiss(LookupError):
+    """The replay archive has no response for this request."""
+
+
+class Response:
+    __slots__ = ("status_code", "text", "url")
+
+    def __init__(self, status_code: int, text: str, url: str) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+def request_key(method: str, url: str, data: Optional[Dict[str, str]] = None) -> str:
+    import hashlib
+
+    body = json.dumps(sorted((str(k), str(v)) for k, v in (data or {}).items()))
+    return hashlib.sha1(f"{method.upper()} {url} {body}".encode("utf-8")).hexdigest()
+
+
+class Transport(abc.ABC):
+    """Interface: `request()` returns a Response; get/post are shorthands."""
+
+    @abc.abstractmethod
+    def request(self, method: str, url: str, data: Dict[str, str] = None,
+                timeout: float = None) -> Response:
+        ...
+
+    def get(self, url: str, timeout: float = None) -> Response:
+        return self.request("GET", url, timeout=timeout)
+
+    def post(self, url: str, data: Dict[str, str] = None, timeout: float = None) -> Response:
+        return self.request("POST", url, data=data, timeout=timeout)
+
+    def close(self) -> None:
+        pass
+
+
+class LiveTransport(Transport):
+    """One pooled requests.Session (TLS + TCP reuse), rate limited per host."""
+
+    def __init__(self) -> None:
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _get_session(self):
+        # Created on first use so importing this module doesn't pull in requests.
+        with self._lock:
+            if self._session is None:
+                import requests
+                self._session = requests.Session()
+            return self._session
+
+    def request(self, method, url, data=None, timeout=None):
+        throttle(url)
+        headers = None
+        target = url
+        if UPSTREAM_OVERRIDE:
+            host, _, path = url.split("://", 1)[-1].partition("/")
+            target = f"{UPSTREAM_OVERRIDE}/{path}"
+            headers = {"X-Forwarded-Host": host}
+        resp = self._get_session().request(method, target, data=data, headers=headers,
+                                           timeout=timeout)
+        return Response(resp.status_code, resp.text, url)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+def load_archive(path: str) -> Dict[str, dict]:
+    """Read an archive into {key: entry}; later entries win, a truncated tail is ignored."""
+    import gzip
+
+    entries = {}
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                entries[entry["key"]] = entry
+    except FileNotFoundError:
+        pass
+    except (EOFError, json.JSONDecodeError):
+        pass  # a recording that was killed mid-write
+    return entries
+
+
+class RecordTransport(Transport):
+    """Live requests, each response also appended to the archive at `path`."""
+
+    def __init__(self, path: str, inner: Transport = None) -> None:
+        self.path = path
+        self.inner = inner or LiveTransport()
+        self._lock = threading.Lock()
+        self._file = None
+        atexit.register(self.close)  # finish the gzip member
+
+    def request(self, method, url, data=None, timeout=None):
+        resp = self.inner.request(method, url, data=data, timeout=timeout)
+        entry = {"key": request_key(method, url, data), "method": method.upper(), "url": url,
+                 "data": data or {}, "status": resp.status_code, "text": resp.text}
+        with self._lock:
+            if self._file is None:
+                import gzip
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = gzip.open(self.path, "at", encoding="utf-8")  # new gzip member
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+        return resp
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self.inner.close()
+
+
+class ReplayTransport(Transport):
+    """Serve recorded responses; unknown requests raise ReplayMiss."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries = load_archive(path)
+        self.hits = 0
+        self.misses = 0
+
+    def request(self, method, url, data=None, timeout=None):
+        entry = self.entries.get(request_key(method, url, data))
+        if entry is None:
+            self.misses += 1
+            raise ReplayMiss(f"no recorded response for {method.upper()} {url} {data or ''}")
+        self.hits += 1
+        return Response(entry["status"], entry["text"], url)
+
+
+def transport_from_spec(spec: str) -> Transport:
+    """'live', 'record:<path>' or 'replay:<path>' -> Transport."""
+    mode, _, path = (spec or "live").partition(":")
+    mode = mode.strip().lower()
+    if mode == "live":
+        return LiveTransport()
+    if mode in ("record", "replay") and path:
+        return RecordTransport(path) if mode == "record" else ReplayTransport(path)
+    raise ValueError(f"Invalid transport {spec!r}; expected live, record:<path> or replay:<path>.")
+
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = transport_from_spec(os.environ.get("TIMETABLE_TRANSPORT", "live"))
+    return _transport
+
+
+def set_transport(transport: Transport) -> Transport:
+    """Install `transport` process-wide; returns the previous one."""
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    return previous
+
+
+@contextlib.contextmanager
+def use_transport(transport: Transport):
+    """Use `transport` inside the block, then close it and restore the previous one."""
+    previous = set_transport(transport)
+    try:
+        yield transport
+    finally:
+        set_transport(previous)
+        transport.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    from collections import Counter
+    from urllib.parse import urlsplit
+
+    parser = argparse.ArgumentParser(description="Inspect a record/replay archive.")
+    parser.add_argument("command", choices=["info"])
+    parser.add_argument("archive")
+    args = parser.parse_args()
+
+    entries = load_archive(args.archive)
+    hosts = Counter(f"{e['method']} {urlsplit(e['url']).hostname}" for e in entries.values())
+    print(f"{args.archive}: {len(entries)} responses, "
+          f"{sum(len(e['text']) for e in entries.values()) / 1e6:.1f} MB of text")
+    for host, n in hosts.most_common():
+        print(f"  {n:6d}  {host}")
@@ -11,12 +11,18 @@ const {
   checkPrerequisites,
   searchCourseCRN,
   searchCourseID,
+  searchCourseIDs,
+  searchCoursesByPathway,
+  searchCourseSections,
 } = require("../controllers/courseController");
 
 
 // Timetable-backed lookups MUST be before '/:id'
 router.get('/search/by-id', searchCourseID);
+router.get('/search/by-ids', searchCourseIDs);
 router.get('/search/by-crn', searchCourseCRN);
+router.get('/search/by-pathway', searchCoursesByPathway);
+router.get('/search/sections', searchCourseSections);
 
 // GET all courses with optional filtering
 // Query params: category, semester, search
@@ -14,6 +14,7 @@ const {
   moveCourseBetweenSemesters,
   validatePlan,
   exportPDF,
+  optimizePlan,
 } = require("../controllers/planController");
 
 // GET all plans for a user
@@ -45,4 +46,7 @@ router.post("/:id/move-course", moveCourseBetweenSemesters);
 
 router.post("/export-pdf", exportPDF);
 
+// POST build or repair a plan with the prerequisite-aware optimizer
+router.post("/optimize", optimizePlan);
+
 module.exports = router;
@@ -8,8 +8,12 @@ const {
   addCompletedCourse,
   removeCompletedCourse,
   getUserProgress,
+  getCohortProgress,
 } = require("../controllers/usersController");
 
+// GET cohort-wide progress analytics (BEFORE /:id routes!)
+router.get("/cohort/progress", getCohortProgress);
+
 // GET user progress summary (BEFORE /:id route!)
 router.get("/:id/progress", getUserProgress);
 
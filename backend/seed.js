@@ -80,6 +80,11 @@ async function seed() {
           .filter((p) => p.length > 0)
       : [];
 
+    // Other listings of a cross-listed course (flat array)
+    const crossListed = Array.isArray(course.crossListed)
+      ? course.crossListed.filter((c) => typeof c === "string")
+      : [];
+
     // Normalize prerequisites to nested array format
     // Firestore does NOT support nested arrays, so we store as JSON string
     const prerequisites = normalizePrerequisites(course.prerequisites);
@@ -113,6 +118,7 @@ async function seed() {
       description:
         typeof course.description === "string" ? course.description : "",
       pathways,
+      crossListed,
       updatedAt: nowIso,
     };
 
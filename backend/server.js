@@ -1,5 +1,6 @@
 // require('dotenv').config();
 const express = require("express");
+const { spawn } = require("child_process");
 const cors = require("cors");
 const { db } = require("./db"); // Import db from db/index.js
 
@@ -45,8 +46,25 @@ app.use((err, req, res, next) => {
   res.status(500).json({ error: "Something went wrong!" });
 });
 
+// Cache prewarming (see pythonTimetables/prewarm.py). Warms the shared
+// lookup caches at startup and ahead of hot windows, so the first users
+// after a deploy don't wait on cold upstream fetches.
+function startPrewarm() {
+  if (!process.env.TIMETABLE_CACHE_DIR || process.env.TIMETABLE_PREWARM === "off") {
+    return;
+  }
+  const prewarm = spawn(
+    process.env.PY_INTERPRETER || "python",
+    ["pythonTimetables/prewarm.py", "schedule"],
+    { cwd: __dirname, stdio: ["ignore", "inherit", "inherit"] }
+  );
+  prewarm.on("error", (err) => console.error("Cache prewarm failed to start:", err.message));
+  process.on("exit", () => prewarm.kill());
+}
+
 // Start server
 app.listen(PORT, () => {
+  startPrewarm();
   console.log(`🚀 Server running on http://localhost:${PORT}`);
   console.log(`📊 Health check: http://localhost:${PORT}/health`);
   console.log(`📚 API Endpoints:`);
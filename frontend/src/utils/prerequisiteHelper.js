@@ -48,6 +48,8 @@ export const getCompletedCoursesBysemester = (semesters, targetSemester) => {
     if (isEarlier) {
       courses.forEach((course) => {
         completedCourses.push(course.id || course.code);
+        // A cross-listed course also completes its other listings
+        completedCourses.push(...(course.crossListed || []));
       });
     }
   });